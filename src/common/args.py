@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
 
 import re
-from argparse import ArgumentParser, ArgumentTypeError, Namespace
+from argparse import SUPPRESS, Action, ArgumentParser, ArgumentTypeError, Namespace
 from datetime import datetime, timedelta
+from typing import Any, Sequence
 
 
 def parse_abs_date(date_str: str) -> datetime:
@@ -95,3 +96,44 @@ def resolve_date(args: Namespace) -> datetime:
             )
 
     return target_date
+
+
+class VersionAction(Action):
+    """
+    Like argparse's 'version' action, but the version is only resolved when the
+    option is used, instead of every time the parser is built.
+    """
+
+    def __init__(
+        self,
+        option_strings: Sequence[str],
+        dest: str = SUPPRESS,
+        default: Any = SUPPRESS,
+        help: str = "show program's version number and exit",
+    ):
+        super().__init__(
+            option_strings=option_strings,
+            dest=dest,
+            default=default,
+            nargs=0,
+            help=help,
+        )
+
+    def __call__(
+        self,
+        parser: ArgumentParser,
+        namespace: Namespace,
+        values: Any,
+        option_string: str | None = None,
+    ) -> None:
+        from common.helpers import get_version
+
+        print(f"{parser.prog} {get_version()}")
+        parser.exit()
+
+
+def add_version_arg(parser: ArgumentParser):
+    """
+    Add a --version flag.
+    """
+    parser.add_argument("--version", action=VersionAction)
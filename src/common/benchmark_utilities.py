@@ -0,0 +1,124 @@
+import json
+import timeit
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable
+
+from common.variables import FLEXYCON_DATA
+
+# Timings depend on the machine, so the baseline is kept with the local data
+# instead of being committed.
+BENCHMARK_DIR = FLEXYCON_DATA / "benchmarks"
+RESULTS_PATH = BENCHMARK_DIR / "results.json"
+BASELINE_PATH = BENCHMARK_DIR / "baseline.json"
+
+# A benchmark regressed if it got slower than the baseline by more than this
+REGRESSION_THRESHOLD = 0.25
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    seconds: float  # best time of a single call
+    number: int  # calls per repeat
+    repeat: int
+
+
+@dataclass
+class BenchmarkComparison:
+    name: str
+    baseline: float | None
+    current: float | None
+
+    @property
+    def change(self) -> float | None:
+        """Relative change from the baseline, e.g. 0.5 means 50% slower."""
+        if not self.baseline or self.current is None:
+            return None
+
+        return self.current / self.baseline - 1
+
+    def is_regression(self, threshold: float = REGRESSION_THRESHOLD) -> bool:
+        change = self.change
+        return change is not None and change > threshold
+
+
+def measure(
+    name: str,
+    func: Callable[[], object],
+    setup: Callable[[], object] | None = None,
+    number: int | None = None,
+    repeat: int = 5,
+) -> BenchmarkResult:
+    """
+    Time a function with 'timeit', keeping the best of ``repeat`` runs.
+
+    ``setup`` runs before each repeat and isn't timed, so functions that consume
+    their input (e.g. deleting files) should be measured with ``number=1``. If
+    ``number`` is not given, it's picked so a repeat takes at least 0.2s.
+    """
+    timer = timeit.Timer(func, setup=setup or "pass")
+
+    if number is None:
+        number, _ = timer.autorange()
+
+    best = min(timer.repeat(repeat=repeat, number=number))
+
+    return BenchmarkResult(name, best / number, number, repeat)
+
+
+def save_results(results: list[BenchmarkResult], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps({r.name: asdict(r) for r in results}, indent=4), encoding="utf-8"
+    )
+
+
+def load_results(path: Path) -> dict[str, BenchmarkResult]:
+    with open(path, "r", encoding="utf-8") as f:
+        return {name: BenchmarkResult(**r) for name, r in json.load(f).items()}
+
+
+def compare_results(
+    current: dict[str, BenchmarkResult], baseline: dict[str, BenchmarkResult]
+) -> list[BenchmarkComparison]:
+    """Pair up the results by name, including the ones missing on either side."""
+    names = list(current) + [name for name in baseline if name not in current]
+
+    return [
+        BenchmarkComparison(
+            name,
+            baseline[name].seconds if name in baseline else None,
+            current[name].seconds if name in current else None,
+        )
+        for name in names
+    ]
+
+
+def _format_seconds(seconds: float | None) -> str:
+    if seconds is None:
+        return "-"
+
+    for unit, scale in (("s", 1), ("ms", 1e3), ("us", 1e6)):
+        if seconds * scale >= 1:
+            return f"{seconds * scale:.2f}{unit}"
+
+    return f"{seconds * 1e9:.0f}ns"
+
+
+def format_comparisons(
+    comparisons: list[BenchmarkComparison], threshold: float = REGRESSION_THRESHOLD
+) -> str:
+    """Return a plain text table of the comparisons, flagging the regressions."""
+    width = max((len(c.name) for c in comparisons), default=4)
+
+    lines = [f"{'Name':<{width}}  {'Baseline':>10}  {'Current':>10}  {'Change':>8}"]
+    for c in comparisons:
+        change = "-" if c.change is None else f"{c.change:+.1%}"
+        flag = "  REGRESSION" if c.is_regression(threshold) else ""
+        lines.append(
+            f"{c.name:<{width}}  {_format_seconds(c.baseline):>10}  "
+            f"{_format_seconds(c.current):>10}  {change:>8}{flag}"
+        )
+
+    return "\n".join(lines)
@@ -0,0 +1,164 @@
+import json
+import shutil
+import time
+import weakref
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+from common.cmd_utilities import CommandResult, normalize_cmd, run_cmd
+from common.logger import log
+from common.variables import FLEXYCON_DATA
+
+CACHE_DIR = FLEXYCON_DATA / "cache"
+
+
+class ResultCache:
+    """
+    Key-value cache for results of idempotent lookups.
+
+    Entries expire after ``ttl`` seconds (never, if ``ttl`` is None). Persistent
+    caches are stored as JSON in ``CACHE_DIR``, so their values must be JSON
+    serializable, and they are shared between processes.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float | None = None,
+        persist: bool = False,
+        cache_dir: Path | None = None,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.persist = persist
+        self.cache_dir = cache_dir or CACHE_DIR
+
+        # Loaded lazily, so persistent caches only touch the disk when used
+        self._entries: dict[str, tuple[float, Any]] | None = None
+
+        _CACHES.add(self)
+
+    @property
+    def path(self) -> Path:
+        return self.cache_dir / f"{self.name}.json"
+
+    def _load(self) -> dict[str, tuple[float, Any]]:
+        if self._entries is not None:
+            return self._entries
+
+        self._entries = {}
+        if self.persist and self.path.is_file():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._entries = {
+                        key: (timestamp, value)
+                        for key, (timestamp, value) in json.load(f).items()
+                    }
+            except (OSError, ValueError, TypeError) as e:
+                log.warning(f"Ignoring unreadable cache {str(self.path)!r}: {e}")
+
+        return self._entries
+
+    def _save(self) -> None:
+        if not self.persist:
+            return
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self._load()), encoding="utf-8")
+        except (OSError, TypeError) as e:
+            log.warning(f"Unable to save cache {str(self.path)!r}: {e}")
+
+    def _is_fresh(self, timestamp: float) -> bool:
+        return self.ttl is None or time.time() - timestamp < self.ttl
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached value for the key, or None if it's missing or expired."""
+        entry = self._load().get(key)
+        if entry is None or not self._is_fresh(entry[0]):
+            return None
+
+        return entry[1]
+
+    def get_or_compute[T](self, key: str, compute: Callable[[], T]) -> T:
+        """Return the cached value for the key, computing and storing it if needed."""
+        entry = self._load().get(key)
+        if entry is not None and self._is_fresh(entry[0]):
+            return entry[1]
+
+        value = compute()
+        self.set(key, value)
+
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self._load()[key] = (time.time(), value)
+        self._save()
+
+    def invalidate(self, key: str | None = None) -> None:
+        """Drop a single entry, or every entry if no key is given."""
+        entries = self._load()
+
+        if key is None:
+            entries.clear()
+        elif entries.pop(key, None) is None:
+            return
+
+        self._save()
+
+
+# Weak, so the caches created for a single call aren't kept alive
+_CACHES: weakref.WeakSet[ResultCache] = weakref.WeakSet()
+
+
+def invalidate_all_caches() -> None:
+    """Drop the entries of every cache created in this process."""
+    for cache in _CACHES:
+        cache.invalidate()
+
+
+# Tools can be installed or removed while long-running processes (e.g. the
+# statusbar daemon) keep using them
+WHICH_TTL = 60.0
+WHICH_CACHE = ResultCache("which", ttl=WHICH_TTL)
+COMMAND_CACHE = ResultCache("commands")
+
+
+def which(command: str) -> str | None:
+    """``shutil.which``, memoized for ``WHICH_TTL`` seconds."""
+    return WHICH_CACHE.get_or_compute(command, lambda: shutil.which(command))
+
+
+def _command_key(command: Sequence[str | int | Path]) -> str:
+    return json.dumps(normalize_cmd(command))
+
+
+def run_cmd_cached(
+    command: Sequence[str | int | Path], cache: ResultCache = COMMAND_CACHE
+) -> CommandResult:
+    """
+    Run a command whose output only depends on its arguments, reusing an earlier
+    successful result when there is one. Failed results are never cached.
+    """
+    key = _command_key(command)
+
+    entry = cache.get(key)
+    if entry is not None:
+        log.debug(f"Using cached result for {normalize_cmd(command)}")
+        return CommandResult(**entry)
+
+    result = run_cmd(command)
+    if result.success:
+        cache.set(key, asdict(result))
+    else:
+        cache.invalidate(key)
+
+    return result
+
+
+def invalidate_cmd(
+    command: Sequence[str | int | Path], cache: ResultCache = COMMAND_CACHE
+) -> None:
+    """Forget the cached result of a command, e.g. after it's known to be stale."""
+    cache.invalidate(_command_key(command))
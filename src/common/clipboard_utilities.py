@@ -1,10 +1,10 @@
 import mimetypes
-import shutil
 import subprocess
 import sys
 from abc import ABC, abstractmethod
 from pathlib import Path
 
+from common.cache_utilities import which
 from common.cmd_utilities import run_cmd
 
 
@@ -31,7 +31,7 @@ class ClipboardProvider(ABC):
     @classmethod
     def is_available(cls) -> bool:
         """Checks if the required system utility is installed."""
-        return shutil.which(cls.command) is not None
+        return which(cls.command) is not None
 
 
 # Linux
@@ -1,16 +1,24 @@
+import logging
+import os
 import secrets
 import subprocess
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Sequence
+from typing import Iterable, Iterator, Self, Sequence
 
 from common.logger import log
+from common.trace_utilities import is_tracing_enabled, record_command
 
 
 @dataclass
 class CommandResult:
     return_code: int
     raw_output: str
+    timed_out: bool = False
+    # Only populated when stderr is captured separately from stdout
+    raw_stderr: str = ""
 
     @property
     def output(self) -> str:
@@ -24,39 +32,412 @@ class CommandResult:
         return self.output
 
 
-def run_cmd(command: Sequence[str | int | Path], tokens: int = 4) -> CommandResult:
-    """Run a shell command and return its result."""
+def normalize_cmd(command: Sequence[str | int | Path]) -> list[str]:
+    return [str(p) if not isinstance(p, str) else p for p in command]
+
+
+def _decode_output(data: bytes | None) -> str:
+    """Decode a command's output, replacing invalid bytes and translating newlines."""
+    if not data:
+        return ""
+
+    return data.decode(errors="replace").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def run_cmd(
+    command: Sequence[str | int | Path],
+    tokens: int = 4,
+    timeout: float | None = None,
+    separate_stderr: bool = False,
+) -> CommandResult:
+    """
+    Run a shell command and return its result.
+
+    The output is read in large binary chunks and decoded once, which is much
+    cheaper than reading it line by line for commands that print a lot. As a
+    result, the lines are only logged (in debug mode) once the command exited.
+
+    When a timeout (in seconds) is given, the command is terminated once it
+    expires, like with ``async_run_cmd``. stderr is merged into the output,
+    unless ``separate_stderr`` is set, which keeps it in ``raw_stderr``.
+    """
+    if timeout is not None:
+        return _run_cmd_with_timeout(
+            command, timeout, tokens=tokens, separate_stderr=separate_stderr
+        )
+
     cmd_identifier = secrets.token_hex(tokens)
 
-    normalized_cmd = [str(p) if not isinstance(p, str) else p for p in command]
+    normalized_cmd = normalize_cmd(command)
     log.debug(f"Running {normalized_cmd} with id {cmd_identifier!r}")
 
-    output: list[str] = []
+    start = time.monotonic()
     with subprocess.Popen(
         normalized_cmd,
         stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        universal_newlines=True,
-        bufsize=1,
+        stderr=subprocess.PIPE if separate_stderr else subprocess.STDOUT,
     ) as process:
+        stdout, stderr = process.communicate()
+
+    raw_output = _decode_output(stdout)
+    raw_stderr = _decode_output(stderr)
+
+    if log.isEnabledFor(logging.DEBUG):
+        for line in (raw_output + raw_stderr).splitlines():
+            log.debug(line.strip())
+
+    log.debug(
+        f"Command with id {cmd_identifier!r} finished with return code "
+        f"{process.returncode}"
+    )
+
+    if is_tracing_enabled():
+        output_bytes = len(stdout) + len(stderr or b"")
+        record_command(normalized_cmd, start, process.returncode, output_bytes)
+
+    return CommandResult(
+        return_code=process.returncode, raw_output=raw_output, raw_stderr=raw_stderr
+    )
+
+
+def _run_cmd_with_timeout(
+    command: Sequence[str | int | Path],
+    timeout: float,
+    kill_timeout: float = 2.0,
+    tokens: int = 4,
+    separate_stderr: bool = False,
+) -> CommandResult:
+    """
+    Blocking counterpart of ``async_run_cmd``, which spares short-lived
+    scripts the cost of importing asyncio.
+    """
+    cmd_identifier = secrets.token_hex(tokens)
+
+    normalized_cmd = normalize_cmd(command)
+    log.debug(f"Running {normalized_cmd} with id {cmd_identifier!r}")
+
+    start = time.monotonic()
+    timed_out = False
+
+    with subprocess.Popen(
+        normalized_cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE if separate_stderr else subprocess.STDOUT,
+    ) as process:
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            timed_out = True
+            log.warning(
+                f"Command with id {cmd_identifier!r} timed out after {timeout}s, "
+                "terminating it"
+            )
+
+            # Retrying 'communicate' keeps the output collected so far
+            process.terminate()
+            try:
+                stdout, stderr = process.communicate(timeout=kill_timeout)
+            except subprocess.TimeoutExpired:
+                log.debug(f"Process {process.pid} ignored SIGTERM, sending SIGKILL")
+                process.kill()
+                stdout, stderr = process.communicate()
+
+        return_code = process.returncode
+
+    raw_output = _decode_output(stdout)
+    raw_stderr = _decode_output(stderr)
+
+    if log.isEnabledFor(logging.DEBUG):
+        for line in (raw_output + raw_stderr).splitlines():
+            log.debug(line.strip())
+
+    log.debug(
+        f"Command with id {cmd_identifier!r} finished with return code {return_code}"
+    )
+
+    if is_tracing_enabled():
+        output_bytes = len(stdout) + len(stderr or b"")
+        record_command(normalized_cmd, start, return_code, output_bytes)
+
+    return CommandResult(
+        return_code=return_code,
+        raw_output=raw_output,
+        timed_out=timed_out,
+        raw_stderr=raw_stderr,
+    )
+
+
+class CommandStream:
+    """
+    Iterate over a command's output lines as they are produced.
+
+    The merged stdout/stderr lines are yielded without their trailing newline.
+    Once the output is exhausted, ``return_code`` holds the command's exit
+    status. Stopping early (or leaving the ``with`` block) terminates the
+    command.
+    """
+
+    def __init__(self, command: Sequence[str | int | Path], tokens: int = 4):
+        self.command = normalize_cmd(command)
+        self.cmd_identifier = secrets.token_hex(tokens)
+        self.return_code: int | None = None
+        self._process: subprocess.Popen[str] | None = None
+        self._start = 0.0
+        self._output_bytes = 0
+
+    @property
+    def success(self) -> bool:
+        return self.return_code == 0
+
+    def __iter__(self) -> Iterator[str]:
+        if self._process is not None:
+            raise RuntimeError("A command stream can only be iterated once.")
+
+        log.debug(f"Running {self.command} with id {self.cmd_identifier!r} (streamed)")
+
+        is_debug = log.isEnabledFor(logging.DEBUG)
+        is_tracing = is_tracing_enabled()
+        self._start = time.monotonic()
+
+        process = self._process = subprocess.Popen(
+            self.command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            encoding="utf-8",
+            errors="replace",  # a single invalid byte shouldn't end the stream
+            bufsize=1,
+        )
+
+        completed = False
+        try:
+            if process.stdout is not None:
+                for line in process.stdout:
+                    if is_debug:
+                        log.debug(line.strip())
+                    if is_tracing:
+                        self._output_bytes += len(line.encode())
+                    yield line.rstrip("\n")
+
+            completed = True
+        finally:
+            self._finish(terminate=not completed)
+
+    def close(self) -> None:
+        """Terminate the command if it's still running."""
+        self._finish(terminate=True)
+
+    def _finish(self, terminate: bool) -> None:
+        process = self._process
+        if process is None or self.return_code is not None:
+            return
+
+        if terminate and process.poll() is None:
+            log.debug(f"Terminating command with id {self.cmd_identifier!r}")
+            process.terminate()
+
+        if process.stdout is not None:
+            process.stdout.close()
+
+        self.return_code = process.wait()
+
+        log.debug(
+            f"Command with id {self.cmd_identifier!r} finished with return code "
+            f"{self.return_code}"
+        )
+
+        if is_tracing_enabled():
+            record_command(
+                self.command, self._start, self.return_code, self._output_bytes
+            )
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.close()
+
+
+def stream_cmd(command: Sequence[str | int | Path], tokens: int = 4) -> CommandStream:
+    """Run a shell command and stream its output line by line."""
+    return CommandStream(command, tokens=tokens)
+
+
+async def async_run_cmd(
+    command: Sequence[str | int | Path],
+    timeout: float | None = None,
+    kill_timeout: float = 2.0,
+    tokens: int = 4,
+) -> CommandResult:
+    """
+    Run a shell command without blocking the event loop and return its result.
+
+    If the command doesn't finish within ``timeout`` seconds, it receives
+    SIGTERM, followed by SIGKILL after ``kill_timeout`` seconds. The output
+    collected so far is kept and the result is marked as timed out.
+    Cancelling the awaiting task terminates the process the same way.
+    """
+    import asyncio  # slow to import, so only loaded by async callers
+
+    cmd_identifier = secrets.token_hex(tokens)
+
+    normalized_cmd = normalize_cmd(command)
+    log.debug(f"Running {normalized_cmd} with id {cmd_identifier!r} (async)")
+
+    start = time.monotonic()
+    process = await asyncio.create_subprocess_exec(
+        *normalized_cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+    )
+
+    is_debug = log.isEnabledFor(logging.DEBUG)
+    output: list[str] = []
+
+    async def collect_output() -> int:
         if process.stdout is not None:
-            for line in process.stdout:
+            async for raw_line in process.stdout:
+                line = raw_line.decode(errors="replace")
                 output.append(line)  # newline is included
-                log.debug(line.strip())
+                if is_debug:
+                    log.debug(line.strip())
 
-        return_code = process.wait()
+        return await process.wait()
+
+    async def terminate() -> int:
+        """Send SIGTERM to the process, escalating to SIGKILL if it doesn't exit."""
+        try:
+            process.terminate()
+        except ProcessLookupError:
+            return await process.wait()
+
+        try:
+            return await asyncio.wait_for(process.wait(), kill_timeout)
+        except TimeoutError:
+            log.debug(f"Process {process.pid} ignored SIGTERM, sending SIGKILL")
+
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+
+        return await process.wait()
+
+    timed_out = False
+    try:
+        return_code = await asyncio.wait_for(collect_output(), timeout)
+    except TimeoutError:
+        timed_out = True
+        log.warning(
+            f"Command with id {cmd_identifier!r} timed out after {timeout}s, "
+            "terminating it"
+        )
+        return_code = await terminate()
+    except asyncio.CancelledError:
+        await terminate()
+        raise
 
     log.debug(
         f"Command with id {cmd_identifier!r} finished with return code {return_code}"
     )
 
-    return CommandResult(return_code=return_code, raw_output="".join(output))
+    raw_output = "".join(output)
+    if is_tracing_enabled():
+        record_command(normalized_cmd, start, return_code, len(raw_output.encode()))
+
+    return CommandResult(
+        return_code=return_code, raw_output=raw_output, timed_out=timed_out
+    )
+
+
+class CommandPool:
+    """
+    Run many commands concurrently with a bounded number of worker threads.
+
+    Each worker only waits on its child process, so the real work happens in
+    parallel even though the pool is thread-based.
+    """
+
+    def __init__(self, max_workers: int | None = None, fail_fast: bool = False):
+        """
+        :param max_workers: Maximum number of commands running at the same time.
+                            Defaults to the number of CPUs.
+        :param fail_fast: Stop starting new commands once one of them fails.
+        """
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("'max_workers' must be at least 1.")
+
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.fail_fast = fail_fast
+
+    def run(
+        self, commands: Iterable[Sequence[str | int | Path]]
+    ) -> list[CommandResult | None]:
+        """
+        Run the commands and return their results in input order.
+
+        Commands that couldn't be started (e.g. a missing executable) get a
+        failed result with a return code of -1 and the error as output.
+        In fail-fast mode, commands that were never started get ``None``.
+        Commands that were already running when the failure happened are
+        allowed to finish.
+        """
+        commands = list(commands)
+        results: list[CommandResult | None] = [None] * len(commands)
+
+        if not commands:
+            return results
+
+        log.debug(
+            f"Running {len(commands)} commands with {self.max_workers} workers "
+            f"(fail_fast={self.fail_fast})"
+        )
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures: dict[Future[CommandResult], int] = {
+                executor.submit(run_cmd, command): i
+                for i, command in enumerate(commands)
+            }
+
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+                failed = False
+                for future in done:
+                    if future.cancelled():
+                        continue
+
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # e.g. a missing executable, which only fails its command
+                        command = commands[futures[future]]
+                        log.error(f"Unable to run {normalize_cmd(command)}: {e}")
+                        result = CommandResult(return_code=-1, raw_output=str(e))
+
+                    results[futures[future]] = result
+                    failed = failed or not result.success
+
+                if failed and self.fail_fast:
+                    cancelled = sum(future.cancel() for future in pending)
+                    log.debug(f"A command failed, cancelled {cancelled} pending ones")
+
+        return results
+
+
+def run_cmds(
+    commands: Iterable[Sequence[str | int | Path]],
+    max_workers: int | None = None,
+    fail_fast: bool = False,
+) -> list[CommandResult | None]:
+    """Run several commands concurrently and return their results in input order."""
+    return CommandPool(max_workers=max_workers, fail_fast=fail_fast).run(commands)
 
 
 def run_cmd_background(command: Sequence[str | int | Path]):
     """Run a command in the background."""
 
-    normalized_cmd = [str(p) if not isinstance(p, str) else p for p in command]
+    normalized_cmd = normalize_cmd(command)
     log.debug(f"Running {normalized_cmd} in background.")
 
     subprocess.Popen(
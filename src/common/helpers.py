@@ -1,28 +1,45 @@
 import os
-import shutil
-import tomllib
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Generator
 
-import psutil
-
+from common.cache_utilities import which
 from common.cmd_utilities import run_cmd, run_cmd_background
 from common.logger import log
 from common.system_utilities import get_display_server
 
+PYPROJECT_PATH = Path(__file__).resolve().parent.parent.parent / "pyproject.toml"
 
-def get_version() -> str:
-    pyproject_path = Path(__file__).resolve().parent.parent.parent / "pyproject.toml"
+
+def read_project_version() -> str | None:
+    """Read the version from 'pyproject.toml'."""
+    import tomllib  # only needed when the version is requested
 
     try:
-        with open(pyproject_path, "rb") as f:
+        with open(PYPROJECT_PATH, "rb") as f:
             data = tomllib.load(f)
-        version = data["project"]["version"]
+        return data["project"]["version"]
     except Exception:
-        version = "0.0.0-dev"
+        return None
 
-    return version
+
+def get_version() -> str:
+    """
+    Return flexycon's version. A checkout (including the editable install) reads
+    it from 'pyproject.toml', which is always up to date. Falls back to the
+    installed package's metadata.
+    """
+    if PYPROJECT_PATH.is_file():
+        version = read_project_version()
+        if version is not None:
+            return version
+
+    from importlib import metadata
+
+    try:
+        return metadata.version("flexycon")
+    except metadata.PackageNotFoundError:
+        return "0.0.0-dev"
 
 
 def resolve_path(path_parts: list[str]) -> Path:
@@ -58,6 +75,8 @@ def get_parent_process_chain(start_pid: int | None = None) -> list[tuple[str, in
         list of tuple: [(name, pid), ...]
     """
 
+    import psutil  # slow to import, and only needed here
+
     process_chain: list[tuple[str, int]] = []
     current_process: psutil.Process | None = (
         psutil.Process(start_pid) if start_pid else psutil.Process()
@@ -180,12 +199,12 @@ def set_wallpaper(image_path: Path) -> bool:
             run_cmd(["xwallpaper", "--clear", "--zoom", image_path])
 
         case "Wayland":
-            if shutil.which("swaybg"):
+            if which("swaybg"):
                 # Note: swaybg typically runs as a daemon; this kills previous instances
                 run_cmd(["pkill", "swaybg"])
                 run_cmd_background(["swaybg", "-i", image_path, "-m", "fill"])
 
-            elif shutil.which("hyprpaper"):
+            elif which("hyprpaper"):
                 run_cmd(["hyprpaper", "preload", image_path])
                 run_cmd(["hyprpaper", "wallpaper", f", {image_path}"])
 
@@ -1,25 +1,163 @@
+import fnmatch
 import json
 import os
+import random
+import re
+import secrets
 import shutil
+import stat
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
+from typing import Any, Iterable, Iterator, Self
+from urllib.parse import quote
 
+from common.cache_utilities import which
 from common.cmd_utilities import run_cmd
 from common.logger import log
 from common.notification_utilities import Notification
 from common.prompt_utilities import prompt_bool, prompt_options
+from common.variables import XDG_CACHE_HOME, XDG_DATA_HOME
 
 IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp"}
+IMAGE_INDEX_PATH = XDG_CACHE_HOME / "flexycon" / "image_index.json"
 
+HOME_TRASH = XDG_DATA_HOME / "Trash"
+TRASH_CHUNK_SIZE = 100
+
+
+def _is_content_unchanged(data: bytes, path: Path) -> bool:
+    try:
+        # Comparing sizes first avoids reading files that obviously changed
+        if path.stat().st_size != len(data):
+            return False
+
+        return path.read_bytes() == data
+    except OSError:
+        return False
+
+
+def _write_temp_file(data: bytes, path: Path, fsync: bool) -> Path:
+    """
+    Write data to a temporary file next to path, which can then be renamed over
+    it. The existing file's permissions are kept, new files get the default ones.
+    """
+    temp_path = path.with_name(f".{path.name}.{secrets.token_hex(4)}.tmp")
+
+    try:
+        mode: int | None = stat.S_IMODE(path.stat().st_mode)
+    except OSError:
+        mode = None
+
+    # New files get 0o666 minus the umask, like with a regular open()
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+
+        if mode is not None:
+            os.chmod(temp_path, mode)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+    return temp_path
+
+
+def write_to_file(content: str, path: Path, fsync: bool = False) -> bool:
+    """
+    Atomically write content to a file, unless it already has that content.
+    Returns whether the file was written.
+
+    Skipping unchanged files keeps their mtime, so editors and dotdrop don't
+    see a change. The content is written to a temporary file that replaces the
+    target, so readers never see a partially written file.
+    """
+    data = content.encode("utf-8")
+
+    # Write through symlinks instead of replacing them
+    path = path.resolve() if path.is_symlink() else path
+
+    if _is_content_unchanged(data, path):
+        log.debug(f"File {str(path)!r} is up to date")
+        return False
 
-def write_to_file(content: str, path: Path):
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(content, encoding="utf-8")
+    os.replace(_write_temp_file(data, path, fsync), path)
 
     log.debug(
         f"Wrote contents {content[:20].replace('\n', ' ')!r} to file {str(path)!r}"
     )
 
+    return True
+
+
+class FileBatch:
+    """
+    Write many files as one unit.
+
+    Writes are staged and only applied when the ``with`` block exits without an
+    error. All changed files are written to temporary files first, and only
+    once every one of them succeeded are they renamed into place. Files whose
+    content is unchanged aren't touched.
+    """
+
+    def __init__(self, fsync: bool = False):
+        self.fsync = fsync
+        self.changed: list[Path] = []
+        self._staged: dict[Path, str] = {}
+
+    def write(self, content: str, path: Path) -> None:
+        self._staged[path] = content
+
+    def commit(self) -> list[Path]:
+        """Apply the staged writes and return the paths that changed."""
+        pending: list[tuple[Path, Path]] = []
+
+        try:
+            for path, content in self._staged.items():
+                data = content.encode("utf-8")
+                path = path.resolve() if path.is_symlink() else path
+                if _is_content_unchanged(data, path):
+                    continue
+
+                path.parent.mkdir(parents=True, exist_ok=True)
+                pending.append((_write_temp_file(data, path, self.fsync), path))
+        except BaseException:
+            for temp_path, _path in pending:
+                temp_path.unlink(missing_ok=True)
+            raise
+
+        # Renames can still fail (e.g. on a read-only target), so the files that
+        # were replaced are recorded, and the remaining temporary files removed
+        replaced: list[Path] = []
+        try:
+            for temp_path, path in pending:
+                os.replace(temp_path, path)
+                replaced.append(path)
+                log.debug(f"Wrote file {str(path)!r}")
+        finally:
+            for temp_path, _path in pending[len(replaced) :]:
+                temp_path.unlink(missing_ok=True)
+
+            self._staged.clear()
+            self.changed.extend(replaced)
+
+        return replaced
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, *_: object) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self._staged.clear()
+
 
 def load_json(path: Path) -> str | None:
     """Load a JSON file if it exists."""
@@ -57,47 +195,130 @@ def ensure_directory_interactive(path: Path) -> bool:
         return False
 
 
+def _compile_patterns(patterns: set[str]) -> re.Pattern[str]:
+    """Combine glob patterns into a single regex matching entry names."""
+    return re.compile("|".join(fnmatch.translate(p) for p in patterns))
+
+
+def _scan_matches(
+    base_path: Path, pattern: re.Pattern[str], global_excludes: set[str]
+) -> Iterator[os.DirEntry[str]]:
+    """
+    Yield the entries under base_path whose names match the pattern, in a single
+    traversal. Excluded directories are pruned before descending into them, and
+    matched directories are not descended into, since they are removed whole.
+    """
+    stack = [str(base_path)]
+
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError as e:
+            log.warning(f"Failed to scan {directory!r}: {e}")
+            continue
+
+        for entry in entries:
+            if entry.name in global_excludes:
+                continue
+
+            if pattern.match(entry.name):
+                yield entry
+            elif entry.is_dir(follow_symlinks=False):
+                stack.append(entry.path)
+
+
+def _remove_path(path: str, is_dir: bool) -> None:
+    try:
+        if is_dir:
+            shutil.rmtree(path)
+        else:
+            # missing_ok=True handles race conditions
+            Path(path).unlink(missing_ok=True)
+
+        log.debug(f"Removed {path!r}")
+    except Exception as e:
+        log.warning(f"Failed to remove {path!r}: {e}")
+
+
 def remove_files_by_pattern(
     patterns: set[str],
     base_dir: str | Path = ".",
     global_excludes: set[str] | None = None,
+    max_workers: int | None = None,
 ) -> None:
     """
     Recursively deletes files and directories matching glob patterns,
     unless they are part of a globally excluded directory tree.
 
-    :param patterns: Set of glob patterns (e.g., {'*.tmp', 'build'}).
+    The tree is walked once for all patterns, and the matches are deleted by
+    a thread pool while the walk continues.
+
+    :param patterns: Set of glob patterns matched against entry names
+                     (e.g., {'*.tmp', 'build'}).
     :param base_dir: Root directory to start the search.
     :param global_excludes: Directory names to ignore anywhere in the path.
+    :param max_workers: Maximum number of threads deleting matches.
     """
     if global_excludes is None:
         global_excludes = set()
 
+    if not patterns:
+        return
+
     base_path = Path(base_dir).resolve()
 
-    for pattern in patterns:
-        # rglob handles the recursion for the pattern matching
-        for path in base_path.rglob(pattern):
-            # Existence check (handles overlapping pattern matches)
-            if not path.exists() and not path.is_symlink():
-                continue
+    # The whole tree is protected if the base itself is inside an excluded one
+    if any(part in global_excludes for part in base_path.parts):
+        return
 
-            # SKIP LOGIC: Check if any segment of the path is in global_excludes
-            # This protects the folder itself and everything inside it.
-            if any(part in global_excludes for part in path.parts):
-                continue
+    pattern = _compile_patterns(patterns)
 
-            try:
-                # DELETION LOGIC
-                if path.is_dir() and not path.is_symlink():
-                    shutil.rmtree(path)
-                else:
-                    # missing_ok=True handles race conditions
-                    path.unlink(missing_ok=True)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for entry in _scan_matches(base_path, pattern, global_excludes):
+            # Symlinks are unlinked, never followed
+            executor.submit(
+                _remove_path, entry.path, entry.is_dir(follow_symlinks=False)
+            )
 
-                log.debug(f"Removed {str(path)!r}")
-            except Exception as e:
-                log.warning(f"Failed to remove {str(path)!r}: {e}")
+
+def _remove_empty_subdirs(
+    path: str, global_excludes: set[str], protected_roots: set[str]
+) -> bool:
+    """
+    Remove the empty subdirectories of path bottom-up. Returns whether path
+    itself is empty afterwards.
+    """
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError as e:
+        log.warning(f"Could not remove {path!r}: {e}")
+        return False
+
+    is_empty = True
+    for entry in entries:
+        if (
+            not entry.is_dir(follow_symlinks=False)
+            or entry.name in global_excludes
+            or entry.path in protected_roots
+        ):
+            is_empty = False
+            continue
+
+        if not _remove_empty_subdirs(entry.path, global_excludes, protected_roots):
+            is_empty = False
+            continue
+
+        try:
+            os.rmdir(entry.path)
+            log.debug(f"Removed empty directory {entry.path!r}")
+        except OSError as e:
+            log.warning(f"Could not remove {entry.path!r}: {e}")
+            is_empty = False
+
+    return is_empty
 
 
 def remove_empty_dirs(
@@ -109,6 +330,8 @@ def remove_empty_dirs(
     Removes empty directories bottom-up, respecting global name exclusions
     and specific protected root paths.
 
+    Excluded and protected trees are pruned without being walked.
+
     :param base_dir: The root directory to start the cleanup from.
     :param global_excludes: Set of exact directory names to ignore everywhere.
     :param protected_roots: Set of exact Path roots to protect.
@@ -123,48 +346,153 @@ def remove_empty_dirs(
     base_path = Path(base_dir).resolve()
     resolved_protected = {p.resolve() for p in protected_roots}
 
-    # topdown=False ensures we process leaf directories before their parents
-    for root, dirs, _files in os.walk(base_path, topdown=False):
-        root_path = Path(root).resolve()
+    if any(part in global_excludes for part in base_path.parts):
+        return
 
-        # SKIP LOGIC A: Is the current tree protected?
-        if any(root_path.is_relative_to(prot) for prot in resolved_protected):
-            continue
+    if any(base_path.is_relative_to(prot) for prot in resolved_protected):
+        return
 
-        if any(part in global_excludes for part in root_path.parts):
-            continue
+    _remove_empty_subdirs(
+        str(base_path), global_excludes, {str(p) for p in resolved_protected}
+    )
 
-        for d in dirs:
-            dir_path = root_path / d
 
-            # SKIP LOGIC B: Is this specific subdirectory protected?
-            if any(dir_path.is_relative_to(prot) for prot in resolved_protected):
-                continue
+class FreedesktopTrash:
+    """
+    Minimal implementation of the freedesktop.org Trash specification.
 
-            if d in global_excludes:
-                continue
+    Files are moved into the trash with a rename, so only files on the same
+    filesystem as the trash directory can be handled. ``put`` returns False for
+    the others, leaving them to an external tool.
+    """
 
-            # ATTEMPT REMOVAL
+    def __init__(self, trash_dir: Path = HOME_TRASH):
+        self.files_dir = trash_dir / "files"
+        self.info_dir = trash_dir / "info"
+        self._device: int | None = None
+
+    def _get_device(self) -> int:
+        if self._device is None:
+            self.files_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            self.info_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            self._device = self.files_dir.stat().st_dev
+
+        return self._device
+
+    def _create_info_file(self, path: Path) -> tuple[Path, str]:
+        """
+        Atomically reserve a unique name in the trash by creating its info file.
+        Names already used in 'files', e.g. by files left there without their info
+        file, are skipped as well.
+        """
+        info = (
+            "[Trash Info]\n"
+            f"Path={quote(str(path))}\n"
+            f"DeletionDate={datetime.now().strftime('%Y-%m-%dT%H:%M:%S')}\n"
+        )
+
+        name = path.name
+        counter = 1
+        while True:
+            info_path = self.info_dir / f"{name}.trashinfo"
+            try:
+                if os.path.lexists(self.files_dir / name):
+                    raise FileExistsError(name)
+
+                with open(info_path, "x", encoding="utf-8") as f:
+                    f.write(info)
+                return info_path, name
+            except FileExistsError:
+                counter += 1
+                name = f"{path.stem}_{counter}{path.suffix}"
+
+    @staticmethod
+    def _move(path: Path, destination: Path) -> None:
+        """Move the path, raising FileExistsError instead of replacing a file."""
+        if path.is_dir() and not path.is_symlink():
+            # Renaming a directory only replaces an empty directory
+            if os.path.lexists(destination):
+                raise FileExistsError(str(destination))
+            os.rename(path, destination)
+            return
+
+        os.link(path, destination, follow_symlinks=False)
+        os.unlink(path)
+
+    def put(self, path: Path) -> bool:
+        # Don't resolve, so symlinks are trashed rather than their targets
+        path = Path(os.path.abspath(path))
+
+        while True:
             try:
-                # iterdir() yields all contents (including hidden files and broken symlinks)
-                if not any(dir_path.iterdir()):
-                    dir_path.rmdir()
-                    log.debug(f"Removed empty directory {str(dir_path)!r}")
+                if path.lstat().st_dev != self._get_device():
+                    return False
+
+                info_path, name = self._create_info_file(path)
             except OSError as e:
-                log.warning(f"Could not remove {str(dir_path)!r}: {e}")
+                log.debug(f"Unable to trash {str(path)!r} natively: {e}")
+                return False
 
+            try:
+                self._move(path, self.files_dir / name)
+                break
+            except FileExistsError:
+                # Taken since the name was reserved, so the next one is tried
+                info_path.unlink(missing_ok=True)
+            except OSError as e:
+                log.debug(f"Unable to move {str(path)!r} to the trash: {e}")
+                info_path.unlink(missing_ok=True)
+                return False
 
-def trash_files(paths: list[Path]) -> bool:
-    if not paths:
+        log.debug(f"Trashed {str(path)!r} as {name!r}")
         return True
 
+
+def _trash_with_command(command: list[str], paths: list[Path]) -> dict[Path, bool]:
+    """
+    Trash paths with one command call per chunk. If a call fails, the paths that
+    still exist are the ones that couldn't be trashed.
+    """
+    results: dict[Path, bool] = {}
+
+    for i in range(0, len(paths), TRASH_CHUNK_SIZE):
+        chunk = paths[i : i + TRASH_CHUNK_SIZE]
+
+        if run_cmd([*command, *chunk]).success:
+            results.update(dict.fromkeys(chunk, True))
+        else:
+            results.update({p: not os.path.lexists(p) for p in chunk})
+
+    return results
+
+
+def trash_paths(paths: list[Path]) -> dict[Path, bool]:
+    """Move paths to the trash, reporting whether each one was trashed."""
+    if not paths:
+        return {}
+
     if sys.platform == "darwin":
-        return run_cmd(["trash", *paths]).success
+        return _trash_with_command(["trash"], paths)
 
-    elif sys.platform == "linux":
-        return all([run_cmd(["trash-put", path]).success] for path in paths)
+    if sys.platform == "linux":
+        trash = FreedesktopTrash()
+        results = {path: trash.put(path) for path in paths}
 
-    return False
+        # Files on other filesystems need a trash directory on their own device
+        remaining = [path for path, trashed in results.items() if not trashed]
+        if remaining:
+            if which("trash-put"):
+                results.update(_trash_with_command(["trash-put", "--"], remaining))
+            else:
+                log.error("Binary 'trash-put' not found.")
+
+        return results
+
+    return dict.fromkeys(paths, False)
+
+
+def trash_files(paths: list[Path]) -> bool:
+    return all(trash_paths(paths).values())
 
 
 def trash_files_interactive(paths: list[Path]) -> bool:
@@ -202,15 +530,164 @@ def trash_files_interactive(paths: list[Path]) -> bool:
     return False
 
 
+def _is_image_name(name: str) -> bool:
+    return os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+
+
+def _list_image_dir(directory: str) -> tuple[list[str], list[str]]:
+    """Return the names of the images and of the subdirectories in a directory."""
+    images: list[str] = []
+    subdirs: list[str] = []
+
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.name)
+                elif _is_image_name(entry.name) and entry.is_file():
+                    images.append(entry.name)
+    except OSError as e:
+        log.debug(f"Could not scan {directory!r}: {e}")
+
+    return images, subdirs
+
+
+class ImageIndex:
+    """
+    On-disk index of the images in a directory tree.
+
+    Each directory's listing is stored with the directory's mtime, which changes
+    whenever an entry is added, removed or renamed, so only directories that
+    changed since the last run are scanned again. Directories that are gone from
+    a tree walked in full are dropped when saving.
+    """
+
+    def __init__(self, path: Path = IMAGE_INDEX_PATH):
+        self.path = path
+        self._dirs: dict[str, dict[str, Any]] | None = None
+        self._is_dirty = False
+        self._seen: set[str] = set()
+        self._walked_roots: list[str] = []
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        if self._dirs is None:
+            data = load_json(self.path)
+            self._dirs = data if isinstance(data, dict) else {}
+
+        return self._dirs
+
+    def iter_images(self, root: Path) -> Iterator[Path]:
+        dirs = self._load()
+        stack = [str(root)]
+
+        while stack:
+            directory = stack.pop()
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+
+            self._seen.add(directory)
+            listing = dirs.get(directory)
+            if listing is None or listing.get("mtime") != mtime:
+                images, subdirs = _list_image_dir(directory)
+                listing = {"mtime": mtime, "images": images, "dirs": subdirs}
+                dirs[directory] = listing
+                self._is_dirty = True
+
+            for name in listing["images"]:
+                yield Path(directory, name)
+
+            stack.extend(os.path.join(directory, name) for name in listing["dirs"])
+
+        # Only reached once the tree was walked in full
+        self._walked_roots.append(str(root))
+
+    def _prune(self) -> None:
+        """Drop the directories of walked trees that weren't seen."""
+        if not self._walked_roots:
+            return
+
+        dirs = self._load()
+        prefixes = tuple(os.path.join(root, "") for root in self._walked_roots)
+        for directory in list(dirs):
+            if directory in self._seen:
+                continue
+
+            if directory in self._walked_roots or directory.startswith(prefixes):
+                del dirs[directory]
+                self._is_dirty = True
+
+    def save(self) -> None:
+        self._prune()
+        if not self._is_dirty:
+            return
+
+        try:
+            write_to_file(json.dumps(self._load()), self.path)
+            self._is_dirty = False
+        except OSError as e:
+            log.warning(f"Unable to save image index {str(self.path)!r}: {e}")
+
+
+def iter_images_from_path(
+    path: Path, index: ImageIndex | None = None
+) -> Iterator[Path]:
+    """
+    Lazily find images in directories, or yield the path if it's an image file.
+    Directory trees are read through the index when one is given.
+    """
+    if path.is_file():
+        if _is_image_name(path.name):
+            yield path
+
+    elif path.is_dir():
+        if index is not None:
+            yield from index.iter_images(path)
+            return
+
+        stack = [str(path)]
+        while stack:
+            directory = stack.pop()
+            images, subdirs = _list_image_dir(directory)
+            for name in images:
+                yield Path(directory, name)
+            stack.extend(os.path.join(directory, name) for name in subdirs)
+
+
 def get_images_from_path(path: Path) -> list[Path]:
     """Recursively find images in directories or return file if it's an image."""
-    if not path.exists():
-        return []
+    return list(iter_images_from_path(path))
 
-    if path.is_file():
-        return [path] if path.suffix.lower() in IMAGE_EXTENSIONS else []
 
-    if path.is_dir():
-        return [p for p in path.rglob("*") if p.suffix.lower() in IMAGE_EXTENSIONS]
+def pick_random_image(
+    paths: Iterable[Path], avoid: Path | None = None, use_index: bool = True
+) -> Path | None:
+    """
+    Pick a random image from the given files and directories, preferring one
+    that isn't ``avoid``. Reservoir sampling is used, so the candidates are
+    never collected in a list.
+    """
+    index = ImageIndex() if use_index else None
+
+    chosen: Path | None = None
+    avoided: Path | None = None
+    count = 0
+
+    for path in paths:
+        for image in iter_images_from_path(path, index):
+            if image == avoid:
+                avoided = image
+                continue
+
+            # Keep the n-th candidate with probability 1/n
+            count += 1
+            if random.randrange(count) == 0:
+                chosen = image
+
+    if index is not None:
+        index.save()
+
+    log.debug(f"Picked from {count} candidate images")
 
-    return []
+    return chosen or avoided
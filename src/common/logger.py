@@ -1,20 +1,29 @@
+import functools
 import logging
 import sys
 
-import colorama
-from colorama import Fore, Style
-
 log = logging.getLogger(__name__)
 
-colorama.init(autoreset=True)
 
-LOG_COLORS = {
-    logging.DEBUG: Fore.BLUE,
-    logging.INFO: Fore.GREEN,
-    logging.WARNING: Fore.YELLOW,
-    logging.ERROR: Fore.RED,
-    logging.CRITICAL: Fore.MAGENTA + Style.BRIGHT,
-}
+@functools.cache
+def get_log_colors() -> dict[int, str]:
+    """
+    Return the color of each log level. colorama is only imported and
+    initialized here, so importing the logger stays cheap for scripts that
+    never set up logging.
+    """
+    import colorama
+    from colorama import Fore, Style
+
+    colorama.init(autoreset=True)
+
+    return {
+        logging.DEBUG: Fore.BLUE,
+        logging.INFO: Fore.GREEN,
+        logging.WARNING: Fore.YELLOW,
+        logging.ERROR: Fore.RED,
+        logging.CRITICAL: Fore.MAGENTA + Style.BRIGHT,
+    }
 
 
 LEVEL_NAME_MAP = {
@@ -27,14 +36,16 @@ LEVEL_NAME_MAP = {
 
 
 class ColoredFormatter(logging.Formatter):
+    RESET = "\033[0m"  # colorama's Style.RESET_ALL
+
     def format(self, record: logging.LogRecord) -> str:
         # Patch the levelname
         if record.levelno in LEVEL_NAME_MAP:
             record.levelname = LEVEL_NAME_MAP[record.levelno]
 
-        color = LOG_COLORS.get(record.levelno, "")
+        color = get_log_colors().get(record.levelno, "")
         formatted = super().format(record)
-        return f"{color}{formatted}{Style.RESET_ALL}"
+        return f"{color}{formatted}{self.RESET}"
 
 
 def setup_logging(
@@ -46,6 +57,8 @@ def setup_logging(
     Configure a specific logger with a colorized stream handler.
     To display the full timestamp, use date_fmt="%Y-%m-%d %H:%M:%S"
     """
+    get_log_colors()  # wraps stdout on Windows, so it must run first
+
     handler = logging.StreamHandler(sys.stdout)
     handler.setLevel(level)
 
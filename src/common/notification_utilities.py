@@ -1,9 +1,9 @@
-import shutil
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable, Literal
 
+from common.cache_utilities import which
 from common.cmd_utilities import run_cmd, run_cmd_background
 from common.logger import log
 
@@ -30,9 +30,9 @@ class Notification:
     ):
         notification_system: type[NotificationSystem] | None = None
 
-        if shutil.which("dunst"):
+        if which("dunst"):
             notification_system = Dunst
-        elif shutil.which("terminal-notifier"):
+        elif which("terminal-notifier"):
             notification_system = TerminalNotifier
 
         if notification_system:
@@ -139,7 +139,7 @@ class Dunst(NotificationSystem):
 
     @classmethod
     def get_paused(cls) -> bool | None:
-        if not shutil.which("dunstctl"):
+        if not which("dunstctl"):
             return None
 
         result = run_cmd(["dunstctl", "is-paused"])
@@ -150,7 +150,7 @@ class Dunst(NotificationSystem):
 
     @classmethod
     def set_paused(cls, status: bool | Literal["toggle"]) -> bool | None:
-        if not shutil.which("dunstctl"):
+        if not which("dunstctl"):
             return None
 
         status_str = ""
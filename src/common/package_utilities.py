@@ -5,10 +5,10 @@ from abc import ABC, abstractmethod
 from collections import defaultdict
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Iterable
 
-from git import Repo
-
-from common.cmd_utilities import run_cmd
+from common.cache_utilities import which
+from common.cmd_utilities import run_cmd, stream_cmd
 from common.logger import log
 
 
@@ -21,7 +21,7 @@ class PackageManager(ABC):
     def check_availability(cls) -> bool:
         """Check if the package manager is available on the system."""
         is_platform_same = cls.PLATFORM is None or sys.platform == cls.PLATFORM
-        return is_platform_same and shutil.which(cls.COMMAND) is not None
+        return is_platform_same and which(cls.COMMAND) is not None
 
     @classmethod
     @abstractmethod
@@ -72,8 +72,8 @@ class Brew(PackageManager):
     )
 
     @classmethod
-    def process_output(cls, output: str):
-        for line in output.splitlines():
+    def process_output(cls, lines: Iterable[str]):
+        for line in lines:
             if not line:
                 continue
 
@@ -107,14 +107,14 @@ class Brew(PackageManager):
         # Batch all regular formulas together
         if formulas:
             cmd = [cls.COMMAND, "install"] + formulas
-            result = run_cmd(cmd)
-            cls.process_output(result.output)
+            with stream_cmd(cmd) as stream:
+                cls.process_output(stream)
 
         # Batch all GUI casks together
         if casks:
             cmd = [cls.COMMAND, "install", "--cask"] + casks
-            result = run_cmd(cmd)
-            cls.process_output(result.output)
+            with stream_cmd(cmd) as stream:
+                cls.process_output(stream)
 
     @classmethod
     def uninstall(cls, package: Package) -> None:
@@ -178,6 +178,8 @@ class Git(PackageManager):
 
     @classmethod
     def install(cls, packages: list[Package]) -> None:
+        from git import Repo  # slow to import, so only loaded when needed
+
         for package in packages:
             if not package.destination:
                 log.error(f"Package {package.identifier!r} requires a 'destination'.")
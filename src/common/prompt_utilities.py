@@ -1,9 +1,9 @@
-import shutil
 import subprocess
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import Any, Callable
 
+from common.cache_utilities import which
 from common.logger import log
 
 
@@ -229,14 +229,14 @@ def prompt_options(
         return None
 
     if prefer_gui:
-        if shutil.which("dmenu"):
+        if which("dmenu"):
             return DmenuPrompt().prompt(
                 prompt=prompt,
                 options=options,
                 default=default,
                 row_count=row_count,
             )
-        if shutil.which("choose"):
+        if which("choose"):
             return ChoosePrompt().prompt(
                 prompt=prompt,
                 options=options,
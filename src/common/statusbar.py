@@ -1,8 +1,44 @@
+import argparse
+import fcntl
+import json
+import logging
 import os
+import signal
+import sys
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
 from enum import Enum
-from typing import Any, Callable
+from pathlib import Path
+from typing import Any, Callable, ClassVar, Protocol
 
-from common.logger import log
+from common.args import add_version_arg
+from common.logger import log, setup_logging
+from common.variables import STATUSBAR
+
+# Upper bound (in seconds) for external commands run by the statusbar blocks, so a
+# hung command can't stall the whole statusbar
+CMD_TIMEOUT = 3.0
+
+# Unix socket the statusbar daemon serves the block values on
+RUNTIME_DIR = Path(os.getenv("XDG_RUNTIME_DIR") or "/tmp")
+DAEMON_SOCKET_PATH = RUNTIME_DIR / "statusbar.sock"
+
+# Last output of each block, shared by the block scripts and the daemon
+BLOCK_CACHE_DIR = RUNTIME_DIR / "statusbar"
+
+
+class EventSource(Protocol):
+    """
+    File descriptor the statusbar daemon watches, to update a block as soon as
+    what it shows changes instead of waiting for its next interval.
+    """
+
+    def fileno(self) -> int: ...
+
+    def read_events(self) -> bool:
+        """Consume the pending events, returning whether the block should update."""
+        ...
 
 
 # TODO: Add more buttons
@@ -17,9 +53,16 @@ class MouseButton(Enum):
     EXTRA_3 = 8
 
 
-def handle_block_button(actions: dict[MouseButton, Callable[[], Any]]) -> bool:
-    """Handle block button events."""
-    block_button = os.getenv("BLOCK_BUTTON")
+def handle_block_button(
+    actions: dict[MouseButton, Callable[[], Any]], block_button: str | None = None
+) -> bool:
+    """
+    Handle block button events. The button is read from 'BLOCK_BUTTON', unless
+    it's given, e.g. when forwarded by the statusbar daemon.
+    """
+    if block_button is None:
+        block_button = os.getenv("BLOCK_BUTTON")
+
     if block_button is None:
         log.debug("Variable 'BLOCK_BUTTON' is not set.")
         return False
@@ -28,9 +71,7 @@ def handle_block_button(actions: dict[MouseButton, Callable[[], Any]]) -> bool:
         button = MouseButton(int(block_button))
         log.debug(f"Handling button {button}.")
     except ValueError:
-        log.warning(
-            f"Invalid MouseButton value from 'BLOCK_BUTTON': {int(block_button)}."
-        )
+        log.warning(f"Invalid MouseButton value from 'BLOCK_BUTTON': {block_button!r}.")
         return False
 
     action = actions.get(button)
@@ -41,3 +82,192 @@ def handle_block_button(actions: dict[MouseButton, Callable[[], Any]]) -> bool:
     action()
 
     return True
+
+
+def get_process_name(pid: int) -> str | None:
+    try:
+        return Path(f"/proc/{pid}/comm").read_text().strip()
+    except OSError:
+        return None
+
+
+def find_process(name: str) -> int | None:
+    """Return the PID of a process by its name, like 'pidof -s'."""
+    for proc_path in Path("/proc").iterdir():
+        if proc_path.name.isdigit() and get_process_name(int(proc_path.name)) == name:
+            return int(proc_path.name)
+
+    return None
+
+
+def signal_statusbar(signal_offset: int, statusbar: str = STATUSBAR) -> bool:
+    """Tell the statusbar to update the block with the signal, like 'pkill -RTMIN+n'."""
+    pid = find_process(statusbar)
+    if pid is None:
+        log.debug(f"{statusbar!r} is not running.")
+        return False
+
+    try:
+        os.kill(pid, signal.SIGRTMIN + signal_offset)
+    except ProcessLookupError:
+        return False
+
+    return True
+
+
+@dataclass
+class CachedOutput:
+    output: str
+    timestamp: float  # time.time()
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.timestamp
+
+
+class Block(ABC):
+    """
+    Statusbar block, registered in 'BLOCKS' by its name.
+
+    Its last output is cached in 'BLOCK_CACHE_DIR'. Once it's older than
+    ``interval``, the cached output is still printed right away, and the block is
+    updated in the background, signaling the statusbar if the output changed.
+    """
+
+    name: ClassVar[str]
+    description: ClassVar[str] = ""
+    interval: ClassVar[float] = 60  # seconds the output stays fresh
+    signal: ClassVar[int | None] = None  # the statusbar updates on SIGRTMIN+signal
+    cached: ClassVar[bool] = True  # whether rendering is slower than the cache
+    log_level: ClassVar[int] = logging.ERROR
+    actions: ClassVar[dict[MouseButton, Callable[[], Any]]] = {}
+    events: ClassVar[EventSource | None] = None  # watched by the statusbar daemon
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        if "name" in cls.__dict__:
+            BLOCKS[cls.name] = cls
+
+    @abstractmethod
+    def get_output(self) -> str:
+        """Render the block, or return an empty string to hide it."""
+        pass
+
+    @property
+    def cache_path(self) -> Path:
+        return BLOCK_CACHE_DIR / f"{self.name}.json"
+
+    def load_cache(self) -> CachedOutput | None:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                return CachedOutput(**json.load(f))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            log.warning(f"Ignoring unreadable cache {str(self.cache_path)!r}: {e}")
+            return None
+
+    def save_cache(self, output: str) -> None:
+        # Written to a temporary file first, so readers never see a partial file
+        temp_path = self.cache_path.with_name(f".{self.cache_path.name}.{os.getpid()}")
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path.write_text(
+                json.dumps(asdict(CachedOutput(output, time.time()))), encoding="utf-8"
+            )
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            log.warning(f"Unable to save cache {str(self.cache_path)!r}: {e}")
+            temp_path.unlink(missing_ok=True)
+
+    def update(self) -> str:
+        """Render the output, and cache it."""
+        output = self.get_output()
+        if self.cached:
+            self.save_cache(output)
+
+        return output
+
+    def read(self) -> tuple[str, bool]:
+        """
+        Return the output, and whether it's stale and should be updated in the
+        background. Only blocks without a cached output are rendered right away.
+        """
+        if not self.cached:
+            return self.get_output(), False
+
+        cache = self.load_cache()
+        if cache is None:
+            return self.update(), False
+
+        return cache.output, cache.age >= self.interval
+
+    def update_in_background(self, previous_output: str) -> None:
+        """
+        Update the block in a detached process, signaling the statusbar once the
+        output changed. The statusbar waits for the block script to exit, so it
+        can't be done in this process.
+        """
+        if os.fork() != 0:
+            return
+
+        try:
+            os.setsid()
+
+            # The statusbar reads the output until the pipe is closed
+            devnull = os.open(os.devnull, os.O_RDWR)
+            for fd in (0, 1, 2):
+                os.dup2(devnull, fd)
+
+            # Only one update at a time, as the statusbar may ask again meanwhile
+            lock_path = self.cache_path.with_suffix(".lock")
+            with open(lock_path, "w") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+                if self.update() != previous_output and self.signal is not None:
+                    signal_statusbar(self.signal)
+        finally:
+            os._exit(0)
+
+    def build_parser(self) -> argparse.ArgumentParser:
+        """Parse command-line arguments."""
+
+        parser = argparse.ArgumentParser(
+            prog=f"sb_{self.name}", description=self.description
+        )
+
+        parser.add_argument(
+            "-u",
+            "--update",
+            action="store_true",
+            help="render the block instead of printing its cached output",
+        )
+        parser.add_argument(
+            "-v", "--verbose", action="store_true", help="enable debug output"
+        )
+        add_version_arg(parser)
+
+        return parser
+
+    def main(self) -> None:
+        args = self.build_parser().parse_args()
+
+        setup_logging(log, logging.DEBUG if args.verbose else self.log_level)
+        log.debug(args)
+
+        # Clicks usually change what the block shows
+        if handle_block_button(self.actions) or args.update:
+            output, is_stale = self.update(), False
+        else:
+            output, is_stale = self.read()
+
+        if output:
+            print(output)
+
+        if is_stale:
+            sys.stdout.flush()
+            self.update_in_background(output)
+
+
+# Block name: block class, filled in as the blocks are defined
+BLOCKS: dict[str, type[Block]] = {}
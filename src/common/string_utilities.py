@@ -1,6 +1,14 @@
+import functools
+import json
 import re
 import unicodedata
-from typing import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Self
+
+from common.variables import XDG_CACHE_HOME
+
+DIACRITICS_TABLE_PATH = XDG_CACHE_HOME / "flexycon" / "diacritics.json"
 
 
 def truncate(
@@ -37,6 +45,14 @@ def truncate(
         return placeholder + text[-truncated_length:]
 
 
+# Splits between digits and non-digits, and between lowercase and uppercase
+_WORD_BOUNDARY_PATTERN = r"(?<=\D)(?=\d)|(?<=\d)(?=\D)|(?<=[a-z])(?=[A-Z])"
+
+_UPPERCASE_REGEX = re.compile(r"[A-Z]")
+_ACRONYM_REGEX = re.compile(r"[A-Z]{2,}")
+_WORD_REGEX = re.compile(r"[A-Z][a-z]+|[a-z]+|\d+")
+
+
 def split_acronyms(token: str) -> list[str]:
     """
     Handle acronyms.
@@ -48,7 +64,7 @@ def split_acronyms(token: str) -> list[str]:
     - HTMLParser → HTML + Parser
     - parseURLString → parse + URL + String
     """
-    if not re.search(r"[A-Z]", token):
+    if not _UPPERCASE_REGEX.search(token):
         return [token]
 
     parts: list[str] = []
@@ -57,24 +73,23 @@ def split_acronyms(token: str) -> list[str]:
 
     while i < n:
         # Match acronym (2+ uppercase letters)
-        match = re.match(r"[A-Z]{2,}", token[i:])
+        match = _ACRONYM_REGEX.match(token, i)
         if match:
-            acronym = match.group(0)
-            end = i + len(acronym)
+            end = match.end()
 
             # If next char exists and is lowercase, merge last capital with next word
             if end < n and token[end].islower():
-                parts.append(acronym[:-1])
+                parts.append(token[i : end - 1])
                 i = end - 1  # start new word from last uppercase
             else:
-                parts.append(acronym)
+                parts.append(match.group())
                 i = end
         else:
             # Otherwise, grab the next "normal" word segment
-            match = re.match(r"[A-Z][a-z]+|[a-z]+|\d+", token[i:])
+            match = _WORD_REGEX.match(token, i)
             if match:
-                parts.append(match.group(0))
-                i += len(match.group(0))
+                parts.append(match.group())
+                i = match.end()
             else:
                 # fallback: add single char (rare, safety net)
                 parts.append(token[i])
@@ -101,67 +116,260 @@ def split_camel_case(token: str) -> list[str]:
     return re.split(r"(?<=[a-z])(?=[A-Z])", token)
 
 
+@functools.lru_cache(maxsize=32)
+def _compile_splitter(boundaries: tuple[str, ...]) -> re.Pattern[str]:
+    """
+    Compile the boundaries together with the number and camel case splits, so a
+    text is split by a single 're.split'. The boundaries come first, so they're
+    consumed before the zero-width splits are tried at the same position.
+    """
+    if not boundaries:
+        return re.compile(_WORD_BOUNDARY_PATTERN)
+
+    return re.compile("|".join([*map(re.escape, boundaries), _WORD_BOUNDARY_PATTERN]))
+
+
+def _split_with(splitter: re.Pattern[str], text: str) -> list[str]:
+    words: list[str] = []
+    for token in splitter.split(text):
+        if not token:
+            continue
+
+        if _UPPERCASE_REGEX.search(token):
+            words.extend(split_acronyms(token))
+        else:
+            words.append(token)
+
+    return words
+
+
 def split_into_words(
     text: str, boundaries: list[str] = [" ", "-", "_", "."]
 ) -> list[str]:
     """
-    Split a string into words in multiple stages.
+    Split a string into words: on the boundaries, between digits and letters,
+    on camel case and around acronyms.
     """
     if not text:
         return []
 
-    tokens: list[str]
-    if boundaries:
-        pattern = "|".join(map(re.escape, boundaries))
-        tokens = [t for t in re.split(pattern, text) if t]
-    else:
-        tokens = [text]
+    return _split_with(_compile_splitter(tuple(boundaries)), text)
 
-    tokens = split_tokens(tokens, split_numbers)
-    tokens = split_tokens(tokens, split_camel_case)
-    tokens = split_tokens(tokens, split_acronyms)
 
-    return tokens
+def split_many(
+    texts: Iterable[str], boundaries: list[str] = [" ", "-", "_", "."]
+) -> list[list[str]]:
+    """Split each text into words, like 'split_into_words'."""
+    splitter = _compile_splitter(tuple(boundaries))
+    return [_split_with(splitter, text) if text else [] for text in texts]
 
 
-def remove_diacritics(text: str) -> str:
+def _strip_diacritics(text: str) -> str:
     # Normalize to decompose characters (e.g., 'ă' becomes 'a' + '˘')
     normalized = unicodedata.normalize("NFD", text)
 
     # Filter out the "combining" marks (category 'Mn')
-    result = "".join(c for c in normalized if unicodedata.category(c) != "Mn")
+    return "".join(c for c in normalized if unicodedata.category(c) != "Mn")
+
+
+class _DiacriticsTable(dict[int, str]):
+    """
+    'str.translate' table mapping each char to its stripped form. Chars are
+    added the first time they're looked up.
+    """
+
+    def __init__(self):
+        super().__init__()
+
+        # Chars whose stripped form keeps combining marks (category 'Mc'), which
+        # NFD may reorder with the marks of the following chars, so texts
+        # containing them can't be stripped char by char.
+        self.reordered: set[str] = set()
+
+    def __missing__(self, code: int) -> str:
+        char = chr(code)
+        stripped = _strip_diacritics(char)
+
+        if any(unicodedata.combining(c) for c in stripped):
+            self.reordered.add(char)
+
+        self[code] = stripped
+        return stripped
+
+
+_DIACRITICS_TABLE = _DiacriticsTable()
+
+
+def remove_diacritics(text: str) -> str:
+    """
+    Strip the combining marks from a text, e.g. 'Ünïcödé' -> 'Unicode'.
+    Chars are looked up in a table that is filled in as new chars are seen.
+    """
+    if text.isascii():
+        return text
+
+    result = text.translate(_DIACRITICS_TABLE)
+
+    reordered = _DIACRITICS_TABLE.reordered
+    if reordered and not reordered.isdisjoint(text):
+        return _strip_diacritics(text)
 
     return result
 
 
+def _ends_with_combining(char: str) -> bool:
+    return unicodedata.combining(unicodedata.normalize("NFD", char)[-1]) != 0
+
+
+def iter_remove_diacritics(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Strip the combining marks from a text read in chunks, e.g. from a file.
+    The joined output is the same as 'remove_diacritics' on the joined input.
+    """
+    pending = ""
+
+    for chunk in chunks:
+        text = pending + chunk
+
+        # Hold back the trailing combining chars, as the marks continuing in
+        # the next chunk may belong to them
+        cut = len(text)
+        while cut and _ends_with_combining(text[cut - 1]):
+            cut -= 1
+
+        pending = text[cut:]
+        if cut:
+            yield remove_diacritics(text[:cut])
+
+    if pending:
+        yield remove_diacritics(pending)
+
+
+def load_diacritics_table(path: Path = DIACRITICS_TABLE_PATH) -> bool:
+    """
+    Preload the chars saved by 'save_diacritics_table'. Tables saved with
+    another Unicode version are ignored.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return False
+
+    if data.get("unidata_version") != unicodedata.unidata_version:
+        return False
+
+    _DIACRITICS_TABLE.update({ord(c): s for c, s in data["table"].items()})
+    _DIACRITICS_TABLE.reordered.update(data["reordered"])
+
+    return True
+
+
+def save_diacritics_table(path: Path = DIACRITICS_TABLE_PATH) -> None:
+    """Save the chars looked up so far, so other processes can skip them."""
+    data = {
+        "unidata_version": unicodedata.unidata_version,
+        "table": {chr(code): s for code, s in _DIACRITICS_TABLE.items()},
+        "reordered": sorted(_DIACRITICS_TABLE.reordered),
+    }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+
 # Converters
 
 
-def to_alternate_case(text: str, delimiter: str = " ", upper_first: bool = True) -> str:
+@functools.lru_cache(maxsize=4096)
+def _split_cached(text: str, boundaries: tuple[str, ...]) -> tuple[str, ...]:
+    if not text:
+        return ()
+
+    return tuple(_split_with(_compile_splitter(boundaries), text))
+
+
+@dataclass(frozen=True)
+class Words:
     """
-    Alternates between upper and lower case chars, if available.
-    'Simple file name1' -> 'SiMpLe FiLe NaMe 1'
+    The words of a text, split once and rendered in any case style.
+
+    Splitting is memoized on (text, boundaries), so converting the same names
+    again, or to several case styles, doesn't repeat the regex work.
     """
-    words = split_into_words(text)
 
-    result: list[str] = []
-    upper_next = upper_first
+    words: tuple[str, ...]
 
-    for word in words:
-        new_word = ""
+    @classmethod
+    def from_text(
+        cls, text: str, boundaries: Iterable[str] = (" ", "-", "_", ".")
+    ) -> Self:
+        return cls(_split_cached(text, tuple(boundaries)))
 
-        for char in word:
-            # Check if the character is case-sensitive
-            if char.upper() != char.lower():
-                new_word += char.upper() if upper_next else char.lower()
-                upper_next = not upper_next
-            else:
-                # Keep as-is if alternate case not found
-                new_word += char
+    def alternate_case(self, delimiter: str = " ", upper_first: bool = True) -> str:
+        result: list[str] = []
+        upper_next = upper_first
+
+        for word in self.words:
+            chars: list[str] = []
+
+            for char in word:
+                upper, lower = char.upper(), char.lower()
+
+                # Check if the character is case-sensitive
+                if upper != lower:
+                    chars.append(upper if upper_next else lower)
+                    upper_next = not upper_next
+                else:
+                    # Keep as-is if alternate case not found
+                    chars.append(char)
+
+            result.append("".join(chars))
 
-        result.append(new_word)
+        return delimiter.join(result)
 
-    return delimiter.join(result)
+    def camel_case(self, delimiter: str = "") -> str:
+        if not self.words:
+            return ""
+
+        first = self.words[0].lower()
+        rest = [w[:1].upper() + w[1:].lower() for w in self.words[1:]]
+
+        return delimiter.join([first, *rest])
+
+    def pascal_case(self, delimiter: str = "") -> str:
+        return delimiter.join(w[:1].upper() + w[1:].lower() for w in self.words)
+
+    def lower_case(self, delimiter: str = " ") -> str:
+        return delimiter.join(self.words).lower()
+
+    def upper_case(self, delimiter: str = " ") -> str:
+        return delimiter.join(self.words).upper()
+
+
+type CaseStyle = Callable[[Words], str]
+
+
+def convert_case(text: str, styles: Iterable[CaseStyle]) -> list[str]:
+    """
+    Render a text in several case styles, splitting it only once.
+    convert_case('Simple file', [Words.camel_case, Words.upper_case])
+    -> ['simpleFile', 'SIMPLE FILE']
+    """
+    words = Words.from_text(text)
+    return [style(words) for style in styles]
+
+
+def convert_many(texts: Iterable[str], style: CaseStyle) -> list[str]:
+    """Render each text in the same case style."""
+    return [style(Words.from_text(text)) for text in texts]
+
+
+def to_alternate_case(text: str, delimiter: str = " ", upper_first: bool = True) -> str:
+    """
+    Alternates between upper and lower case chars, if available.
+    'Simple file name1' -> 'SiMpLe FiLe NaMe 1'
+    """
+    return Words.from_text(text).alternate_case(delimiter, upper_first)
 
 
 def to_camel_case(text: str, delimiter: str = "") -> str:
@@ -169,14 +377,7 @@ def to_camel_case(text: str, delimiter: str = "") -> str:
     First word is lowercase. All other words are in pascal case.
     'Simple file name1' -> 'simpleFileName1'
     """
-    words = split_into_words(text)
-    if not words:
-        return ""
-
-    first = words[0].lower()
-    rest = [w[:1].upper() + w[1:].lower() if w else "" for w in words[1:]]
-
-    return delimiter.join([first] + rest)
+    return Words.from_text(text).camel_case(delimiter)
 
 
 def to_pascal_case(text: str, delimiter: str = "") -> str:
@@ -184,22 +385,18 @@ def to_pascal_case(text: str, delimiter: str = "") -> str:
     Capitalize the first char of each word. All other chars are lowercase.
     'Simple file name1' -> 'SimpleFileName1'
     """
-    words = split_into_words(text)
-    capitalized_words = [w[:1].upper() + w[1:].lower() if w else "" for w in words]
-    return delimiter.join(capitalized_words)
+    return Words.from_text(text).pascal_case(delimiter)
 
 
 def to_lower_case(text: str, delimiter: str = " ") -> str:
     """
     'Simple file name1' -> 'simple file name 1'
     """
-    words = split_into_words(text)
-    return delimiter.join(words).lower()
+    return Words.from_text(text).lower_case(delimiter)
 
 
 def to_upper_case(text: str, delimiter: str = " ") -> str:
     """
     'Simple file name1' -> 'SIMPLE FILE NAME 1'
     """
-    words = split_into_words(text)
-    return delimiter.join(words).upper()
+    return Words.from_text(text).upper_case(delimiter)
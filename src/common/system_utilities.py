@@ -1,9 +1,9 @@
 import os
-import shutil
 import sys
 from dataclasses import dataclass
 from typing import Literal
 
+from common.cache_utilities import which
 from common.cmd_utilities import run_cmd
 from common.logger import log
 
@@ -82,7 +82,7 @@ class System:
         is_x11 = (session_type == "x11") or ("DISPLAY" in os.environ)
 
         for locker in cls.SCREEN_LOCKER_REGISTRY.values():
-            if not shutil.which(locker.cmd[0]):
+            if not which(locker.cmd[0]):
                 continue
 
             if locker.req_x11 and not is_x11:
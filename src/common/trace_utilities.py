@@ -0,0 +1,156 @@
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from common.logger import log
+from common.variables import FLEXYCON_DATA
+
+# When set to a file path, every command run through 'common.cmd_utilities' is
+# appended to that file as a JSON line. Child processes inherit the variable, so
+# scripts started by a traced script are traced as well.
+TRACE_ENV_VAR = "FLEXYCON_TRACE"
+DEFAULT_TRACE_PATH = FLEXYCON_DATA / "traces" / "commands.jsonl"
+
+_write_lock = threading.Lock()
+
+# Set once the trace file can't be written, so it's only reported once and the
+# commands keep running untraced
+_tracing_failed = threading.Event()
+
+
+@dataclass
+class CommandTrace:
+    argv: list[str]
+    start: float  # time.monotonic()
+    end: float  # time.monotonic()
+    return_code: int | None
+    output_bytes: int
+    pid: int
+    thread_id: int
+
+    @property
+    def wall_time(self) -> float:
+        return self.end - self.start
+
+
+def get_trace_path() -> Path | None:
+    trace_path = os.getenv(TRACE_ENV_VAR)
+    return Path(trace_path) if trace_path else None
+
+
+def is_tracing_enabled() -> bool:
+    return bool(os.getenv(TRACE_ENV_VAR))
+
+
+def enable_tracing(path: Path = DEFAULT_TRACE_PATH, reset: bool = True) -> None:
+    """
+    Trace the commands of this process and of its child processes. Unless
+    ``reset`` is False, traces from previous runs are discarded.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if reset:
+        path.write_text("", encoding="utf-8")
+
+    os.environ[TRACE_ENV_VAR] = str(path.resolve())
+    _tracing_failed.clear()
+
+
+def record_command(
+    argv: list[str],
+    start: float,
+    return_code: int | None,
+    output_bytes: int,
+) -> None:
+    """Append a finished command to the trace file, if tracing is enabled."""
+    trace_path = get_trace_path()
+    if trace_path is None or _tracing_failed.is_set():
+        return
+
+    trace = CommandTrace(
+        argv=argv,
+        start=start,
+        end=time.monotonic(),
+        return_code=return_code,
+        output_bytes=output_bytes,
+        pid=os.getpid(),
+        thread_id=threading.get_ident(),
+    )
+
+    line = json.dumps(asdict(trace)) + "\n"
+    with _write_lock:
+        try:
+            with open(trace_path, "a", encoding="utf-8") as f:
+                f.write(line)
+        except OSError as e:
+            if not _tracing_failed.is_set():
+                _tracing_failed.set()
+                log.warning(
+                    f"Tracing disabled, unable to write {str(trace_path)!r}: {e}"
+                )
+
+
+def load_traces(path: Path) -> list[CommandTrace]:
+    """Load the traces from a JSONL trace file, skipping malformed lines."""
+    traces: list[CommandTrace] = []
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                traces.append(CommandTrace(**json.loads(line)))
+            except (ValueError, TypeError):
+                continue
+
+    return traces
+
+
+def summarize_traces(traces: list[CommandTrace], limit: int = 10) -> str:
+    """Return a plain text report of the slowest commands."""
+    if not traces:
+        return "No commands were traced."
+
+    total_time = sum(t.wall_time for t in traces)
+    slowest = sorted(traces, key=lambda t: t.wall_time, reverse=True)[:limit]
+
+    lines = [
+        f"{len(traces)} commands, {total_time:.2f}s in total. Slowest {len(slowest)}:",
+        "",
+        f"{'Time':>9}  {'Code':>4}  {'Output':>10}  Command",
+    ]
+    for t in slowest:
+        return_code = "-" if t.return_code is None else str(t.return_code)
+        lines.append(
+            f"{t.wall_time:>8.3f}s  {return_code:>4}  {t.output_bytes:>9}B  "
+            f"{' '.join(t.argv)}"
+        )
+
+    return "\n".join(lines)
+
+
+def write_chrome_trace(traces: list[CommandTrace], path: Path) -> None:
+    """
+    Write the traces in the Chrome trace event format, which can be opened with
+    'chrome://tracing' or https://ui.perfetto.dev
+    """
+    events = [
+        {
+            "name": os.path.basename(t.argv[0]) if t.argv else "?",
+            "cat": "command",
+            "ph": "X",
+            "ts": t.start * 1_000_000,
+            "dur": t.wall_time * 1_000_000,
+            "pid": t.pid,
+            "tid": t.thread_id,
+            "args": {
+                "argv": t.argv,
+                "return_code": t.return_code,
+                "output_bytes": t.output_bytes,
+            },
+        }
+        for t in traces
+    ]
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"traceEvents": events}), encoding="utf-8")
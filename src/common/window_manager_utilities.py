@@ -1,8 +1,6 @@
 import os
 import signal
 
-import psutil
-
 from common.cmd_utilities import run_cmd
 from common.helpers import get_parent_process_chain
 from common.logger import log
@@ -27,6 +25,8 @@ class WindowManager:
     @staticmethod
     def find_running_pid(name: str) -> int | None:
         """Checks the process tree for a specific process name."""
+        import psutil  # slow to import, so only loaded when needed
+
         try:
             # Check the parent chain first
             process_chain = get_parent_process_chain()
@@ -47,6 +47,8 @@ class WindowManager:
         return self.pid is not None
 
     def terminate(self):
+        import psutil
+
         psutil.Process(self._pid).terminate()
 
     def __repr__(self):
@@ -6,7 +6,7 @@ import argparse
 import logging
 from pathlib import Path
 
-from common.helpers import get_version
+from common.args import add_version_arg
 from common.logger import log, setup_logging
 from scripts.continuous_diff.src.core import monitor_file
 
@@ -26,9 +26,7 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="enable debug output"
     )
-    parser.add_argument(
-        "--version", action="version", version=f"%(prog)s {get_version()}"
-    )
+    add_version_arg(parser)
 
     return parser
 
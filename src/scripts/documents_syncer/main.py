@@ -7,7 +7,7 @@ import logging
 import sys
 from pathlib import Path
 
-from common.helpers import get_version
+from common.args import add_version_arg
 from common.logger import log, setup_logging
 from scripts.documents_syncer.src.core import (
     collect_target_files,
@@ -43,9 +43,7 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="enable debug output"
     )
-    parser.add_argument(
-        "--version", action="version", version=f"%(prog)s {get_version()}"
-    )
+    add_version_arg(parser)
 
     return parser
 
@@ -3,7 +3,7 @@ import logging
 import warnings
 from pathlib import Path
 
-from common.helpers import get_version
+from common.args import add_version_arg
 from common.logger import log, setup_logging
 from common.variables import FLEXYCON_CONFIG
 from scripts.dunst_config_compiler.src.core import compose_config_file
@@ -32,9 +32,7 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="enable debug output"
     )
-    parser.add_argument(
-        "--version", action="version", version=f"%(prog)s {get_version()}"
-    )
+    add_version_arg(parser)
 
     return parser
 
@@ -6,7 +6,7 @@ import argparse
 import logging
 from pathlib import Path
 
-from common.helpers import get_version
+from common.args import add_version_arg
 from common.logger import log, setup_logging
 from common.string_utilities import (
     to_alternate_case,
@@ -129,9 +129,7 @@ def build_parser(converters_map: dict[str, ConverterRow]) -> argparse.ArgumentPa
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="enable debug output"
     )
-    parser.add_argument(
-        "--version", action="version", version=f"%(prog)s {get_version()}"
-    )
+    add_version_arg(parser)
 
     return parser
 
@@ -3,9 +3,11 @@
 import argparse
 import logging
 import sys
+from pathlib import Path
 
-from common.helpers import get_version
+from common.args import add_version_arg
 from common.logger import log, setup_logging
+from common.trace_utilities import DEFAULT_TRACE_PATH, enable_tracing
 from scripts.flexy.src.helpers import Action
 from scripts.flexy.src.targets import (
     clean,
@@ -13,8 +15,11 @@ from scripts.flexy.src.targets import (
     install,
     install_pre_commit_hooks,
     install_system_packages,
+    run_benchmarks,
+    save_benchmark_baseline,
     setup,
     setup_virtual_env,
+    summarize_trace,
     uninstall,
 )
 
@@ -59,6 +64,21 @@ ACTIONS: list[Action] = [
         description="handle vscode extensions",
         fn=handle_vscode_extensions,
     ),
+    Action(
+        name="trace_summary",
+        description="show the slowest commands of the last traced run",
+        fn=summarize_trace,
+    ),
+    Action(
+        name="benchmark",
+        description="run the benchmarks and compare them to the baseline",
+        fn=run_benchmarks,
+    ),
+    Action(
+        name="benchmark_baseline",
+        description="save the last benchmark results as the baseline",
+        fn=save_benchmark_baseline,
+    ),
 ]
 
 
@@ -70,15 +90,22 @@ def build_parser(actions: list[Action]) -> argparse.ArgumentParser:
         description="Help utility for managing flexycon.",
     )
 
-    parser.add_argument(
-        "--version", action="version", version=f"%(prog)s {get_version()}"
-    )
+    add_version_arg(parser)
 
     # SUBCOMMANDS
     cmd_parent = argparse.ArgumentParser(add_help=False)
     cmd_parent.add_argument(
         "-v", "--verbose", action="store_true", help="enable debug output"
     )
+    cmd_parent.add_argument(
+        "--trace",
+        nargs="?",
+        const=DEFAULT_TRACE_PATH,
+        type=Path,
+        metavar="FILE",
+        help="record the commands that are run, or the trace to summarize "
+        f"(default: {str(DEFAULT_TRACE_PATH)!r})",
+    )
 
     subparsers = parser.add_subparsers(dest="action", metavar="ACTION", required=True)
 
@@ -98,6 +125,13 @@ def main() -> None:
     setup_logging(log, logging.DEBUG if args.verbose else logging.INFO)
     log.debug(args)
 
+    if args.trace:
+        # 'trace_summary' summarizes the given trace, so it's kept
+        summarizing = args.action == "trace_summary"
+        enable_tracing(args.trace, reset=not summarizing)
+        if not summarizing:
+            log.info(f"Tracing commands to {str(args.trace)!r}")
+
     for action in ACTIONS:
         if action.name == args.action:
             result = action.fn()
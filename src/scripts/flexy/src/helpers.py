@@ -6,8 +6,7 @@ import sys
 from pathlib import Path
 from typing import Any, Callable, NamedTuple
 
-import yaml
-
+from common.cache_utilities import invalidate_cmd, run_cmd_cached
 from common.cmd_utilities import run_cmd
 from common.logger import log
 from common.variables import FLEXYCON_CONFIG, FLEXYCON_DATA, FLEXYCON_HOME, HOME
@@ -20,6 +19,7 @@ PYTHON_BIN = shutil.which("python3") or "python"
 USER_VARIABLES_PATH = FLEXYCON_HOME / "uservariables.yaml"
 DOTDROP_CONFIG = FLEXYCON_HOME / "config.yaml"
 VSCODE_EXTENSIONS_FILE = FLEXYCON_CONFIG / "vscode" / "extensions.txt"
+VSCODE_LIST_EXTENSIONS_CMD = ["code", "--list-extensions"]
 
 
 class Action(NamedTuple):
@@ -66,6 +66,8 @@ def git_update_submodules():
 
 
 def get_actual_dotdrop_profiles() -> list[str]:
+    import yaml  # slow to import, so only loaded when needed
+
     with DOTDROP_CONFIG.open() as f:
         data = yaml.safe_load(f)
 
@@ -81,6 +83,8 @@ def get_dotdrop_profile() -> str | None:
     Resolve the active dotdrop profile from the environment or user variables
     file.
     """
+    import yaml
+
     profile = os.getenv("DOTDROP_PROFILE")
     if profile:
         return profile
@@ -216,7 +220,8 @@ def yazi_upgrade_packages() -> bool:
 
 def vscode_get_installed_extensions() -> list[str] | None:
     try:
-        result = run_cmd(["code", "--list-extensions"])
+        # Both saving and installing extensions need this list, so only ask once
+        result = run_cmd_cached(VSCODE_LIST_EXTENSIONS_CMD)
         if not result.success:
             log.error("Failed to list VS Code extension.")
             return None
@@ -281,7 +286,10 @@ def vscode_install_extensions(extensions_file: Path) -> bool:
         if not missing:
             return True
 
-        return run_cmd(["code", "--install-extension", *missing]).success
+        result = run_cmd(["code", "--install-extension", *missing])
+        invalidate_cmd(VSCODE_LIST_EXTENSIONS_CMD)
+
+        return result.success
 
     except Exception as e:
         log.error(f"Error installing VS Code extensions: {e}")
@@ -1,12 +1,29 @@
+import os
 import re
 import shutil
 import subprocess
 import sys
 
+from common.benchmark_utilities import (
+    BASELINE_PATH,
+    REGRESSION_THRESHOLD,
+    RESULTS_PATH,
+    compare_results,
+    format_comparisons,
+    load_results,
+)
 from common.cmd_utilities import run_cmd
-from common.io_utilities import remove_empty_dirs, remove_files_by_pattern
+from common.io_utilities import FileBatch, remove_empty_dirs, remove_files_by_pattern
 from common.logger import log
 from common.package_utilities import process_packages
+from common.trace_utilities import (
+    DEFAULT_TRACE_PATH,
+    get_trace_path,
+    load_traces,
+    summarize_traces,
+    write_chrome_trace,
+)
+from common.variables import FLEXYCON_HOME
 from scripts.flexy.src.helpers import (
     DOTDROP_CONFIG,
     PIP_BIN,
@@ -145,8 +162,11 @@ def install():
     # creating files with shortcuts that will be included into other configuration files.
     log.info("⚙️ Generating shortcuts...")
     active_shortcuts = get_active_shortcuts()
-    for renderer in AVAILABLE_RENDERERS:
-        renderer.process(active_shortcuts)
+    with FileBatch() as batch:
+        for renderer in AVAILABLE_RENDERERS:
+            renderer.process(active_shortcuts, batch)
+
+    log.info(f"Updated {len(batch.changed)} shortcut files")
 
     log.info("⚙️ Installing configuration...")
 
@@ -233,3 +253,74 @@ def uninstall():
     )
 
     remove_flexycon_data()
+
+
+def summarize_trace() -> bool:
+    trace_path = get_trace_path() or DEFAULT_TRACE_PATH
+    if not trace_path.exists():
+        log.error(
+            f"Trace file {str(trace_path)!r} not found. "
+            "Run a target with '--trace' first."
+        )
+        return False
+
+    traces = load_traces(trace_path)
+    print(summarize_traces(traces))
+
+    chrome_trace_path = trace_path.with_suffix(".chrome.json")
+    write_chrome_trace(traces, chrome_trace_path)
+    log.info(f"Chrome trace written to {str(chrome_trace_path)!r}")
+
+    return True
+
+
+def run_benchmarks() -> bool:
+    log.info("⏱️ Running benchmarks...")
+    # pytest's output isn't captured, so its progress is shown as it runs
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "pytest",
+            "-m",
+            "slow",
+            FLEXYCON_HOME / "tests" / "benchmarks",
+        ],
+        env={**os.environ, "FLEXYCON_BENCH_RESULTS": str(RESULTS_PATH)},
+    )
+    if result.returncode != 0:
+        log.error("Benchmarks failed")
+        return False
+
+    current = load_results(RESULTS_PATH)
+    if not BASELINE_PATH.exists():
+        shutil.copyfile(RESULTS_PATH, BASELINE_PATH)
+        log.info(f"No baseline found. Saved the results as {str(BASELINE_PATH)!r}")
+        return True
+
+    comparisons = compare_results(current, load_results(BASELINE_PATH))
+    print(format_comparisons(comparisons))
+
+    regressions = [c.name for c in comparisons if c.is_regression()]
+    if regressions:
+        log.error(
+            f"{len(regressions)} benchmarks regressed by more than "
+            f"{REGRESSION_THRESHOLD:.0%}: {', '.join(regressions)}"
+        )
+        return False
+
+    return True
+
+
+def save_benchmark_baseline() -> bool:
+    if not RESULTS_PATH.exists():
+        log.error(
+            f"Benchmark results {str(RESULTS_PATH)!r} not found. "
+            "Run the 'benchmark' target first."
+        )
+        return False
+
+    shutil.copyfile(RESULTS_PATH, BASELINE_PATH)
+    log.info(f"Saved the last benchmark results as {str(BASELINE_PATH)!r}")
+
+    return True
@@ -5,8 +5,7 @@
 import argparse
 import logging
 
-from common.args import add_date_args, resolve_date
-from common.helpers import get_version
+from common.args import add_date_args, add_version_arg, resolve_date
 from common.logger import log, setup_logging
 from scripts.git_logs.data.repos import GIT_REPOS
 from scripts.git_logs.src.core import compose_output
@@ -25,9 +24,7 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="enable debug output"
     )
-    parser.add_argument(
-        "--version", action="version", version=f"%(prog)s {get_version()}"
-    )
+    add_version_arg(parser)
 
     return parser
 
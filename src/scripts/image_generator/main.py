@@ -7,7 +7,7 @@ import logging
 from dataclasses import fields
 from pathlib import Path
 
-from common.helpers import get_version
+from common.args import add_version_arg
 from common.logger import log, setup_logging
 from common.variables import GB
 from scripts.image_generator.data import references  # Only needed for demo
@@ -30,9 +30,7 @@ def build_parser() -> argparse.ArgumentParser:
         description="Generate an image representation of a 2D integer grid.",
     )
 
-    parser.add_argument(
-        "--version", action="version", version=f"%(prog)s {get_version()}"
-    )
+    add_version_arg(parser)
 
     # SUBCOMMANDS
     cmd_parent = argparse.ArgumentParser(add_help=False)
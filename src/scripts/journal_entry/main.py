@@ -6,8 +6,7 @@ import argparse
 import logging
 import sys
 
-from common.args import add_date_args, resolve_date
-from common.helpers import get_version
+from common.args import add_date_args, add_version_arg, resolve_date
 from common.logger import log, setup_logging
 from scripts.journal_entry.src.core import get_journal_entry_path, open_journal_entry
 
@@ -32,9 +31,7 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="enable debug output"
     )
-    parser.add_argument(
-        "--version", action="version", version=f"%(prog)s {get_version()}"
-    )
+    add_version_arg(parser)
 
     return parser
 
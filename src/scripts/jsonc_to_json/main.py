@@ -9,7 +9,7 @@ from pathlib import Path
 
 import commentjson
 
-from common.helpers import get_version
+from common.args import add_version_arg
 from common.logger import log, setup_logging
 
 
@@ -36,9 +36,7 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="enable debug output"
     )
-    parser.add_argument(
-        "--version", action="version", version=f"%(prog)s {get_version()}"
-    )
+    add_version_arg(parser)
 
     return parser
 
@@ -6,7 +6,7 @@ import argparse
 import logging
 import sys
 
-from common.helpers import get_version
+from common.args import add_version_arg
 from common.logger import log, setup_logging
 from scripts.media_manager.src.core import (
     handle_audio,
@@ -63,9 +63,7 @@ def build_parser() -> argparse.ArgumentParser:
             "-v", "--verbose", action="store_true", help="enable debug output"
         )
 
-    parser.add_argument(
-        "--version", action="version", version=f"%(prog)s {get_version()}"
-    )
+    add_version_arg(parser)
 
     return parser
 
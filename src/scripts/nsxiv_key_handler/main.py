@@ -8,7 +8,7 @@ import sys
 from functools import partial
 from pathlib import Path
 
-from common.helpers import get_version
+from common.args import add_version_arg
 from common.logger import log, setup_logging
 from scripts.nsxiv_key_handler.src.core import (
     Action,
@@ -103,9 +103,7 @@ def build_parser(actions_map: ActionsMap) -> argparse.ArgumentParser:
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="enable debug output"
     )
-    parser.add_argument(
-        "--version", action="version", version=f"%(prog)s {get_version()}"
-    )
+    add_version_arg(parser)
 
     return parser
 
@@ -9,17 +9,9 @@ import sys
 import tempfile
 from typing import NoReturn
 
-from common.cmd_utilities import run_cmd
-from common.helpers import get_version
+from common.args import add_version_arg
+from common.cmd_utilities import run_cmd, stream_cmd
 from common.logger import log, setup_logging
-from scripts.rclone_wrapper.src.config import load_config
-from scripts.rclone_wrapper.src.formatting import (
-    format_stats,
-    prepare_table_rows,
-    print_table,
-    transform_operations,
-)
-from scripts.rclone_wrapper.src.rclone import build_rclone_command, parse_rclone_output
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -53,9 +45,7 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="enable debug output"
     )
-    parser.add_argument(
-        "--version", action="version", version=f"%(prog)s {get_version()}"
-    )
+    add_version_arg(parser)
 
     return parser
 
@@ -63,6 +53,20 @@ def build_parser() -> argparse.ArgumentParser:
 def main() -> NoReturn:
     args = build_parser().parse_args()
 
+    # Deferred, as pydantic, tabulate and humanize are slow to import and
+    # aren't needed for '--help' or argument errors
+    from scripts.rclone_wrapper.src.config import load_config
+    from scripts.rclone_wrapper.src.formatting import (
+        format_stats,
+        prepare_table_rows,
+        print_table,
+        transform_operations,
+    )
+    from scripts.rclone_wrapper.src.rclone import (
+        build_rclone_command,
+        parse_rclone_output,
+    )
+
     setup_logging(log, logging.DEBUG if args.verbose else logging.WARNING)
     log.debug(args)
 
@@ -74,12 +78,14 @@ def main() -> NoReturn:
         sys.exit(1)
 
     command = build_rclone_command(args, config)
-    result = run_cmd(command)
 
     if not args.dry_run:
-        sys.exit(result.return_code)
+        sys.exit(run_cmd(command).return_code)
+
+    # Dry runs print a JSON log line per file, so parse them as they arrive
+    with stream_cmd(command) as stream:
+        raw_ops, stats = parse_rclone_output(stream)
 
-    raw_ops, stats = parse_rclone_output(result.output)
     processed_ops = transform_operations(raw_ops)
     formatted_rows = prepare_table_rows(processed_ops)
 
@@ -103,7 +109,7 @@ def main() -> NoReturn:
 
         print(f"Log file created at {tmp.name!r}")
 
-    sys.exit(result.return_code)
+    sys.exit(stream.return_code)
 
 
 if __name__ == "__main__":
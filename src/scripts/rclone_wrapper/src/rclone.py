@@ -1,6 +1,7 @@
 import argparse
 import json
 import sys
+from typing import Iterable
 
 from pydantic import ValidationError
 
@@ -36,12 +37,12 @@ def build_rclone_command(args: argparse.Namespace, config: Config) -> list[str]:
 
 
 def parse_rclone_output(
-    output: str,
+    lines: Iterable[str],
 ) -> tuple[list[RcloneOperation], RcloneStats | None]:
     operations: list[RcloneOperation] = []
     stats = None
 
-    for line in output.splitlines():
+    for line in lines:
         if not line:
             continue
 
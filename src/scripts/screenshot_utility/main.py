@@ -7,7 +7,7 @@ import logging
 from pathlib import Path
 from typing import TypedDict
 
-from common.helpers import get_version
+from common.args import add_version_arg
 from common.logger import log, setup_logging
 from common.prompt_utilities import PromptOption, prompt_options
 from common.screenshot_utilities import ScreenshotUtility
@@ -49,9 +49,7 @@ def build_parser() -> argparse.ArgumentParser:
         parents=[global_parent],
     )
 
-    parser.add_argument(
-        "--version", action="version", version=f"%(prog)s {get_version()}"
-    )
+    add_version_arg(parser)
 
     # SUBCOMMANDS
     cmd_parent = argparse.ArgumentParser(add_help=False)
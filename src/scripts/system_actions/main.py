@@ -5,8 +5,8 @@
 import argparse
 import logging
 
+from common.args import add_version_arg
 from common.cmd_utilities import run_cmd
-from common.helpers import get_version
 from common.logger import log, setup_logging
 from common.prompt_utilities import PromptOption
 from common.system_utilities import System
@@ -28,9 +28,7 @@ def build_parser(options: list[PromptOption]) -> argparse.ArgumentParser:
         parents=[global_parent],
     )
 
-    parser.add_argument(
-        "--version", action="version", version=f"%(prog)s {get_version()}"
-    )
+    add_version_arg(parser)
 
     # SUBCOMMANDS
     subparsers = parser.add_subparsers(dest="action_id", help="System actions")
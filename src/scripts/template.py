@@ -5,7 +5,7 @@
 import argparse
 import logging
 
-from common.helpers import get_version
+from common.args import add_version_arg
 from common.logger import log, setup_logging
 
 
@@ -63,9 +63,7 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="enable debug output"
     )
-    parser.add_argument(
-        "--version", action="version", version=f"%(prog)s {get_version()}"
-    )
+    add_version_arg(parser)
 
     return parser
 
@@ -84,9 +82,7 @@ def subparser_parser(options: list[str]) -> argparse.ArgumentParser:
         parents=[global_parent],
     )
 
-    parser.add_argument(
-        "--version", action="version", version=f"%(prog)s {get_version()}"
-    )
+    add_version_arg(parser)
 
     # SUBCOMMANDS
     cmd_parent = argparse.ArgumentParser(add_help=False)
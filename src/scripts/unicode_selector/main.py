@@ -5,7 +5,7 @@
 import argparse
 import logging
 
-from common.helpers import get_version
+from common.args import add_version_arg
 from common.logger import log, setup_logging
 from scripts.unicode_selector.src.core import (
     handle_braille_mode,
@@ -88,9 +88,7 @@ def build_parser() -> argparse.ArgumentParser:
         help="do not notify user of selected chars",
     )
 
-    parser.add_argument(
-        "--version", action="version", version=f"%(prog)s {get_version()}"
-    )
+    add_version_arg(parser)
 
     return parser
 
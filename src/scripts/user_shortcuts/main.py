@@ -5,7 +5,8 @@
 import argparse
 import logging
 
-from common.helpers import get_version
+from common.args import add_version_arg
+from common.io_utilities import FileBatch
 from common.logger import log, setup_logging
 from scripts.user_shortcuts.data.shortcuts import shortcuts
 from scripts.user_shortcuts.src.formatting import format_shortcuts
@@ -58,9 +59,7 @@ def build_parser(renderers: list[ShortcutRenderer]) -> argparse.ArgumentParser:
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="enable debug output"
     )
-    parser.add_argument(
-        "--version", action="version", version=f"%(prog)s {get_version()}"
-    )
+    add_version_arg(parser)
 
     return parser
 
@@ -82,8 +81,11 @@ def main() -> None:
         ]
 
     active_shortcuts = get_active_shortcuts(shortcuts)
-    for renderer in active_renderers:
-        renderer.process(active_shortcuts)
+    with FileBatch() as batch:
+        for renderer in active_renderers:
+            renderer.process(active_shortcuts, batch)
+
+    log.info(f"Updated {len(batch.changed)} files")
 
 
 if __name__ == "__main__":
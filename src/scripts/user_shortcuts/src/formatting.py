@@ -1,5 +1,3 @@
-from tabulate import tabulate
-
 from common.string_utilities import truncate
 from common.variables import HOME
 from scripts.user_shortcuts.src.models import Shortcut
@@ -26,6 +24,7 @@ def format_shortcuts(
     Display shortcuts in a table, containing the type, alias, target, and description
     of each shortcut. Rows are sorted by the targets.
     """
+    from tabulate import tabulate  # slow to import, so only loaded when needed
 
     sorted_shortcuts = sorted(shortcuts, key=lambda s: str(s.path))
 
@@ -3,7 +3,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Literal
 
-from common.io_utilities import write_to_file
+from common.io_utilities import FileBatch, write_to_file
 from common.logger import log
 
 
@@ -32,7 +32,13 @@ class ShortcutRenderer(ABC):
         self.name = name
         self.output_path = output_path
 
-    def process(self, shortcuts: list[Shortcut]) -> None:
+    def process(
+        self, shortcuts: list[Shortcut], batch: FileBatch | None = None
+    ) -> None:
+        """
+        Render the shortcuts to the output file. When a batch is given, the
+        write is staged in it instead of happening right away.
+        """
         log.info(f"[{self.name}] Processing shortcuts...")
 
         processed_shortcuts: list[Shortcut] = []
@@ -54,7 +60,10 @@ class ShortcutRenderer(ABC):
             )
 
         content = self.compose_output_file(processed_shortcuts)
-        write_to_file(content, self.output_path)
+        if batch is not None:
+            batch.write(content, self.output_path)
+        else:
+            write_to_file(content, self.output_path)
 
         log.info(f"[{self.name}] Processed {len(processed_shortcuts)} shortcuts")
 
@@ -4,12 +4,12 @@
 
 import argparse
 import logging
-import random
 import sys
 from pathlib import Path
 
-from common.helpers import get_version, set_wallpaper
-from common.io_utilities import get_images_from_path
+from common.args import add_version_arg
+from common.helpers import set_wallpaper
+from common.io_utilities import pick_random_image
 from common.logger import log, setup_logging
 from common.notification_utilities import Notification
 from common.variables import XDG_DATA_HOME
@@ -39,9 +39,7 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="enable debug output"
     )
-    parser.add_argument(
-        "--version", action="version", version=f"%(prog)s {get_version()}"
-    )
+    add_version_arg(parser)
 
     return parser
 
@@ -58,15 +56,16 @@ def main():
         current_wall = WALL_LINK.resolve()
         log.debug(f"Current wallpaper: {str(current_wall)!r}")
 
-    # Determine candidate pool
-    candidates: list[Path] = []
+    # Pick a wallpaper, preferring one that is different from the current one
+    chosen: Path | None = None
     if args.paths:
-        for p in args.paths:
-            candidates.extend(get_images_from_path(p))
+        chosen = pick_random_image(
+            (p.resolve() for p in args.paths), avoid=current_wall
+        )
     elif current_wall:
-        candidates = [current_wall]
+        chosen = current_wall
 
-    if not candidates:
+    if chosen is None:
         log_msg = "No valid images found."
         log.error(log_msg)
 
@@ -75,14 +74,6 @@ def main():
 
         sys.exit(1)
 
-    # If multiple candidates, pick a wallpaper that is different from the current one
-    if len(candidates) > 1 and current_wall:
-        available = [c for c in candidates if c.resolve() != current_wall]
-        if available:
-            candidates = available
-
-    chosen = random.choice(candidates)
-
     # Update the symlink
     try:
         WALL_LINK.parent.mkdir(parents=True, exist_ok=True)
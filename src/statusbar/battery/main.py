@@ -2,17 +2,9 @@
 
 # {{@@ header() @@}}
 
-import argparse
-import logging
-
 from common.cmd_utilities import run_cmd_background
-from common.helpers import get_version
-from common.logger import log, setup_logging
 from common.notification_utilities import Notification
-from common.statusbar import (
-    MouseButton,
-    handle_block_button,
-)
+from common.statusbar import Block, MouseButton
 from common.variables import EDITOR, TERMINAL
 from statusbar.battery.src.core import adjust_backlight, get_battery_info
 
@@ -31,7 +23,10 @@ ACTIONS = {
         ": stagnant charge\n"
         ": charging\n"
         ": charged\n"
-        ": low battery\n",
+        ": low battery\n"
+        "\n<b>Details</b>\n"
+        "h:mm: time until empty, or full when charging\n"
+        "W: charge (+) or discharge (-) rate\n",
     ).send(),
     MouseButton.EXTRA_3: lambda: run_cmd_background(
         [TERMINAL, "-e", EDITOR, "{{@@ _dotfile_abs_src @@}}"]
@@ -39,34 +34,17 @@ ACTIONS = {
 }
 
 
-def build_parser() -> argparse.ArgumentParser:
-    """Parse command-line arguments."""
-
-    parser = argparse.ArgumentParser(
-        prog="sb_battery",
-        description="Statusbar script for battery levels and backlight.",
-    )
-
-    parser.add_argument(
-        "-v", "--verbose", action="store_true", help="enable debug output"
-    )
-    parser.add_argument(
-        "--version", action="version", version=f"%(prog)s {get_version()}"
-    )
-
-    return parser
-
-
-def main() -> None:
-    args = build_parser().parse_args()
-
-    setup_logging(log, logging.DEBUG if args.verbose else logging.ERROR)
-    log.debug(args)
-
-    handle_block_button(ACTIONS)
+class BatteryBlock(Block):
+    name = "battery"
+    description = "Statusbar script for battery levels and backlight."
+    interval = 30
+    signal = 12
+    cached = False  # reading the batteries is as fast as reading the cache
+    actions = ACTIONS
 
-    print(get_battery_info())
+    def get_output(self) -> str:
+        return get_battery_info()
 
 
 if __name__ == "__main__":
-    main()
+    BatteryBlock().main()
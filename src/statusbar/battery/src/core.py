@@ -1,8 +1,28 @@
+import os
+import time
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Self
 
 from common.cmd_utilities import run_cmd
 from common.logger import log
 
+POWER_SUPPLY_DIR = Path("/sys/class/power_supply")
+
+STATUS_ICONS = {
+    "Full": "",
+    "Discharging": "",
+    "Charging": "",
+    "Not charging": "",
+    "Unknown": "",
+}
+LOW_BATTERY_ICON = ""
+LOW_BATTERY_CAPACITY = 25
+
+# Batteries can be plugged in, so the power supplies are listed again after this
+# many seconds
+RESCAN_INTERVAL = 60.0
+
 
 def adjust_backlight(amount: int) -> None:
     """Adjusts backlight using xbacklight."""
@@ -13,31 +33,187 @@ def adjust_backlight(amount: int) -> None:
         log.error(f"Failed to adjust backlight: {e}")
 
 
-def get_battery_info() -> str:
-    batteries = sorted(Path("/sys/class/power_supply/").glob("BAT*"))
-    output_parts: list[str] = []
-
-    status_map = {
-        "Full": "",
-        "Discharging": "",
-        "Charging": "",
-        "Not charging": "",
-        "Unknown": "",
-    }
-
-    for battery in batteries:
-        try:
-            status = (battery / "status").read_text().strip()
-            capacity = int((battery / "capacity").read_text().strip())
+def parse_uevent(data: bytes) -> dict[str, str]:
+    """Parse a power supply 'uevent', e.g. 'POWER_SUPPLY_STATUS=Charging'."""
+    values: dict[str, str] = {}
+    for line in data.decode(errors="replace").splitlines():
+        key, sep, value = line.partition("=")
+        if sep:
+            values[key.removeprefix("POWER_SUPPLY_").lower()] = value
+
+    return values
 
-            icon = status_map.get(status, "")
-            warn = ""
-            if status == "Discharging" and capacity <= 25:
-                warn = ""
 
-            output_parts.append(f"{icon}{warn}{capacity}%")
-        except (FileNotFoundError, ValueError) as e:
-            log.debug(f"Could not read battery {battery.name}: {e}")
+def _get_int(values: dict[str, str], *keys: str) -> int | None:
+    """Return the first of the keys holding an integer."""
+    for key in keys:
+        try:
+            return int(values[key])
+        except (KeyError, ValueError):
             continue
 
-    return " ".join(output_parts)
+    return None
+
+
+@dataclass(frozen=True)
+class BatteryState:
+    name: str
+    status: str
+    capacity: int  # percent
+    # Batteries report either energy (uWh) and power (uW), or charge (uAh) and
+    # current (uA). Both give the same times and only differ by the voltage.
+    now: int | None = None
+    full: int | None = None
+    rate: int | None = None
+    power: int | None = None  # uW, when it's known
+
+    @classmethod
+    def from_uevent(cls, name: str, data: bytes) -> Self:
+        values = parse_uevent(data)
+
+        capacity = _get_int(values, "capacity")
+        if capacity is None:
+            raise ValueError(f"No capacity in the uevent of {name!r}")
+
+        if "energy_now" in values:
+            now = _get_int(values, "energy_now")
+            full = _get_int(values, "energy_full")
+            rate = _get_int(values, "power_now")
+        else:
+            now = _get_int(values, "charge_now")
+            full = _get_int(values, "charge_full")
+            rate = _get_int(values, "current_now")
+
+        power = _get_int(values, "power_now")
+        voltage = _get_int(values, "voltage_now")
+        if power is None and rate is not None and voltage is not None:
+            power = rate * voltage // 1_000_000
+
+        return cls(
+            name,
+            values.get("status", "Unknown"),
+            capacity,
+            now,
+            full,
+            abs(rate) if rate is not None else None,
+            abs(power) if power is not None else None,
+        )
+
+    @property
+    def remaining_time(self) -> float | None:
+        """Seconds until the battery is empty, or full when charging."""
+        if not self.rate or self.now is None:
+            return None
+
+        if self.status == "Discharging":
+            remaining = self.now
+        elif self.status == "Charging" and self.full is not None:
+            remaining = max(self.full - self.now, 0)
+        else:
+            return None
+
+        return remaining / self.rate * 3600
+
+    @property
+    def watts(self) -> float | None:
+        """Charge (positive) or discharge (negative) rate."""
+        if not self.power or self.status not in ("Charging", "Discharging"):
+            return None
+
+        sign = 1 if self.status == "Charging" else -1
+        return sign * self.power / 1_000_000
+
+
+def format_battery(state: BatteryState) -> str:
+    icon = STATUS_ICONS.get(state.status, STATUS_ICONS["Unknown"])
+    warn = ""
+    if state.status == "Discharging" and state.capacity <= LOW_BATTERY_CAPACITY:
+        warn = LOW_BATTERY_ICON
+
+    output = f"{icon}{warn}{state.capacity}%"
+
+    remaining_time = state.remaining_time
+    if remaining_time is not None:
+        hours, minutes = divmod(round(remaining_time / 60), 60)
+        output += f" {hours}:{minutes:02}"
+
+    # Rounded, so small fluctuations don't change the output
+    watts = state.watts
+    if watts is not None:
+        output += f" {watts:+.0f}W"
+
+    return output
+
+
+class BatteryMonitor:
+    """
+    Read the batteries from their 'uevent', which holds all their values. The
+    files are kept open and read again from the start, as sysfs regenerates their
+    content on each read.
+    """
+
+    def __init__(self, power_supply_dir: Path = POWER_SUPPLY_DIR):
+        self.power_supply_dir = power_supply_dir
+
+        self._fds: dict[str, int] = {}
+        self._scanned = -RESCAN_INTERVAL  # time.monotonic() of the last scan
+        self._uevents: dict[str, bytes] = {}
+        self._output = ""
+
+    def _scan(self) -> None:
+        self.close()
+
+        for battery in sorted(self.power_supply_dir.glob("BAT*")):
+            try:
+                self._fds[battery.name] = os.open(battery / "uevent", os.O_RDONLY)
+            except OSError as e:
+                log.debug(f"Could not open battery {battery.name}: {e}")
+
+        self._scanned = time.monotonic()
+
+    def read(self) -> list[BatteryState] | None:
+        """Read the batteries, returning None if nothing changed since last read."""
+        if time.monotonic() - self._scanned >= RESCAN_INTERVAL:
+            self._scan()
+
+        uevents: dict[str, bytes] = {}
+        for name, fd in self._fds.items():
+            try:
+                uevents[name] = os.pread(fd, 4096, 0)
+            except OSError as e:
+                # The battery was removed, so the next read scans again
+                log.debug(f"Could not read battery {name}: {e}")
+                self._scanned = -RESCAN_INTERVAL
+
+        if uevents == self._uevents:
+            return None
+        self._uevents = uevents
+
+        states: list[BatteryState] = []
+        for name, data in uevents.items():
+            try:
+                states.append(BatteryState.from_uevent(name, data))
+            except ValueError as e:
+                log.debug(f"Could not read battery {name}: {e}")
+
+        return states
+
+    def get_output(self) -> str:
+        """Return the block output, only formatted again when a battery changed."""
+        states = self.read()
+        if states is not None:
+            self._output = " ".join(format_battery(state) for state in states)
+
+        return self._output
+
+    def close(self) -> None:
+        for fd in self._fds.values():
+            os.close(fd)
+        self._fds.clear()
+
+
+BATTERY_MONITOR = BatteryMonitor()
+
+
+def get_battery_info() -> str:
+    return BATTERY_MONITOR.get_output()
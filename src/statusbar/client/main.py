@@ -0,0 +1,102 @@
+#!{{@@ env['FLEXYCON_HOME'] @@}}/{{@@ d_venv_bin @@}}/python
+
+# {{@@ header() @@}}
+
+# Run by the statusbar on every update, so it only imports what it needs to ask
+# 'sb-daemon' for the value of a block
+
+import argparse
+import os
+import socket
+import sys
+from pathlib import Path
+
+from common.args import add_version_arg
+
+# Same as 'common.statusbar.DAEMON_SOCKET_PATH', which is slower to import
+SOCKET_PATH = Path(os.getenv("XDG_RUNTIME_DIR") or "/tmp") / "statusbar.sock"
+
+# Longer than the daemon waits for the action of a click
+TIMEOUT = 10.0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Parse command-line arguments."""
+
+    parser = argparse.ArgumentParser(
+        prog="sb_client",
+        description="Print the value of a statusbar block hosted by 'sb-daemon', "
+        "forwarding 'BLOCK_BUTTON' to it. Runs 'sb-BLOCK' if the daemon is down.",
+    )
+
+    parser.add_argument("block", help="name of the block, e.g. 'date'")
+    parser.add_argument(
+        "-u",
+        "--update",
+        action="store_true",
+        help="render the block again instead of using its cached value, "
+        "for blocks signaled by other programs",
+    )
+    parser.add_argument(
+        "-s",
+        "--socket",
+        type=Path,
+        default=SOCKET_PATH,
+        help=f"socket of the daemon (default: {str(SOCKET_PATH)!r})",
+    )
+    add_version_arg(parser)
+
+    return parser
+
+
+def build_request(block: str, update: bool = False) -> str:
+    block_button = os.getenv("BLOCK_BUTTON")
+    if block_button:
+        return f"click {block} {block_button}"
+
+    return f"{'update' if update else 'get'} {block}"
+
+
+def connect(socket_path: Path = SOCKET_PATH, timeout: float = TIMEOUT) -> socket.socket:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(str(socket_path))
+    except OSError:
+        sock.close()
+        raise
+
+    return sock
+
+
+def send_request(sock: socket.socket, request: str) -> str:
+    with sock:
+        sock.sendall(f"{request}\n".encode())
+
+        response = b""
+        while chunk := sock.recv(4096):
+            response += chunk
+
+    return response.decode().rstrip("\n")
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+
+    try:
+        sock = connect(args.socket)
+    except (FileNotFoundError, ConnectionRefusedError):
+        # The daemon isn't running, so the block script is run instead
+        script = Path(sys.argv[0]).resolve().parent / f"sb-{args.block}"
+        os.execv(script, [str(script), *(["--update"] if args.update else [])])
+
+    # The request may have reached the daemon already (e.g. a click, whose action
+    # is running), so it isn't handed to the block script again
+    try:
+        print(send_request(sock, build_request(args.block, args.update)))
+    except OSError as e:
+        sys.exit(f"sb_client: {args.block!r} request failed: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!{{@@ env['FLEXYCON_HOME'] @@}}/{{@@ d_venv_bin @@}}/python
+
+# {{@@ header() @@}}
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+from common.args import add_version_arg
+from common.logger import log, setup_logging
+from common.statusbar import DAEMON_SOCKET_PATH
+from statusbar.daemon.src.core import (
+    DaemonBlock,
+    StatusbarDaemon,
+    find_block_names,
+    is_daemon_running,
+)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Parse command-line arguments."""
+
+    parser = argparse.ArgumentParser(
+        prog="sb_daemon",
+        description="Host the statusbar blocks in one process, "
+        "serving their values to 'sb-client'.",
+    )
+
+    parser.add_argument(
+        "blocks",
+        nargs="*",
+        choices=find_block_names(),
+        metavar="BLOCK",
+        help="blocks to host, by default the ones installed next to this script "
+        f"({', '.join(find_block_names())})",
+    )
+    parser.add_argument(
+        "-s",
+        "--socket",
+        type=Path,
+        default=DAEMON_SOCKET_PATH,
+        help=f"socket to serve the blocks on (default: {str(DAEMON_SOCKET_PATH)!r})",
+    )
+
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="enable debug output"
+    )
+    add_version_arg(parser)
+
+    return parser
+
+
+def get_installed_blocks() -> list[str]:
+    """Return the blocks whose 'sb-BLOCK' script is next to this one, or all."""
+    script_dir = Path(sys.argv[0]).resolve().parent
+    installed = [
+        name for name in find_block_names() if (script_dir / f"sb-{name}").exists()
+    ]
+
+    return installed or find_block_names()
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+
+    setup_logging(log, logging.DEBUG if args.verbose else logging.WARNING)
+    log.debug(args)
+
+    if is_daemon_running(args.socket):
+        log.error(f"A daemon is already serving on {str(args.socket)!r}")
+        sys.exit(1)
+
+    daemon = StatusbarDaemon(
+        [
+            DaemonBlock.load(name)
+            for name in dict.fromkeys(args.blocks or get_installed_blocks())
+        ],
+        args.socket,
+    )
+
+    try:
+        asyncio.run(daemon.serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
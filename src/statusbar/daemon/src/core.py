@@ -0,0 +1,284 @@
+import asyncio
+import importlib
+import inspect
+import os
+import signal
+import socket
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Self
+
+from common.cmd_utilities import run_cmd_background
+from common.logger import log
+from common.statusbar import (
+    BLOCKS,
+    CMD_TIMEOUT,
+    DAEMON_SOCKET_PATH,
+    EventSource,
+    MouseButton,
+    find_process,
+    get_process_name,
+    handle_block_button,
+)
+from common.variables import EDITOR, STATUSBAR, TERMINAL
+
+# Directory of the block packages, e.g. 'statusbar/date/main.py'
+STATUSBAR_DIR = Path(__file__).resolve().parents[2]
+NOT_BLOCKS = ("client", "daemon")
+
+# Values rendered more recently than this are reused by 'update' requests, so
+# the statusbar asking for a value right after being signaled doesn't render twice
+UPDATE_MAX_AGE = 0.5
+
+
+@dataclass
+class DaemonBlock:
+    name: str
+    interval: float  # seconds between updates
+    render: Callable[[], str]
+    actions: dict[MouseButton, Callable[[], Any]] = field(default_factory=dict)
+    signal: int | None = None
+    events: EventSource | None = None
+    value: str | None = None
+    updated: float = 0.0  # time.monotonic() of the last render
+
+    @classmethod
+    def load(cls, name: str) -> Self:
+        """
+        Create a block from the 'Block' its main script registers. The statusbar
+        is signaled whenever its value changes, so it doesn't need an interval in
+        the statusbar config.
+        """
+        module = importlib.import_module(f"statusbar.{name}.main")
+        block = BLOCKS[name]()
+
+        # The imported script isn't rendered by dotdrop, so the action editing it
+        # has to point to the module itself
+        script_path = inspect.getfile(module)
+        actions = dict(block.actions)
+        actions[MouseButton.EXTRA_3] = lambda: run_cmd_background(
+            [TERMINAL, "-e", EDITOR, script_path]
+        )
+
+        # Updates are cached, so the block scripts show the latest value as well
+        return cls(
+            name, block.interval, block.update, actions, block.signal, block.events
+        )
+
+
+def find_block_names() -> list[str]:
+    return sorted(
+        path.parent.name
+        for path in STATUSBAR_DIR.glob("*/main.py")
+        if path.parent.name not in NOT_BLOCKS
+    )
+
+
+def is_daemon_running(socket_path: Path = DAEMON_SOCKET_PATH) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(socket_path))
+        except OSError:
+            return False
+
+    return True
+
+
+class StatusbarDaemon:
+    """
+    Host the statusbar blocks in a single process, updating each of them on its
+    own interval and serving their last values on a Unix socket.
+
+    Requests are single lines, answered with the value of the block:
+    - ``get <block>``: the cached value
+    - ``update <block>``: a freshly rendered value
+    - ``click <block> <button>``: run the action of the button, then update
+    """
+
+    def __init__(
+        self,
+        blocks: list[DaemonBlock],
+        socket_path: Path = DAEMON_SOCKET_PATH,
+        statusbar: str = STATUSBAR,
+    ):
+        self.blocks = {block.name: block for block in blocks}
+        self.socket_path = socket_path
+        self.statusbar = statusbar
+
+        self._locks = {name: asyncio.Lock() for name in self.blocks}
+        self._wake_events = {name: asyncio.Event() for name in self.blocks}
+        self._statusbar_pid: int | None = None
+
+    def signal_statusbar(self, block: DaemonBlock) -> None:
+        """Tell the statusbar to fetch the value of the block again."""
+        if block.signal is None:
+            return
+
+        # The PID is only looked up again when the statusbar was restarted
+        pid = self._statusbar_pid
+        if pid is None or get_process_name(pid) != self.statusbar:
+            pid = find_process(self.statusbar)
+            self._statusbar_pid = pid
+
+        if pid is None:
+            log.debug(f"{self.statusbar!r} is not running.")
+            return
+
+        try:
+            os.kill(pid, signal.SIGRTMIN + block.signal)
+        except ProcessLookupError:
+            self._statusbar_pid = None
+
+    async def refresh(
+        self, block: DaemonBlock, max_age: float = 0.0, notify: bool = False
+    ) -> str:
+        """
+        Render the block again, unless it was rendered less than ``max_age``
+        seconds ago. If the value changed and ``notify`` is set, the statusbar is
+        signaled. A failing block keeps its last value.
+        """
+        async with self._locks[block.name]:
+            if block.value is not None and time.monotonic() - block.updated < max_age:
+                return block.value
+
+            try:
+                value = await asyncio.to_thread(block.render)
+            except Exception as e:
+                log.error(f"Unable to render block {block.name!r}: {e}")
+                return block.value or ""
+
+            changed = value != block.value
+            block.value = value
+            block.updated = time.monotonic()
+
+        if changed and notify:
+            self.signal_statusbar(block)
+
+        return value
+
+    def wake(self, block: DaemonBlock) -> None:
+        """Update the block now, instead of waiting for its next interval."""
+        self._wake_events[block.name].set()
+
+    def watch_events(self, block: DaemonBlock) -> None:
+        """Update the block whenever its event source reports a change."""
+        if block.events is None:
+            return
+
+        try:
+            fd = block.events.fileno()
+        except OSError as e:
+            log.warning(f"Unable to watch block {block.name!r}, polling it: {e}")
+            return
+
+        asyncio.get_running_loop().add_reader(fd, self._on_events, block, fd)
+
+    def _on_events(self, block: DaemonBlock, fd: int) -> None:
+        assert block.events is not None
+
+        try:
+            if block.events.read_events():
+                self.wake(block)
+        except OSError as e:
+            log.error(f"Unable to read the events of block {block.name!r}: {e}")
+            asyncio.get_running_loop().remove_reader(fd)
+
+    async def click(self, block: DaemonBlock, button: str) -> str:
+        """
+        Run the action of the button, and return the updated value. Actions that
+        take longer than 'CMD_TIMEOUT' (e.g. opening a terminal and waiting for
+        it) keep running, and the statusbar is signaled once they're done.
+        """
+        action = asyncio.create_task(
+            asyncio.to_thread(handle_block_button, block.actions, button)
+        )
+
+        done, _ = await asyncio.wait({action}, timeout=CMD_TIMEOUT)
+        if not done:
+            action.add_done_callback(lambda task: self._on_action_done(block, task))
+            return block.value or ""
+
+        self._on_action_done(block, action, wake=False)
+
+        # Coalesced actions (e.g. scrolling) are applied by the first click, once
+        # the later ones already answered with the old value, so the statusbar is
+        # signaled as well
+        return await self.refresh(block, notify=True)
+
+    def _on_action_done(
+        self, block: DaemonBlock, action: asyncio.Task, wake: bool = True
+    ) -> None:
+        if not action.cancelled() and action.exception() is not None:
+            log.error(f"Action of block {block.name!r} failed: {action.exception()}")
+
+        if wake:
+            self.wake(block)
+
+    async def handle_request(self, request: str) -> str:
+        command, *args = request.split() or [""]
+
+        block = self.blocks.get(args[0]) if args else None
+        if block is None:
+            log.warning(f"Invalid request: {request!r}")
+            return ""
+
+        if command == "get" and len(args) == 1:
+            if block.value is None:
+                return await self.refresh(block)
+            return block.value
+        elif command == "update" and len(args) == 1:
+            return await self.refresh(block, max_age=UPDATE_MAX_AGE)
+        elif command == "click" and len(args) == 2:
+            return await self.click(block, args[1])
+
+        log.warning(f"Invalid request: {request!r}")
+        return ""
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            request = await reader.readline()
+            response = await self.handle_request(request.decode().strip())
+
+            writer.write(f"{response}\n".encode())
+            await writer.drain()
+        except (OSError, UnicodeDecodeError) as e:
+            log.warning(f"Unable to answer request: {e}")
+        finally:
+            writer.close()
+
+    async def _schedule(self, block: DaemonBlock) -> None:
+        wake_event = self._wake_events[block.name]
+
+        while True:
+            wake_event.clear()
+            await self.refresh(block, notify=True)
+
+            # Aligned to multiples of the interval, so e.g. the date changes on
+            # the minute
+            delay = block.interval - time.time() % block.interval
+            try:
+                await asyncio.wait_for(wake_event.wait(), delay)
+            except TimeoutError:
+                pass
+
+    async def serve(self) -> None:
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self.socket_path.unlink(missing_ok=True)
+
+        server = await asyncio.start_unix_server(
+            self._handle_client, path=self.socket_path
+        )
+        log.info(f"Serving {len(self.blocks)} blocks on {str(self.socket_path)!r}")
+
+        try:
+            async with server, asyncio.TaskGroup() as task_group:
+                for block in self.blocks.values():
+                    self.watch_events(block)
+                    task_group.create_task(self._schedule(block))
+
+                await server.serve_forever()
+        finally:
+            self.socket_path.unlink(missing_ok=True)
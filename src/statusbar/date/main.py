@@ -2,18 +2,11 @@
 
 # {{@@ header() @@}}
 
-import argparse
-import logging
 from datetime import datetime
 
 from common.cmd_utilities import run_cmd_background
-from common.helpers import get_version
-from common.logger import log, setup_logging
 from common.notification_utilities import Notification
-from common.statusbar import (
-    MouseButton,
-    handle_block_button,
-)
+from common.statusbar import Block, MouseButton
 from common.variables import EDITOR, TERMINAL
 from statusbar.date.src.core import open_calcurse, show_info
 
@@ -35,34 +28,17 @@ ACTIONS = {
 }
 
 
-def build_parser() -> argparse.ArgumentParser:
-    """Parse command-line arguments."""
+class DateBlock(Block):
+    name = "date"
+    description = "Statusbar script for date, calendar, and appointments."
+    interval = 60
+    signal = 11
+    cached = False  # formatting the date is faster than reading the cache
+    actions = ACTIONS
 
-    parser = argparse.ArgumentParser(
-        prog="sb_date",
-        description="Statusbar script for date, calendar, and appointments.",
-    )
-
-    parser.add_argument(
-        "-v", "--verbose", action="store_true", help="enable debug output"
-    )
-    parser.add_argument(
-        "--version", action="version", version=f"%(prog)s {get_version()}"
-    )
-
-    return parser
-
-
-def main() -> None:
-    args = build_parser().parse_args()
-
-    setup_logging(log, logging.DEBUG if args.verbose else logging.ERROR)
-    log.debug(args)
-
-    handle_block_button(ACTIONS)
-
-    print(datetime.now().strftime("%d %b (%a) %H:%M"))
+    def get_output(self) -> str:
+        return datetime.now().strftime("%d %b (%a) %H:%M")
 
 
 if __name__ == "__main__":
-    main()
+    DateBlock().main()
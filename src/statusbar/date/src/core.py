@@ -1,27 +1,50 @@
+import calendar
 import re
-import shutil
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Self
 
-from common.cmd_utilities import run_cmd, run_cmd_background
+from common.cache_utilities import which
+from common.cmd_utilities import run_cmd_background
 from common.logger import log
 from common.notification_utilities import Notification
-from common.variables import GB, TERMINAL
+from common.variables import GB, HOME, TERMINAL, XDG_DATA_HOME
+
+# Newer versions of calcurse follow the XDG specification
+CALCURSE_APTS_PATHS = [
+    XDG_DATA_HOME / "calcurse" / "apts",
+    HOME / ".calcurse" / "apts",
+]
+APPOINTMENT_DAYS = 3  # like 'calcurse -d3'
+
+
+class HighlightedCalendar(calendar.TextCalendar):
+    """Text calendar, like the output of 'cal', with a day highlighted for pango."""
+
+    def __init__(self, day: int, firstweekday: int = calendar.SUNDAY):
+        super().__init__(firstweekday)
+        self.day = day
+
+    def formatday(self, day: int, weekday: int, width: int) -> str:
+        cell = super().formatday(day, weekday, width)
+        if day != self.day:
+            return cell
+
+        return cell.replace(
+            str(day), f"<span color='{GB.DARK_0_HARD}'><b>{day}</b></span>"
+        )
 
 
 def get_calendar() -> str | None:
     """Gets the current calendar and highlights the current day."""
     try:
-        current_day = datetime.now().strftime("%-d")
-        result = run_cmd(["cal"])
-        if not result.success:
-            return None
-
-        highlighted = re.sub(
-            rf"\b({current_day})\b",
-            rf"<span color='{GB.DARK_0_HARD}'><b>\1</b></span>",
-            result.raw_output.replace("\n\n", "\n"),
+        today = date.today()
+        return (
+            HighlightedCalendar(today.day)
+            .formatmonth(today.year, today.month)
+            .rstrip("\n")
         )
-        return highlighted
 
     except Exception as e:
         log.error(f"Could not retrieve calendar: {e}")
@@ -29,18 +52,178 @@ def get_calendar() -> str | None:
     return None
 
 
-def get_appointments() -> str | None:
-    """Returns upcoming appointments from calcurse."""
-    if not shutil.which("calcurse"):
-        log.error(msg="Binary 'calcurse' not found.")
-        return None
+_DATE = r"\d{2}/\d{2}/\d{4}"
+_APPOINTMENT_REGEX = re.compile(
+    rf"^(?P<start>{_DATE} @ \d{{2}}:\d{{2}}) -> (?P<end>{_DATE} @ \d{{2}}:\d{{2}})"
+)
+_EVENT_REGEX = re.compile(rf"^(?P<start>{_DATE}) \[\d+\]")
+# What follows the dates: the recurrence, the note, then the state, which is '!'
+# for appointments with a notification and '|' otherwise, before the description
+_DETAILS_REGEX = re.compile(
+    r" *(?:\{(?P<frequency>\d+)(?P<unit>[DWMY])(?P<rules>[^}]*)\})?"
+    r" *(?:>[0-9a-f]+ *)?[|!](?P<description>.*)"
+)
 
-    try:
-        result = run_cmd(["calcurse", "-d3"])
-        if not result.success:
+
+def _parse_date(value: str) -> date:
+    return datetime.strptime(value, "%m/%d/%Y").date()
+
+
+@dataclass(frozen=True)
+class Recurrence:
+    frequency: int
+    unit: str  # D(aily), W(eekly), M(onthly) or Y(early)
+    until: date | None = None
+    exceptions: frozenset[date] = frozenset()
+
+    @classmethod
+    def parse(cls, frequency: str, unit: str, rules: str) -> Self:
+        """Parse the rules of a recurrence, e.g. ' -> 12/31/2024 !02/14/2024'."""
+        tokens = rules.split()
+
+        until = None
+        if "->" in tokens[:-1]:
+            until = _parse_date(tokens[tokens.index("->") + 1])
+
+        exceptions = frozenset(
+            _parse_date(token[1:]) for token in tokens if token.startswith("!")
+        )
+
+        return cls(int(frequency), unit, until, exceptions)
+
+    def occurs_on(self, start: date, day: date) -> bool:
+        if day < start or day in self.exceptions:
+            return False
+        if self.until is not None and day > self.until:
+            return False
+
+        if self.unit == "D":
+            return (day - start).days % self.frequency == 0
+        elif self.unit == "W":
+            return (day - start).days % (7 * self.frequency) == 0
+
+        months = (day.year - start.year) * 12 + day.month - start.month
+        if self.unit == "M":
+            return day.day == start.day and months % self.frequency == 0
+
+        return (day.month, day.day) == (start.month, start.day) and months % (
+            12 * self.frequency
+        ) == 0
+
+
+@dataclass(frozen=True)
+class Appointment:
+    start: datetime
+    end: datetime | None  # None for events, which last the whole day
+    description: str
+    recurrence: Recurrence | None = None
+
+    @classmethod
+    def parse(cls, line: str) -> Self | None:
+        """Parse a line of calcurse's 'apts' file, or return None if it's invalid."""
+        try:
+            if match := _APPOINTMENT_REGEX.match(line):
+                start = datetime.strptime(match["start"], "%m/%d/%Y @ %H:%M")
+                end = datetime.strptime(match["end"], "%m/%d/%Y @ %H:%M")
+            elif match := _EVENT_REGEX.match(line):
+                start = datetime.strptime(match["start"], "%m/%d/%Y")
+                end = None
+            else:
+                return None
+
+            details = _DETAILS_REGEX.fullmatch(line, match.end())
+            if details is None:
+                return None
+
+            recurrence = None
+            if details["frequency"] is not None:
+                recurrence = Recurrence.parse(
+                    details["frequency"], details["unit"], details["rules"]
+                )
+        except (ValueError, IndexError):
             return None
 
-        return result.output if result.output else "No upcoming appointments."
+        return cls(start, end, details["description"].strip(), recurrence)
+
+    def occurs_on(self, day: date) -> bool:
+        if self.recurrence is not None:
+            return self.recurrence.occurs_on(self.start.date(), day)
+
+        end = self.end.date() if self.end is not None else self.start.date()
+        return self.start.date() <= day <= end
+
+    def format(self) -> str:
+        if self.end is None:
+            return f" * {self.description}"
+
+        return f" - {self.start:%H:%M} -> {self.end:%H:%M}\n\t{self.description}"
+
+
+# Path of the file: (its modification time and size when parsed, its appointments)
+_appointments_cache: dict[Path, tuple[tuple[int, int], list[Appointment]]] = {}
+
+
+def load_appointments(apts_path: Path) -> list[Appointment]:
+    """Parse calcurse's 'apts' file, only reading it again after it changed."""
+    stat = apts_path.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _appointments_cache.get(apts_path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    appointments: list[Appointment] = []
+    with open(apts_path, "r", encoding="utf-8") as f:
+        for line in f:
+            appointment = Appointment.parse(line.rstrip("\n"))
+            if appointment is None:
+                log.debug(f"Skipping invalid appointment: {line!r}")
+                continue
+
+            appointments.append(appointment)
+
+    _appointments_cache[apts_path] = (signature, appointments)
+
+    return appointments
+
+
+def format_appointments(
+    appointments: list[Appointment], start: date, days: int = APPOINTMENT_DAYS
+) -> str:
+    """Format the appointments of the following days, like 'calcurse -d'."""
+    lines: list[str] = []
+
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        occurring = sorted(
+            (a for a in appointments if a.occurs_on(day)),
+            # Events first, then appointments by time
+            key=lambda a: (a.end is not None, a.start.time()),
+        )
+        if not occurring:
+            continue
+
+        if lines:
+            lines.append("")
+        lines.append(f"{day:%m/%d/%y}:")
+        lines.extend(a.format() for a in occurring)
+
+    return "\n".join(lines)
+
+
+def get_appointments() -> str | None:
+    """Returns upcoming appointments from calcurse's data."""
+    apts_path = next((p for p in CALCURSE_APTS_PATHS if p.exists()), None)
+    if apts_path is None:
+        if not which("calcurse"):
+            log.error(msg="Binary 'calcurse' not found.")
+            return None
+
+        return "No upcoming appointments."
+
+    try:
+        appointments = format_appointments(load_appointments(apts_path), date.today())
+        return appointments if appointments else "No upcoming appointments."
 
     except Exception as e:
         log.error(f"Could not retrieve appointments: {e}")
@@ -59,7 +242,7 @@ def show_info() -> None:
 
 def open_calcurse() -> None:
     """Opens calcurse in the terminal if installed."""
-    if not shutil.which("calcurse"):
+    if not which("calcurse"):
         log.error(msg="Binary 'calcurse' not found.")
         return None
 
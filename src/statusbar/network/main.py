@@ -2,22 +2,12 @@
 
 # {{@@ header() @@}}
 
-import argparse
-import logging
-
 from common.cmd_utilities import run_cmd_background
-from common.helpers import get_version
-from common.logger import log, setup_logging
 from common.notification_utilities import Notification
-from common.statusbar import (
-    MouseButton,
-    handle_block_button,
-)
+from common.statusbar import Block, MouseButton
 from common.variables import EDITOR, TERMINAL
 from statusbar.network.src.core import (
-    get_ethernet_info,
-    get_vpn_info,
-    get_wifi_info,
+    NetworkStatus,
     open_network_handlers,
     toggle_wifi,
 )
@@ -46,33 +36,21 @@ ACTIONS = {
     ),
 }
 
+NETWORK_STATUS = NetworkStatus()
 
-def build_parser() -> argparse.ArgumentParser:
-    """Parse command-line arguments."""
-
-    parser = argparse.ArgumentParser(
-        prog="sb_network",
-        description="Statusbar script for network connectivity.",
-    )
-    parser.add_argument(
-        "-v", "--verbose", action="store_true", help="enable debug output"
-    )
-    parser.add_argument(
-        "--version", action="version", version=f"%(prog)s {get_version()}"
-    )
-    return parser
-
-
-def main() -> None:
-    args = build_parser().parse_args()
-
-    setup_logging(log, logging.DEBUG if args.verbose else logging.ERROR)
-    log.debug(args)
 
-    handle_block_button(ACTIONS)
+class NetworkBlock(Block):
+    name = "network"
+    description = "Statusbar script for network connectivity."
+    interval = 30
+    signal = 13
+    actions = ACTIONS
+    # Watched by the statusbar daemon, so the links are only checked when they change
+    events = NETWORK_STATUS
 
-    print(f"{get_wifi_info()}{get_ethernet_info()}{get_vpn_info()}")
+    def get_output(self) -> str:
+        return NETWORK_STATUS.get_output()
 
 
 if __name__ == "__main__":
-    main()
+    NetworkBlock().main()
@@ -1,10 +1,122 @@
+import errno
+import socket
+import struct
 from pathlib import Path
-from shutil import which
+from typing import Iterator
 
+from common.cache_utilities import which
 from common.cmd_utilities import run_cmd, run_cmd_background
 from common.logger import log
+from common.statusbar import CMD_TIMEOUT
 from common.variables import TERMINAL
 
+# rtnetlink, see 'man 7 rtnetlink'
+RTM_NEWLINK = 16
+RTM_DELLINK = 17
+RTM_NEWADDR = 20
+RTM_DELADDR = 21
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV6_IFADDR = 0x100
+IFLA_OPERSTATE = 16
+
+_NLMSGHDR = struct.Struct("=IHHII")  # length, type, flags, sequence, port id
+_IFINFOMSG = struct.Struct("=BxHiII")  # family, type, index, flags, change
+_RTATTR = struct.Struct("=HH")  # length, type
+
+
+def _align(length: int) -> int:
+    return (length + 3) & ~3
+
+
+def parse_netlink_messages(data: bytes) -> Iterator[tuple[int, bytes]]:
+    """Yield the type and payload of each message in a netlink datagram."""
+    offset = 0
+    while offset + _NLMSGHDR.size <= len(data):
+        length, msg_type, _, _, _ = _NLMSGHDR.unpack_from(data, offset)
+        if length < _NLMSGHDR.size:
+            break
+
+        yield msg_type, data[offset + _NLMSGHDR.size : offset + length]
+        offset += _align(length)
+
+
+def parse_link_state(payload: bytes) -> tuple[int, int, int | None]:
+    """Return the index, flags and operstate of a link from a RTM_NEWLINK payload."""
+    _, _, index, flags, _ = _IFINFOMSG.unpack_from(payload)
+
+    operstate = None
+    offset = _IFINFOMSG.size
+    while offset + _RTATTR.size <= len(payload):
+        length, attr_type = _RTATTR.unpack_from(payload, offset)
+        if length < _RTATTR.size:
+            break
+
+        if attr_type == IFLA_OPERSTATE and length > _RTATTR.size:
+            operstate = payload[offset + _RTATTR.size]
+        offset += _align(length)
+
+    return index, flags, operstate
+
+
+class NetlinkMonitor:
+    """
+    Link and address changes reported by the kernel through rtnetlink. Wireless
+    drivers also send link messages for e.g. scan results, so links are only
+    reported as changed when their flags or operstate differ.
+    """
+
+    def __init__(self):
+        self._socket = socket.socket(
+            socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE
+        )
+        self._socket.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV6_IFADDR))
+        self._socket.setblocking(False)
+
+        self._links: dict[int, tuple[int, int | None]] = {}
+
+    def fileno(self) -> int:
+        return self._socket.fileno()
+
+    def read_events(self) -> bool:
+        """Consume the pending messages, returning whether a link or address changed."""
+        changed = False
+
+        while True:
+            try:
+                data = self._socket.recv(65536)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                # The kernel dropped messages, so any link may have changed
+                if e.errno != errno.ENOBUFS:
+                    raise
+                changed = True
+                continue
+
+            for msg_type, payload in parse_netlink_messages(data):
+                changed |= self._handle_message(msg_type, payload)
+
+        return changed
+
+    def _handle_message(self, msg_type: int, payload: bytes) -> bool:
+        if msg_type == RTM_NEWLINK:
+            index, flags, operstate = parse_link_state(payload)
+            if self._links.get(index) == (flags, operstate):
+                return False
+
+            self._links[index] = (flags, operstate)
+            return True
+        elif msg_type == RTM_DELLINK:
+            index, _, _ = parse_link_state(payload)
+            self._links.pop(index, None)
+            return True
+
+        return msg_type in (RTM_NEWADDR, RTM_DELADDR)
+
+    def close(self) -> None:
+        self._socket.close()
+
 
 def get_net_state(prefix: str) -> str:
     """Check the operstate of the first interface matching the prefix."""
@@ -19,9 +131,10 @@ def get_net_state(prefix: str) -> str:
     return ""
 
 
-def get_wifi_info() -> str:
+def get_wifi_info(state: str | None = None) -> str:
     """Returns the WiFi icon and percentage or status icon."""
-    state = get_net_state("w")
+    if state is None:
+        state = get_net_state("w")
 
     if state == "up":
         try:
@@ -55,9 +168,7 @@ def get_vpn_info() -> str:
     """Returns VPN icon if Mullvad is active, falling back to interface check."""
     if which("mullvad"):
         try:
-            res = run_cmd(
-                ["mullvad", "status"],
-            )
+            res = run_cmd(["mullvad", "status"], timeout=CMD_TIMEOUT)
             return " 🔒" if res.output.startswith("Connected") else ""
         except Exception:
             pass
@@ -70,6 +181,47 @@ def get_vpn_info() -> str:
     return " 🔒" if vpn_exists else ""
 
 
+class NetworkStatus:
+    """
+    Output of the network block. Once it's watched for events (i.e. hosted by the
+    statusbar daemon), the interfaces and 'mullvad' are only checked again after
+    a link changed, while the wifi quality is still read on every update.
+    """
+
+    def __init__(self):
+        self._monitor: NetlinkMonitor | None = None
+        self._links: tuple[str, str, str] | None = None  # wifi state, ethernet, vpn
+        self._generation = 0
+
+    def fileno(self) -> int:
+        if self._monitor is None:
+            self._monitor = NetlinkMonitor()
+
+        return self._monitor.fileno()
+
+    def read_events(self) -> bool:
+        if self._monitor is None or not self._monitor.read_events():
+            return False
+
+        self._links = None
+        self._generation += 1
+        return True
+
+    def get_output(self) -> str:
+        links = self._links
+        if links is None:
+            generation = self._generation
+            links = (get_net_state("w"), get_ethernet_info(), get_vpn_info())
+
+            # Without events, nothing would tell that the links are outdated
+            if self._monitor is not None and generation == self._generation:
+                self._links = links
+
+        wifi_state, ethernet_info, vpn_info = links
+
+        return f"{get_wifi_info(wifi_state)}{ethernet_info}{vpn_info}"
+
+
 def toggle_wifi() -> None:
     """Toggles WiFi radio status via nmcli."""
     try:
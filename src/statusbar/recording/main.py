@@ -2,24 +2,46 @@
 
 # {{@@ header() @@}}
 
-import argparse
+import functools
 import logging
 
 from common.cmd_utilities import run_cmd_background
-from common.helpers import get_version
-from common.logger import log, setup_logging
 from common.notification_utilities import Notification, NotificationSystem
-from common.statusbar import (
-    MouseButton,
-    handle_block_button,
-)
+from common.statusbar import Block, MouseButton
 from common.variables import EDITOR, TERMINAL
-from statusbar.recording.src.core import RECORDING_ICON_PATH, stop_recording
+from statusbar.recording.src.core import (
+    RecordingState,
+    RecordingTracker,
+    format_recording,
+    stop_recording,
+)
+
+RECORDING_TRACKER = RecordingTracker()
+
+
+@functools.lru_cache(maxsize=1)
+def are_notifications_paused(state: RecordingState) -> bool:
+    """Ask the notification daemon once per recording, or once it's toggled."""
+    return bool(NotificationSystem.get_paused())
+
+
+def toggle_notifications() -> None:
+    NotificationSystem.set_paused("toggle")
+    are_notifications_paused.cache_clear()
+
+
+def stop() -> None:
+    state = RECORDING_TRACKER.get_state()
+    if stop_recording() and state is not None and state.output_path is not None:
+        Notification(
+            "⏺️ Recording", f"Recording was saved at {str(state.output_path)!r}."
+        ).send()
+
 
 # TODO: Implement pause recording feature
 ACTIONS = {
-    MouseButton.LEFT: stop_recording,
-    MouseButton.MIDDLE: lambda: NotificationSystem.set_paused("toggle"),
+    MouseButton.LEFT: stop,
+    MouseButton.MIDDLE: toggle_notifications,
     MouseButton.RIGHT: lambda: Notification(
         "⏺️ Recording",
         "Show recording status and info.\n"
@@ -27,7 +49,9 @@ ACTIONS = {
         "- Left   : Stop recording\n"
         "- Middle : Toggle notifications\n"
         "- Right  : Show this message\n"
-        "- Extra  : Edit this script",
+        "- Extra  : Edit this script\n"
+        "\n<b>Status</b>\n"
+        "Elapsed time and size of the recording",
     ).send(),
     MouseButton.EXTRA_3: lambda: run_cmd_background(
         [TERMINAL, "-e", EDITOR, "{{@@ _dotfile_abs_src @@}}"]
@@ -35,43 +59,27 @@ ACTIONS = {
 }
 
 
-def build_parser() -> argparse.ArgumentParser:
-    """Parse command-line arguments."""
-
-    parser = argparse.ArgumentParser(
-        prog="sb_recording",
-        description="Statusbar script to manage screen recording.",
-    )
-
-    parser.add_argument(
-        "-v", "--verbose", action="store_true", help="enable debug output"
-    )
-    parser.add_argument(
-        "--version", action="version", version=f"%(prog)s {get_version()}"
-    )
-
-    return parser
-
-
-def main() -> None:
-    args = build_parser().parse_args()
-
-    setup_logging(log, logging.DEBUG if args.verbose else logging.WARNING)
-    log.debug(args)
-
-    handle_block_button(ACTIONS)
-
-    if not RECORDING_ICON_PATH.exists():
-        return
+class RecordingBlock(Block):
+    name = "recording"
+    description = "Statusbar script to manage screen recording."
+    interval = 1  # the elapsed time and size are shown live
+    signal = 9
+    cached = False  # updated right away when signaled by the recorder
+    log_level = logging.WARNING
+    actions = ACTIONS
+    events = RECORDING_TRACKER  # the recorder starting or exiting
 
-    recording_icon = RECORDING_ICON_PATH.read_text().strip() or "⏺️"
+    def get_output(self) -> str:
+        """Return the recording status, or an empty string if nothing is recorded."""
+        state = RECORDING_TRACKER.get_state()
+        if state is None:
+            return ""
 
-    # Notifications can be paused to prevent interruptions
-    are_notifications_paused = NotificationSystem.get_paused()
-    notifications_suffix = "⏸️" if are_notifications_paused else ""
+        # Notifications can be paused to prevent interruptions
+        notifications_suffix = "⏸️" if are_notifications_paused(state) else ""
 
-    print(f"{recording_icon}-{notifications_suffix}🔔")
+        return f"{format_recording(state)}-{notifications_suffix}🔔"
 
 
 if __name__ == "__main__":
-    main()
+    RecordingBlock().main()
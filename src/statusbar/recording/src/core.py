@@ -1,29 +1,319 @@
+import ctypes
 import os
+import select
 import signal
+import struct
+import threading
+import time
+from dataclasses import dataclass, replace
 from pathlib import Path
+from typing import Iterator
 
 from common.logger import log
 
-RECORDING_ICON_PATH = Path("/tmp/recording_icon")
-RECORDING_PID_PATH = Path("/tmp/recording_pid")
+# Written by 'dmenurecord', which also signals the statusbar
+STATE_DIR = Path("/tmp")
+RECORDING_ICON_PATH = STATE_DIR / "recording_icon"
+RECORDING_PID_PATH = STATE_DIR / "recording_pid"
+RECORDING_PATH_PATH = STATE_DIR / "recording_path"  # Only written in box modes
+STATE_FILES = (RECORDING_ICON_PATH.name, RECORDING_PID_PATH.name)
 
+DEFAULT_ICON = "⏺️"
+
+# Seconds to wait for the recorder to finish writing the output once stopped
+STOP_TIMEOUT = 5.0
+
+# The output path is written right before the PID, while an older one was left
+# over by a previous recording
+OUTPUT_PATH_MAX_AGE = 1.0
+
+# inotify, see 'man 7 inotify'
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CLOSE_WRITE = 0x8
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+STATE_FILE_EVENTS = IN_CLOSE_WRITE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+
+_INOTIFY_EVENT = struct.Struct("=iIII")  # watch descriptor, mask, cookie, length
+
+
+def inotify_watch(path: Path, mask: int) -> int:
+    """Return a non-blocking inotify descriptor watching the path."""
+    libc = ctypes.CDLL(None, use_errno=True)
+
+    fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    if fd < 0:
+        raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    if libc.inotify_add_watch(fd, os.fsencode(path), mask) < 0:
+        errno = ctypes.get_errno()
+        os.close(fd)
+        raise OSError(errno, f"Unable to watch {str(path)!r}")
+
+    return fd
+
+
+def parse_inotify_events(data: bytes) -> Iterator[tuple[int, str]]:
+    """Yield the mask and file name of each event read from an inotify descriptor."""
+    offset = 0
+    while offset + _INOTIFY_EVENT.size <= len(data):
+        _, mask, _, length = _INOTIFY_EVENT.unpack_from(data, offset)
+        offset += _INOTIFY_EVENT.size
+
+        name = data[offset : offset + length].rstrip(b"\0")
+        yield mask, os.fsdecode(name)
+        offset += length
+
+
+def read_output_path(path_file: Path, started: float) -> Path | None:
+    """Return the output path written by 'dmenurecord' for the recording."""
+    try:
+        if started - path_file.stat().st_mtime > OUTPUT_PATH_MAX_AGE:
+            return None
+        output_path = path_file.read_text().strip()
+    except FileNotFoundError:
+        return None
+
+    return Path(output_path) if output_path else None
+
+
+def get_output_path(pid: int) -> Path | None:
+    """Return the file the recorder writes to, the last argument of 'ffmpeg'."""
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            args = f.read().rstrip(b"\0").split(b"\0")
+        cwd = os.readlink(f"/proc/{pid}/cwd")
+    except OSError as e:
+        log.debug(f"Unable to read the command of PID {pid}: {e}")
+        return None
+
+    if len(args) < 2:
+        return None
+
+    return Path(cwd) / os.fsdecode(args[-1])
+
+
+@dataclass(frozen=True)
+class RecordingState:
+    pid: int
+    icon: str
+    started: float  # time.time()
+    output_path: Path | None = None
+
+    @property
+    def elapsed(self) -> float:
+        return max(time.time() - self.started, 0)
+
+    @property
+    def size(self) -> int | None:
+        """Bytes written so far."""
+        if self.output_path is None:
+            return None
+
+        try:
+            return self.output_path.stat().st_size
+        except OSError:
+            return None
+
+
+def format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02}:{seconds:02}"
+
+    return f"{minutes}:{seconds:02}"
+
+
+def format_size(size: int) -> str:
+    value = float(size)
+    for unit in ("B", "K", "M", "G"):
+        if value < 1024:
+            break
+        value /= 1024
+    else:
+        unit = "T"
+
+    return f"{value:.0f}{unit}" if unit == "B" or value >= 10 else f"{value:.1f}{unit}"
+
+
+def format_recording(state: RecordingState) -> str:
+    output = f"{state.icon} {format_duration(state.elapsed)}"
+
+    size = state.size
+    if size is not None:
+        output += f" {format_size(size)}"
+
+    return output
+
+
+class RecordingTracker:
+    """
+    Track the recorder started by 'dmenurecord'. Its state files are only read
+    when inotify reports a change, and the recorder is watched through a pidfd,
+    which becomes readable once it exits. Both are polled through a single epoll
+    descriptor, so the statusbar daemon updates the block as soon as either
+    changes. Without the daemon, the state is read once per run.
+
+    The daemon reads events on its loop, while the block is rendered in another
+    thread, so the state is only accessed while holding a lock.
+    """
+
+    def __init__(self, state_dir: Path = STATE_DIR):
+        self.state_dir = state_dir
+
+        self._epoll: select.epoll | None = None
+        self._inotify: int | None = None
+        self._pidfd: int | None = None
+        self._state: RecordingState | None = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def fileno(self) -> int:
+        with self._lock:
+            if self._epoll is None:
+                self._inotify = inotify_watch(self.state_dir, STATE_FILE_EVENTS)
+                self._epoll = select.epoll()
+                self._epoll.register(self._inotify, select.EPOLLIN)
+                if self._pidfd is not None:
+                    self._epoll.register(self._pidfd, select.EPOLLIN)
+
+                # Changes made before the watch was added were missed
+                self._loaded = False
+
+            return self._epoll.fileno()
+
+    def read_events(self) -> bool:
+        with self._lock:
+            changed = False
+
+            while self._inotify is not None:
+                try:
+                    data = os.read(self._inotify, 4096)
+                except BlockingIOError:
+                    break
+
+                for mask, name in parse_inotify_events(data):
+                    if name in STATE_FILES or mask & IN_Q_OVERFLOW:
+                        changed = True
+
+            # The recorder exited, e.g. when it failed, without removing its files
+            if self._pidfd is not None and select.select([self._pidfd], [], [], 0)[0]:
+                changed = True
+
+            if changed:
+                self._load()
+
+            return changed
+
+    def get_state(self) -> RecordingState | None:
+        """Return the current recording, or None if nothing is recorded."""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+
+            # Outside of box modes, the output is only known from the command of
+            # the recorder. The PID is written right after it's forked, so it
+            # may not run 'ffmpeg' yet, nor have created its output.
+            state = self._state
+            if state is not None and state.output_path is None:
+                output_path = get_output_path(state.pid)
+                if output_path is not None and output_path.exists():
+                    self._state = replace(state, output_path=output_path)
+
+            return self._state
+
+    def _close_pidfd(self) -> None:
+        if self._pidfd is None:
+            return
+
+        if self._epoll is not None:
+            self._epoll.unregister(self._pidfd)
+        os.close(self._pidfd)
+        self._pidfd = None
+
+    def _load(self) -> None:
+        self._close_pidfd()
+        self._state = None
+        self._loaded = True
+
+        pid_path = self.state_dir / RECORDING_PID_PATH.name
+        try:
+            pid = int(pid_path.read_text().strip())
+            started = pid_path.stat().st_mtime
+            self._pidfd = os.pidfd_open(pid)
+        except FileNotFoundError:
+            return
+        except ValueError:
+            log.error(f"Invalid PID in file: {str(pid_path)!r}")
+            return
+        except ProcessLookupError:
+            log.debug(f"Recorder with PID {pid} is not running anymore.")
+            return
+
+        if self._epoll is not None:
+            self._epoll.register(self._pidfd, select.EPOLLIN)
+
+        try:
+            icon_path = self.state_dir / RECORDING_ICON_PATH.name
+            icon = icon_path.read_text().strip() or DEFAULT_ICON
+        except FileNotFoundError:
+            icon = DEFAULT_ICON
+
+        output_path = read_output_path(
+            self.state_dir / RECORDING_PATH_PATH.name, started
+        )
+
+        self._state = RecordingState(pid, icon, started, output_path)
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_pidfd()
+            if self._epoll is not None:
+                self._epoll.close()
+                self._epoll = None
+            if self._inotify is not None:
+                os.close(self._inotify)
+                self._inotify = None
+
+
+def stop_recording(state_dir: Path = STATE_DIR, timeout: float = STOP_TIMEOUT) -> bool:
+    """
+    Stop the recorder, returning whether it exited within the timeout. The state
+    files are kept when it didn't, so stopping it can be tried again.
+    """
+    pid_path = state_dir / RECORDING_PID_PATH.name
+    icon_path = state_dir / RECORDING_ICON_PATH.name
 
-def stop_recording():
     recording_pid = None
+    stopped = False
     try:
-        with RECORDING_PID_PATH.open() as f:
-            content = f.read().strip()
-        recording_pid = int(content)
+        recording_pid = int(pid_path.read_text().strip())
+
+        # Signaled through a pidfd, so a reused PID is never signaled
+        pidfd = os.pidfd_open(recording_pid)
+        try:
+            signal.pidfd_send_signal(pidfd, signal.SIGTERM)
 
-        os.kill(recording_pid, signal.SIGTERM)
+            if not select.select([pidfd], [], [], timeout)[0]:
+                log.error(f"Recorder {recording_pid} did not stop in {timeout}s.")
+                return False
+        finally:
+            os.close(pidfd)
 
+        stopped = True
     except FileNotFoundError:
-        return
+        return False
     except ValueError:
-        log.error(f"Invalid PID in file: {RECORDING_PID_PATH!r}")
+        log.error(f"Invalid PID in file: {str(pid_path)!r}")
     except ProcessLookupError:
         log.error(f"No such process: {recording_pid!r}")
     except PermissionError:
         log.error(f"Permissions denied for PID {recording_pid!r}.")
-    finally:
-        RECORDING_PID_PATH.unlink(missing_ok=True)
+        return False
+
+    pid_path.unlink(missing_ok=True)
+    icon_path.unlink(missing_ok=True)
+
+    return stopped
@@ -2,19 +2,14 @@
 
 # {{@@ header() @@}}
 
-import argparse
-import logging
-
 from common.cmd_utilities import run_cmd_background
-from common.helpers import get_version
-from common.logger import log, setup_logging
 from common.notification_utilities import Notification
-from common.statusbar import MouseButton, handle_block_button
+from common.statusbar import Block, MouseButton
 from common.variables import EDITOR, TERMINAL
 from statusbar.rss.src.core import (
     NEWSRAFT_DB,
-    get_item_count_db,
-    get_unread_count,
+    get_item_counts,
+    get_unread_newsraft,
     refresh_feeds,
 )
 
@@ -37,40 +32,25 @@ ACTIONS = {
 }
 
 
-def build_parser() -> argparse.ArgumentParser:
-    """Parse command-line arguments."""
-
-    parser = argparse.ArgumentParser(
-        prog="sb_rss",
-        description="Statusbar script to manage news and get unread count.",
-    )
-
-    parser.add_argument(
-        "-v", "--verbose", action="store_true", help="enable debug output"
-    )
-    parser.add_argument(
-        "--version", action="version", version=f"%(prog)s {get_version()}"
-    )
-
-    return parser
-
-
-def main() -> None:
-    args = build_parser().parse_args()
-
-    setup_logging(log, logging.DEBUG if args.verbose else logging.ERROR)
-    log.debug(args)
+class RssBlock(Block):
+    name = "rss"
+    description = "Statusbar script to manage news and get unread count."
+    interval = 300
+    signal = 14
+    actions = ACTIONS
 
-    handle_block_button(ACTIONS)
+    def get_output(self) -> str:
+        counts = get_item_counts(NEWSRAFT_DB)
+        if counts is not None:
+            return f"{counts.unread} / {counts.total}"
 
-    unread_count = get_unread_count()
-    total_count = get_item_count_db(NEWSRAFT_DB)
+        # Without the database, newsraft still knows the unread count
+        unread = get_unread_newsraft()
+        if unread is None:
+            return " ❗err"
 
-    if not unread_count:
-        print(" ❗err")
-    else:
-        print(f"{unread_count} / {total_count}")
+        return f"{unread} / ?"
 
 
 if __name__ == "__main__":
-    main()
+    RssBlock().main()
@@ -1,11 +1,12 @@
-import shutil
 import sqlite3
 from contextlib import closing
+from dataclasses import dataclass
 from pathlib import Path
 
 from common.cmd_utilities import run_cmd
 from common.logger import log
 from common.notification_utilities import Notification
+from common.statusbar import CMD_TIMEOUT
 from common.variables import XDG_DATA_HOME
 
 NEWSRAFT_DATA_DIR = XDG_DATA_HOME / "newsraft"
@@ -17,45 +18,71 @@ def reload_newsraft() -> bool:
     return run_cmd(["newsraft", "-e", "reload-all"]).success
 
 
-def _get_unread_newsraft() -> int | None:
+def get_unread_newsraft() -> int | None:
     """Get unread items count using newsraft."""
-    result = run_cmd(["newsraft", "-e", "print-unread-items-count"])
+    result = run_cmd(
+        ["newsraft", "-e", "print-unread-items-count"], timeout=CMD_TIMEOUT
+    )
     if result.success:
         return int(result.output)
 
     return None
 
 
-def get_item_count_db(db_path: Path, unread: bool = False) -> int | None:
-    """Get unread items count directly from the database."""
+@dataclass(frozen=True)
+class ItemCounts:
+    total: int
+    unread: int
 
-    db_backup_path = db_path.parent / f"{db_path.name}.bak"
+
+# Database path: (signature of the files when counted, counts)
+_counts_cache: dict[Path, tuple[tuple[int, ...], ItemCounts]] = {}
+
+
+def _get_db_signature(db_path: Path) -> tuple[int, ...]:
+    """
+    Modification time and size of the database and of its write-ahead log, which
+    holds the latest changes until they're checkpointed into the database.
+    """
+    signature = []
+    for path in (db_path, db_path.parent / f"{db_path.name}-wal"):
+        try:
+            stat = path.stat()
+            signature += [stat.st_mtime_ns, stat.st_size]
+        except FileNotFoundError:
+            signature += [0, 0]
+
+    return tuple(signature)
+
+
+def get_item_counts(db_path: Path) -> ItemCounts | None:
+    """
+    Get the total and unread items count directly from the database, reusing the
+    last counts while the database is unchanged.
+    """
     try:
-        shutil.copy2(db_path, db_backup_path)
-    except Exception as e:
-        log.error(
-            f"Failed to backup db {str(db_path)!r} to {str(db_backup_path)!r}: {e}"
-        )
+        signature = _get_db_signature(db_path)
+    except OSError as e:
+        log.error(f"Unable to read db {str(db_path)!r}: {e}")
         return None
 
-    # .resolve() ensures the path is absolute, which file URIs prefer
+    cached = _counts_cache.get(db_path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    # .resolve() ensures the path is absolute, which file URIs prefer. The database
+    # isn't opened as immutable, as newsraft rewrites it in place when reloading,
+    # and the locks keep reads from seeing a partial write.
     db_uri = f"file:{db_path.resolve()}?mode=ro"
 
     try:
         # sqlite3.connect context managers don't automatically close connections,
         # so contextlib.closing handles the clean-up.
         with closing(sqlite3.connect(db_uri, uri=True)) as conn:
-            cursor = conn.cursor()
-
-            query = "SELECT COUNT(*) FROM items"
-            if unread:
-                query += " WHERE unread = 1"
-
-            cursor.execute(query)
-            row = cursor.fetchone()
-
-            # SELECT COUNT(*) always returns exactly one row, even if 0
-            return int(row[0]) if row else 0
+            # Aggregates always return exactly one row, even without items
+            total, unread = conn.execute(
+                "SELECT COUNT(*), IFNULL(SUM(unread = 1), 0) FROM items"
+            ).fetchone()
 
     except sqlite3.Error as e:
         log.error(f"SQLite database error reading from {str(db_path)!r}: {e}")
@@ -64,14 +91,10 @@ def get_item_count_db(db_path: Path, unread: bool = False) -> int | None:
         log.error(f"Unexpected error reading from db {str(db_path)!r}: {e}")
         return None
 
+    counts = ItemCounts(int(total), int(unread))
+    _counts_cache[db_path] = (signature, counts)
 
-def get_unread_count() -> int | None:
-    unread_count = _get_unread_newsraft()
-    if unread_count:
-        return unread_count
-
-    # Fallback to reading from the database
-    return get_item_count_db(db_path=NEWSRAFT_DB, unread=True)
+    return counts
 
 
 def refresh_feeds() -> bool:
@@ -84,9 +107,9 @@ def refresh_feeds() -> bool:
         Notification(notification_title, "Unable to refresh feeds.").send()
         return False
 
-    total_count = get_item_count_db(db_path=NEWSRAFT_DB)
-    if total_count:
-        Notification(notification_title, f"Newsraft has {total_count} items.").send()
+    counts = get_item_counts(NEWSRAFT_DB)
+    if counts:
+        Notification(notification_title, f"Newsraft has {counts.total} items.").send()
     else:
         Notification(
             notification_title, "Refresh successful, but unknown item count."
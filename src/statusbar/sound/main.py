@@ -2,20 +2,17 @@
 
 # {{@@ header() @@}}
 
-
-import argparse
 import logging
 
 from common.cmd_utilities import run_cmd, run_cmd_background
-from common.helpers import SoundUtility, get_version
-from common.logger import log, setup_logging
+from common.helpers import SoundUtility
 from common.notification_utilities import Notification
-from common.statusbar import (
-    MouseButton,
-    handle_block_button,
-)
+from common.statusbar import Block, MouseButton
 from common.variables import EDITOR, STATUSBAR, TERMINAL
-from statusbar.sound.src.core import resolve_icon
+from statusbar.sound.src.core import SinkEvents, VolumeController, resolve_icon
+
+# Scrolling is coalesced into a single volume change when hosted by the daemon
+VOLUME_CONTROLLER = VolumeController(SoundUtility.update_volume)
 
 ACTIONS = {
     MouseButton.LEFT: lambda: (
@@ -33,50 +30,35 @@ ACTIONS = {
         "- Scroll : Update sound volume\n"
         "- Extra  : Edit this script",
     ).send(),
-    MouseButton.SCROLL_UP: lambda: SoundUtility.update_volume(2),
-    MouseButton.SCROLL_DOWN: lambda: SoundUtility.update_volume(-2),
+    MouseButton.SCROLL_UP: lambda: VOLUME_CONTROLLER.adjust(2),
+    MouseButton.SCROLL_DOWN: lambda: VOLUME_CONTROLLER.adjust(-2),
     MouseButton.EXTRA_3: lambda: run_cmd_background(
         [TERMINAL, "-e", EDITOR, "{{@@ _dotfile_abs_src @@}}"]
     ),
 }
 
 
-def build_parser() -> argparse.ArgumentParser:
-    """Parse command-line arguments."""
-
-    parser = argparse.ArgumentParser(
-        prog="sb_sound",
-        description="Statusbar script to manage sound and get volume.",
-    )
-
-    parser.add_argument(
-        "-v", "--verbose", action="store_true", help="enable debug output"
-    )
-    parser.add_argument(
-        "--version", action="version", version=f"%(prog)s {get_version()}"
-    )
-
-    return parser
-
-
-def main() -> None:
-    args = build_parser().parse_args()
-
-    setup_logging(log, logging.DEBUG if args.verbose else logging.WARNING)
-    log.debug(args)
-
-    handle_block_button(ACTIONS)
+class SoundBlock(Block):
+    name = "sound"
+    description = "Statusbar script to manage sound and get volume."
+    interval = 60
+    signal = 10
+    cached = False  # updated right away when signaled after a volume change
+    log_level = logging.WARNING
+    actions = ACTIONS
+    # Watched by the statusbar daemon, to update the volume as soon as it changes
+    events = SinkEvents()
 
-    volume_result = SoundUtility.get_volume()
-    if volume_result is None:
-        print("⛔ Connection")
-        return
+    def get_output(self) -> str:
+        volume_result = SoundUtility.get_volume()
+        if volume_result is None:
+            return "⛔ Connection"
 
-    volume, is_muted = volume_result
-    icon = resolve_icon(volume, is_muted)
+        volume, is_muted = volume_result
+        icon = resolve_icon(volume, is_muted)
 
-    print(f"{icon}{volume}%")
+        return f"{icon}{volume}%"
 
 
 if __name__ == "__main__":
-    main()
+    SoundBlock().main()
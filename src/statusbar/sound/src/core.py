@@ -1,4 +1,13 @@
-from typing import Literal
+import os
+import subprocess
+import threading
+import time
+from typing import Any, Callable, Literal, Sequence
+
+from common.logger import log
+
+# Scroll events arriving within this many seconds are applied as a single change
+VOLUME_DEBOUNCE = 0.05
 
 
 def resolve_icon(
@@ -14,3 +23,103 @@ def resolve_icon(
         return "🔉"
 
     return "🔈"
+
+
+class VolumeController:
+    """
+    Coalesce volume changes, so scrolling quickly on the block runs a single
+    'wpctl set-volume' per batch instead of one per scroll step.
+
+    The first change waits ``debounce`` seconds for more, then applies their sum.
+    Changes made while it's applied are summed into the next batch.
+    """
+
+    def __init__(
+        self, set_volume: Callable[[int], Any], debounce: float = VOLUME_DEBOUNCE
+    ):
+        self.set_volume = set_volume
+        self.debounce = debounce
+
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._applying = False
+
+    def adjust(self, diff: int) -> None:
+        """Change the volume by ``diff`` percent, returning once it's applied."""
+        with self._lock:
+            self._pending += diff
+            if self._applying:
+                return
+            self._applying = True
+
+        while True:
+            time.sleep(self.debounce)
+
+            with self._lock:
+                diff, self._pending = self._pending, 0
+                if diff == 0:
+                    self._applying = False
+                    return
+
+            try:
+                self.set_volume(diff)
+            except Exception as e:
+                log.error(f"Could not update the volume: {e}")
+
+
+class SinkEvents:
+    """
+    Events of the audio sinks from a long-running 'pactl subscribe', so the
+    statusbar daemon updates the block when the volume changes, instead of
+    polling it. It's started on the first call to 'fileno'.
+    """
+
+    def __init__(self, command: Sequence[str] = ("pactl", "subscribe")):
+        self.command = command
+
+        self._process: subprocess.Popen[bytes] | None = None
+        self._buffer = b""
+
+    def fileno(self) -> int:
+        if self._process is None:
+            self._process = subprocess.Popen(
+                self.command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+
+        assert self._process.stdout is not None
+        fd = self._process.stdout.fileno()
+        os.set_blocking(fd, False)
+
+        return fd
+
+    def read_events(self) -> bool:
+        """
+        Consume the pending events, returning whether a sink or the default sink
+        changed, e.g. "Event 'change' on sink #56".
+        """
+        assert self._process is not None and self._process.stdout is not None
+
+        try:
+            data = os.read(self._process.stdout.fileno(), 65536)
+        except BlockingIOError:
+            return False
+
+        if not data:
+            self.close()
+            raise OSError(f"{' '.join(self.command)!r} exited")
+
+        *lines, self._buffer = (self._buffer + data).split(b"\n")
+
+        return any(b" on sink #" in line or b" on server" in line for line in lines)
+
+    def close(self) -> None:
+        if self._process is None:
+            return
+
+        if self._process.poll() is None:
+            self._process.terminate()
+        if self._process.stdout is not None:
+            self._process.stdout.close()
+        self._process.wait()
@@ -5,8 +5,8 @@
 import argparse
 import logging
 
+from common.args import add_version_arg
 from common.cmd_utilities import run_cmd_background
-from common.helpers import get_version
 from common.logger import log, setup_logging
 from common.notification_utilities import Notification
 from common.statusbar import (
@@ -45,9 +45,7 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="enable debug output"
     )
-    parser.add_argument(
-        "--version", action="version", version=f"%(prog)s {get_version()}"
-    )
+    add_version_arg(parser)
 
     return parser
 
@@ -2,29 +2,23 @@
 
 # {{@@ header() @@}}
 
-import argparse
-import logging
-
 from common.cmd_utilities import run_cmd_background
-from common.helpers import get_version
-from common.logger import log, setup_logging
 from common.notification_utilities import Notification
-from common.statusbar import (
-    MouseButton,
-    handle_block_button,
-)
+from common.statusbar import Block, MouseButton
 from common.variables import EDITOR, TERMINAL
-from statusbar.todos.src.core import process_tasks
+from statusbar.todos.src.core import process_tasks, show_summary
 
 ACTIONS = {
     MouseButton.LEFT: lambda: run_cmd_background([TERMINAL, "-e", "taskwarrior-tui"]),
+    MouseButton.MIDDLE: show_summary,
     MouseButton.RIGHT: lambda: Notification(
         " ToDos",
         "Show due and overdue tasks.\n"
         "\n<b>Actions</b>\n"
-        "- Left  : Open 'taskwarrior-tui'\n"
-        "- Right : Show this message\n"
-        "- Extra : Edit this script",
+        "- Left   : Open 'taskwarrior-tui'\n"
+        "- Middle : Show the task counts\n"
+        "- Right  : Show this message\n"
+        "- Extra  : Edit this script",
     ).send(),
     MouseButton.EXTRA_3: lambda: run_cmd_background(
         [TERMINAL, "-e", EDITOR, "{{@@ _dotfile_abs_src @@}}"]
@@ -32,34 +26,16 @@ ACTIONS = {
 }
 
 
-def build_parser() -> argparse.ArgumentParser:
-    """Parse command-line arguments."""
-
-    parser = argparse.ArgumentParser(
-        prog="sb_todos",
-        description="Statusbar script for managing ToDos.",
-    )
-
-    parser.add_argument(
-        "-v", "--verbose", action="store_true", help="enable debug output"
-    )
-    parser.add_argument(
-        "--version", action="version", version=f"%(prog)s {get_version()}"
-    )
-
-    return parser
-
-
-def main() -> None:
-    args = build_parser().parse_args()
-
-    setup_logging(log, logging.DEBUG if args.verbose else logging.ERROR)
-    log.debug(args)
-
-    handle_block_button(ACTIONS)
+class TodosBlock(Block):
+    name = "todos"
+    description = "Statusbar script for managing ToDos."
+    interval = 300
+    signal = 15
+    actions = ACTIONS
 
-    print(process_tasks())
+    def get_output(self) -> str:
+        return process_tasks()
 
 
 if __name__ == "__main__":
-    main()
+    TodosBlock().main()
@@ -1,30 +1,132 @@
+import json
+import os
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
 from common.cmd_utilities import run_cmd
 from common.logger import log
 from common.notification_utilities import Notification
+from common.statusbar import CMD_TIMEOUT
 from common.variables import XDG_DATA_HOME
 
 STATE_FILE = XDG_DATA_HOME / "taskwarrior" / "overdue_tasks"
+TASK_DATA_DIR = Path(os.getenv("TASKDATA") or Path.home() / ".task")
+
+
+@dataclass(frozen=True)
+class TaskCounts:
+    pending: int
+    overdue: int
+    due_today: int
+    due_this_week: int  # including today
+
+
+# Data directory: (signature of its files when exported, due dates of pending tasks)
+_due_dates_cache: dict[Path, tuple[tuple[int, ...], list[datetime | None]]] = {}
+
+
+def _get_data_signature(data_dir: Path) -> tuple[int, ...]:
+    """
+    Modification time of the data directory and of its files, as taskwarrior
+    updates some of them in place, which doesn't change the directory.
+    """
+    with os.scandir(data_dir) as entries:
+        files = sorted(
+            (entry.name, entry.stat().st_mtime_ns)
+            for entry in entries
+            if entry.is_file()
+        )
 
+    return (data_dir.stat().st_mtime_ns, *(mtime for _, mtime in files))
 
-def get_task_count(filter_str: str) -> int | None:
-    """Runs taskwarrior count with the specified filter."""
+
+def parse_task_date(value: str) -> datetime:
+    """Parse a date of 'task export', e.g. '20240215T090000Z'."""
+    return datetime.strptime(value, "%Y%m%dT%H%M%SZ").replace(tzinfo=UTC)
+
+
+def export_due_dates() -> list[datetime | None] | None:
+    """Return the due date of every pending task, from a single 'task export'."""
     try:
-        result = run_cmd(["task", filter_str, "count"])
+        # Exports are JSON arrays since taskwarrior 2.6. Notices (e.g. about
+        # configuration overrides) are silenced, and only stdout is parsed.
+        result = run_cmd(
+            ["task", "rc.verbose=nothing", "+PENDING", "export"],
+            timeout=CMD_TIMEOUT,
+            separate_stderr=True,
+        )
         if not result.success:
+            log.error(f"Could not export tasks: {result.raw_stderr.strip()}")
             return None
 
-        return int(result.output)
+        return [
+            parse_task_date(task["due"]) if "due" in task else None
+            for task in json.loads(result.output or "[]")
+        ]
     except Exception as e:
-        log.error(f"Could not get task count: {e}")
+        log.error(f"Could not export tasks: {e}")
 
     return None
 
 
+def get_due_dates(data_dir: Path = TASK_DATA_DIR) -> list[datetime | None] | None:
+    """Return the due dates of the pending tasks, exported again only after a change."""
+    try:
+        signature = _get_data_signature(data_dir)
+    except OSError as e:
+        log.debug(f"Not caching tasks, as {str(data_dir)!r} can't be read: {e}")
+        return export_due_dates()
+
+    cached = _due_dates_cache.get(data_dir)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    due_dates = export_due_dates()
+    if due_dates is not None:
+        _due_dates_cache[data_dir] = (signature, due_dates)
+
+    return due_dates
+
+
+def count_tasks(
+    due_dates: list[datetime | None], now: datetime | None = None
+) -> TaskCounts:
+    """
+    Count the tasks by due date. Tasks become overdue as time passes, so they're
+    counted on every call instead of being cached.
+    """
+    now = now or datetime.now().astimezone()
+    today_end = (now + timedelta(days=1)).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    week_end = today_end + timedelta(days=6 - now.weekday())
+
+    overdue = due_today = due_this_week = 0
+    for due in due_dates:
+        if due is None:
+            continue
+
+        if due < now:
+            overdue += 1
+        elif due < week_end:
+            due_this_week += 1
+            if due < today_end:
+                due_today += 1
+
+    return TaskCounts(len(due_dates), overdue, due_today, due_this_week)
+
+
+def get_task_counts() -> TaskCounts | None:
+    due_dates = get_due_dates()
+    if due_dates is None:
+        return None
+
+    return count_tasks(due_dates)
+
+
 def process_tasks() -> str:
     """Processes task counts and handles overdue notifications."""
-    # Ensure state directory exists
-    STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
-
     # Read previous overdue count
     old_overdue = 0
     if STATE_FILE.exists():
@@ -34,12 +136,14 @@ def process_tasks() -> str:
             pass
 
     # Get current counts
-    pending_tasks = get_task_count("+PENDING") or 0
-    overdue_tasks = get_task_count("+OVERDUE") or 0
-    due_tasks = pending_tasks - overdue_tasks
+    counts = get_task_counts() or TaskCounts(0, 0, 0, 0)
+    overdue_tasks = counts.overdue
+    due_tasks = counts.pending - overdue_tasks
 
-    # Update state file
-    STATE_FILE.write_text(str(overdue_tasks))
+    # Update state file, only when the count changed
+    if overdue_tasks != old_overdue:
+        STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        STATE_FILE.write_text(str(overdue_tasks))
 
     # Notify if more tasks became overdue
     difference = overdue_tasks - old_overdue
@@ -53,3 +157,18 @@ def process_tasks() -> str:
     if overdue_tasks != 0:
         return f"{due_tasks} {overdue_tasks}"
     return f"{due_tasks}"
+
+
+def show_summary() -> None:
+    counts = get_task_counts()
+    if counts is None:
+        Notification(" ToDos", "Unable to get the tasks.").send()
+        return
+
+    Notification(
+        " ToDos",
+        f"Pending   : {counts.pending}\n"
+        f"Overdue   : {counts.overdue}\n"
+        f"Due today : {counts.due_today}\n"
+        f"This week : {counts.due_this_week}",
+    ).send()
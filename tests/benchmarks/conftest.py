@@ -0,0 +1,44 @@
+import os
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from common.benchmark_utilities import BenchmarkResult, measure, save_results
+
+# Where the results of the run are saved. They are only saved when it's set (e.g.
+# by 'flexy benchmark'), so plain test runs never overwrite the real results.
+RESULTS_ENV_VAR = "FLEXYCON_BENCH_RESULTS"
+
+# Number of names, or of tree entries, the benchmarks run on
+SIZE_ENV_VAR = "FLEXYCON_BENCH_SIZE"
+DEFAULT_SIZE = 10_000
+
+_results: list[BenchmarkResult] = []
+
+type Benchmark = Callable[..., BenchmarkResult]
+
+
+@pytest.fixture(scope="session")
+def bench_size() -> int:
+    return int(os.getenv(SIZE_ENV_VAR, DEFAULT_SIZE))
+
+
+@pytest.fixture
+def benchmark() -> Benchmark:
+    """Measure a function and record the result for the end of the session."""
+
+    def run(name: str, func: Callable[[], object], **kwargs) -> BenchmarkResult:
+        result = measure(name, func, **kwargs)
+        _results.append(result)
+        return result
+
+    return run
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    results_path = os.getenv(RESULTS_ENV_VAR)
+    if not _results or not results_path:
+        return
+
+    save_results(_results, Path(results_path))
@@ -0,0 +1,73 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from common.io_utilities import remove_empty_dirs, remove_files_by_pattern
+
+pytestmark = pytest.mark.slow
+
+# Entries per directory in the synthetic trees
+FAN_OUT = 100
+
+
+def build_file_tree(root: Path, size: int) -> None:
+    """
+    Create about ``size`` entries: directories of 'FAN_OUT' files, one in ten of
+    them matching '*.pyc', with a '__pycache__' and a 'node_modules' in each.
+    """
+    shutil.rmtree(root, ignore_errors=True)
+
+    for d in range(max(size // FAN_OUT, 1)):
+        directory = root / f"pkg{d // FAN_OUT}" / f"mod{d}"
+        (directory / "__pycache__").mkdir(parents=True)
+        (directory / "node_modules").mkdir()
+        (directory / "node_modules" / "dep.pyc").touch()
+
+        for f in range(FAN_OUT - 3):
+            suffix = ".pyc" if f % 10 == 0 else ".py"
+            (directory / f"file{f}{suffix}").touch()
+
+
+def build_dir_tree(root: Path, size: int) -> None:
+    """Create about ``size`` directories, half of them empty."""
+    shutil.rmtree(root, ignore_errors=True)
+
+    for d in range(max(size // FAN_OUT, 1)):
+        directory = root / f"branch{d // FAN_OUT}" / f"leaf{d}"
+
+        for e in range(FAN_OUT):
+            (directory / f"dir{e}").mkdir(parents=True)
+            if e % 2:
+                (directory / f"dir{e}" / "keep").touch()
+
+
+def test_remove_files_by_pattern(benchmark, tmp_path: Path, bench_size: int):
+    root = tmp_path / "tree"
+
+    benchmark(
+        f"remove_files_by_pattern[{bench_size}]",
+        lambda: remove_files_by_pattern(
+            {"*.pyc", "__pycache__"}, root, global_excludes={"node_modules"}
+        ),
+        setup=lambda: build_file_tree(root, bench_size),
+        number=1,
+        repeat=3,
+    )
+
+    assert not list(root.rglob("__pycache__"))
+
+
+def test_remove_empty_dirs(benchmark, tmp_path: Path, bench_size: int):
+    root = tmp_path / "tree"
+
+    benchmark(
+        f"remove_empty_dirs[{bench_size}]",
+        lambda: remove_empty_dirs(root, global_excludes={"node_modules"}),
+        setup=lambda: build_dir_tree(root, bench_size),
+        number=1,
+        repeat=3,
+    )
+
+    assert not (root / "branch0" / "leaf0" / "dir0").exists()
+    assert (root / "branch0" / "leaf0" / "dir1").exists()
@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from common.string_utilities import (
+    remove_diacritics,
+    split_into_words,
+    to_alternate_case,
+    to_camel_case,
+    to_lower_case,
+    to_pascal_case,
+    to_upper_case,
+    truncate,
+)
+
+pytestmark = pytest.mark.slow
+
+PARTS = [
+    "parse",
+    "HTTP",
+    "Response",
+    "file",
+    "name",
+    "2025",
+    "v2",
+    "XMLHttpRequest",
+    "café",
+    "Ünïcödé",
+    "naïve",
+    "合",
+    "data",
+    "README",
+]
+SEPARATORS = ["", " ", "-", "_", "."]
+
+
+@pytest.fixture(scope="module")
+def names(bench_size: int) -> list[str]:
+    rng = random.Random(0)
+    return [
+        "".join(
+            rng.choice(PARTS) + rng.choice(SEPARATORS) for _ in range(rng.randint(1, 6))
+        )
+        for _ in range(bench_size)
+    ]
+
+
+def test_split_into_words(benchmark, names: list[str]):
+    benchmark(
+        f"split_into_words[{len(names)}]",
+        lambda: [split_into_words(name) for name in names],
+    )
+
+
+@pytest.mark.parametrize(
+    "converter",
+    [to_alternate_case, to_camel_case, to_lower_case, to_pascal_case, to_upper_case],
+)
+def test_converters(benchmark, names: list[str], converter):
+    benchmark(
+        f"{converter.__name__}[{len(names)}]",
+        lambda: [converter(name) for name in names],
+    )
+
+
+def test_truncate(benchmark, names: list[str]):
+    benchmark(
+        f"truncate[{len(names)}]",
+        lambda: [
+            truncate(name, 12, truncate_from_end=i % 2 == 0)
+            for i, name in enumerate(names)
+        ],
+    )
+
+
+def test_remove_diacritics(benchmark, names: list[str]):
+    benchmark(
+        f"remove_diacritics[{len(names)}]",
+        lambda: [remove_diacritics(name) for name in names],
+    )
@@ -0,0 +1,55 @@
+import argparse
+from importlib import metadata
+from pathlib import Path
+
+import pytest
+
+import common.helpers
+from common.args import add_version_arg
+from common.helpers import get_version
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="prog")
+    add_version_arg(parser)
+    return parser
+
+
+def test_version_is_not_resolved_without_the_flag(monkeypatch: pytest.MonkeyPatch):
+    def fail() -> str:
+        raise AssertionError("the version should not be resolved")
+
+    monkeypatch.setattr(common.helpers, "get_version", fail)
+
+    args = build_parser().parse_args([])
+
+    assert not hasattr(args, "version")
+
+
+def test_version_flag_prints_version(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+):
+    monkeypatch.setattr(common.helpers, "get_version", lambda: "1.2.3")
+
+    with pytest.raises(SystemExit) as exc_info:
+        build_parser().parse_args(["--version"])
+
+    assert exc_info.value.code == 0
+    assert capsys.readouterr().out == "prog 1.2.3\n"
+
+
+def test_get_version_reads_pyproject(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    pyproject_path = tmp_path / "pyproject.toml"
+    pyproject_path.write_text('[project]\nversion = "1.2.4"\n')
+    monkeypatch.setattr(common.helpers, "PYPROJECT_PATH", pyproject_path)
+
+    assert get_version() == "1.2.4"
+
+
+def test_get_version_uses_metadata_when_installed(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+):
+    monkeypatch.setattr(common.helpers, "PYPROJECT_PATH", tmp_path / "missing.toml")
+    monkeypatch.setattr(metadata, "version", lambda name: "9.9.9")
+
+    assert get_version() == "9.9.9"
@@ -0,0 +1,102 @@
+import asyncio
+import sys
+import time
+
+import pytest
+
+from common.cmd_utilities import async_run_cmd, run_cmd
+
+
+def py(code: str) -> list[str]:
+    return [sys.executable, "-c", code]
+
+
+def test_async_run_cmd_returns_output():
+    result = asyncio.run(async_run_cmd(py("print('hello')")))
+
+    assert result.success
+    assert result.output == "hello"
+    assert not result.timed_out
+
+
+def test_async_run_cmd_can_be_gathered():
+    """Three 0.3s commands gathered together should take well under 0.9s."""
+
+    async def gather_all():
+        return await asyncio.gather(
+            *(async_run_cmd(py("import time; time.sleep(0.3)")) for _ in range(3))
+        )
+
+    start = time.monotonic()
+    results = asyncio.run(gather_all())
+
+    assert all(r.success for r in results)
+    assert time.monotonic() - start < 0.8
+
+
+def test_timeout_terminates_command():
+    start = time.monotonic()
+    result = asyncio.run(
+        async_run_cmd(
+            py("print('started', flush=True); import time; time.sleep(10)"), timeout=0.5
+        )
+    )
+
+    assert result.timed_out
+    assert not result.success
+    assert result.output == "started"
+    assert time.monotonic() - start < 5
+
+
+def test_timeout_escalates_to_sigkill():
+    """A process ignoring SIGTERM should be killed after the grace period."""
+    code = (
+        "import signal, time; "
+        "signal.signal(signal.SIGTERM, signal.SIG_IGN); "
+        "print('ready', flush=True); "
+        "time.sleep(10)"
+    )
+
+    start = time.monotonic()
+    result = asyncio.run(async_run_cmd(py(code), timeout=0.5, kill_timeout=0.5))
+
+    assert result.timed_out
+    assert result.return_code < 0
+    assert time.monotonic() - start < 5
+
+
+def test_cancellation_terminates_command():
+    async def cancel_soon():
+        task = asyncio.create_task(async_run_cmd(py("import time; time.sleep(10)")))
+        await asyncio.sleep(0.3)
+        task.cancel()
+        await task
+
+    start = time.monotonic()
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(cancel_soon())
+
+    assert time.monotonic() - start < 5
+
+
+def test_run_cmd_with_timeout():
+    result = run_cmd(py("import time; time.sleep(10)"), timeout=0.3)
+
+    assert result.timed_out
+    assert not result.success
+
+
+def test_run_cmd_with_timeout_that_is_not_reached():
+    result = run_cmd(py("print('fast')"), timeout=5)
+
+    assert result.success
+    assert result.output == "fast"
+
+
+def test_run_cmd_with_timeout_keeps_partial_output():
+    result = run_cmd(
+        py("print('started', flush=True); import time; time.sleep(10)"), timeout=0.5
+    )
+
+    assert result.timed_out
+    assert result.output == "started"
@@ -0,0 +1,69 @@
+from pathlib import Path
+
+from common.benchmark_utilities import (
+    BenchmarkResult,
+    compare_results,
+    format_comparisons,
+    load_results,
+    measure,
+    save_results,
+)
+
+
+def result(name: str, seconds: float) -> BenchmarkResult:
+    return BenchmarkResult(name, seconds, number=1, repeat=1)
+
+
+def test_measure_runs_setup_before_each_repeat():
+    calls: list[str] = []
+
+    measured = measure(
+        "append",
+        lambda: calls.append("run"),
+        setup=lambda: calls.append("setup"),
+        number=1,
+        repeat=3,
+    )
+
+    assert calls == ["setup", "run"] * 3
+    assert measured.number == 1
+    assert measured.seconds >= 0
+
+
+def test_save_and_load_results(tmp_path: Path):
+    path = tmp_path / "nested" / "results.json"
+    results = [result("a", 0.5), result("b", 0.001)]
+
+    save_results(results, path)
+
+    assert load_results(path) == {"a": results[0], "b": results[1]}
+
+
+def test_compare_results_flags_regressions():
+    baseline = {"fast": result("fast", 1.0), "slow": result("slow", 1.0)}
+    current = {"fast": result("fast", 0.5), "slow": result("slow", 1.5)}
+
+    comparisons = {c.name: c for c in compare_results(current, baseline)}
+
+    assert comparisons["fast"].change == -0.5
+    assert not comparisons["fast"].is_regression(0.25)
+    assert comparisons["slow"].is_regression(0.25)
+    assert not comparisons["slow"].is_regression(0.6)
+
+
+def test_compare_results_keeps_unmatched_names():
+    comparisons = compare_results(
+        {"new": result("new", 1.0)}, {"old": result("old", 1.0)}
+    )
+
+    assert [(c.name, c.change) for c in comparisons] == [("new", None), ("old", None)]
+    assert not any(c.is_regression() for c in comparisons)
+
+
+def test_format_comparisons_marks_regressions():
+    comparisons = compare_results({"a": result("a", 2.0)}, {"a": result("a", 1.0)})
+
+    report = format_comparisons(comparisons, threshold=0.25)
+
+    assert "+100.0%" in report
+    assert "REGRESSION" in report
@@ -0,0 +1,160 @@
+import gc
+import sys
+from pathlib import Path
+
+import pytest
+
+from common import cache_utilities
+from common.cache_utilities import (
+    WHICH_TTL,
+    ResultCache,
+    _command_key,
+    invalidate_all_caches,
+    invalidate_cmd,
+    run_cmd_cached,
+    which,
+)
+
+
+def test_get_or_compute_only_computes_once():
+    cache = ResultCache("test")
+    calls: list[str] = []
+
+    def compute() -> str:
+        calls.append("called")
+        return "value"
+
+    assert cache.get_or_compute("key", compute) == "value"
+    assert cache.get_or_compute("key", compute) == "value"
+    assert len(calls) == 1
+
+
+def test_none_results_are_cached():
+    cache = ResultCache("test")
+    calls: list[str] = []
+
+    def compute() -> None:
+        calls.append("called")
+
+    cache.get_or_compute("key", compute)
+    cache.get_or_compute("key", compute)
+    assert len(calls) == 1
+
+
+def test_expired_entries_are_recomputed(monkeypatch: pytest.MonkeyPatch):
+    now = [1000.0]
+    monkeypatch.setattr("common.cache_utilities.time.time", lambda: now[0])
+
+    cache = ResultCache("test", ttl=10)
+    cache.set("key", "old")
+
+    now[0] += 5
+    assert cache.get("key") == "old"
+
+    now[0] += 10
+    assert cache.get("key") is None
+    assert cache.get_or_compute("key", lambda: "new") == "new"
+
+
+def test_invalidate():
+    cache = ResultCache("test")
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+    cache.invalidate()
+    assert cache.get("b") is None
+
+
+def test_invalidate_all_caches():
+    first = ResultCache("first")
+    second = ResultCache("second")
+    first.set("key", 1)
+    second.set("key", 2)
+
+    invalidate_all_caches()
+
+    assert first.get("key") is None
+    assert second.get("key") is None
+
+
+def test_unused_caches_are_not_kept():
+    cache = ResultCache("temporary")
+    assert cache in cache_utilities._CACHES
+
+    del cache
+    gc.collect()
+
+    assert all(other.name != "temporary" for other in cache_utilities._CACHES)
+
+
+def test_persisted_cache_is_shared(tmp_path: Path):
+    writer = ResultCache("shared", persist=True, cache_dir=tmp_path)
+    writer.set("key", {"nested": [1, 2]})
+
+    reader = ResultCache("shared", persist=True, cache_dir=tmp_path)
+    assert reader.get("key") == {"nested": [1, 2]}
+
+
+def test_corrupt_persisted_cache_is_ignored(tmp_path: Path):
+    (tmp_path / "broken.json").write_text("{not json")
+
+    cache = ResultCache("broken", persist=True, cache_dir=tmp_path)
+    assert cache.get("key") is None
+
+
+def test_which_is_memoized(monkeypatch: pytest.MonkeyPatch):
+    calls: list[str] = []
+
+    def fake_which(command: str) -> str:
+        calls.append(command)
+        return f"/usr/bin/{command}"
+
+    monkeypatch.setattr("common.cache_utilities.shutil.which", fake_which)
+    invalidate_all_caches()
+
+    assert which("fake-tool") == "/usr/bin/fake-tool"
+    assert which("fake-tool") == "/usr/bin/fake-tool"
+    assert calls == ["fake-tool"]
+
+
+def test_which_notices_installed_tools(monkeypatch: pytest.MonkeyPatch):
+    now = [1000.0]
+    monkeypatch.setattr("common.cache_utilities.time.time", lambda: now[0])
+    paths: dict[str, str] = {}
+    monkeypatch.setattr("common.cache_utilities.shutil.which", paths.get)
+    invalidate_all_caches()
+
+    assert which("new-tool") is None
+
+    paths["new-tool"] = "/usr/bin/new-tool"
+    now[0] += WHICH_TTL
+    assert which("new-tool") == "/usr/bin/new-tool"
+
+
+def test_run_cmd_cached_reuses_successful_results(tmp_path: Path):
+    counter = tmp_path / "counter"
+    code = (
+        "import pathlib, sys; p = pathlib.Path(sys.argv[1]); "
+        "p.write_text(p.read_text() + 'x' if p.exists() else 'x'); "
+        "print(len(p.read_text()))"
+    )
+    command: list[str | Path] = [sys.executable, "-c", code, counter]
+    cache = ResultCache("test")
+
+    assert run_cmd_cached(command, cache).output == "1"
+    assert run_cmd_cached(command, cache).output == "1"
+
+    invalidate_cmd(command, cache)
+    assert run_cmd_cached(command, cache).output == "2"
+
+
+def test_run_cmd_cached_does_not_cache_failures():
+    command = [sys.executable, "-c", "raise SystemExit(1)"]
+    cache = ResultCache("test")
+
+    assert not run_cmd_cached(command, cache).success
+    assert cache.get(_command_key(command)) is None
@@ -0,0 +1,72 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from common.cmd_utilities import CommandPool, run_cmds
+
+
+def py(code: str) -> list[str]:
+    return [sys.executable, "-c", code]
+
+
+def test_results_keep_input_order():
+    """Slower commands submitted first should still be reported first."""
+    commands = [
+        py("import time; time.sleep(0.2); print('first')"),
+        py("print('second')"),
+        py("import time; time.sleep(0.1); print('third')"),
+    ]
+
+    results = run_cmds(commands, max_workers=3)
+
+    assert [r.output for r in results if r] == ["first", "second", "third"]
+
+
+def test_commands_run_concurrently():
+    """Four 0.3s sleeps on four workers should take well under 1.2s."""
+    commands = [py("import time; time.sleep(0.3)") for _ in range(4)]
+
+    start = time.monotonic()
+    results = run_cmds(commands, max_workers=4)
+    elapsed = time.monotonic() - start
+
+    assert all(r and r.success for r in results)
+    assert elapsed < 1.0
+
+
+def test_collect_all_keeps_going_after_failure():
+    commands = [py("raise SystemExit(3)"), py("print('ok')")]
+
+    results = run_cmds(commands, max_workers=1)
+
+    assert results[0] is not None and results[0].return_code == 3
+    assert results[1] is not None and results[1].output == "ok"
+
+
+def test_collect_all_keeps_going_after_missing_executable(tmp_path: Path):
+    commands: list[list[str | Path]] = [[tmp_path / "missing"], [*py("print('ok')")]]
+
+    results = run_cmds(commands, max_workers=1)
+
+    assert results[0] is not None and results[0].return_code == -1
+    assert results[1] is not None and results[1].output == "ok"
+
+
+def test_fail_fast_skips_pending_commands():
+    commands = [py("raise SystemExit(1)")] + [py("print('late')") for _ in range(5)]
+
+    results = run_cmds(commands, max_workers=1, fail_fast=True)
+
+    assert results[0] is not None and not results[0].success
+    assert results[-1] is None
+
+
+def test_empty_input():
+    assert run_cmds([]) == []
+
+
+def test_invalid_worker_count():
+    with pytest.raises(ValueError):
+        CommandPool(max_workers=0)
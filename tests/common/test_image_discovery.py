@@ -0,0 +1,129 @@
+import json
+import os
+from collections import Counter
+from pathlib import Path
+
+from common.io_utilities import (
+    ImageIndex,
+    get_images_from_path,
+    iter_images_from_path,
+    pick_random_image,
+)
+
+
+def make_tree(base: Path) -> set[Path]:
+    (base / "a" / "b").mkdir(parents=True)
+    (base / "a" / "notes.txt").write_text("")
+    (base / "dir.jpg").mkdir()
+    images = {base / "one.png", base / "a" / "two.JPG", base / "a" / "b" / "three.webp"}
+    for image in images:
+        image.write_text("")
+    return images
+
+
+def test_finds_images_recursively(tmp_path: Path):
+    images = make_tree(tmp_path)
+
+    assert set(get_images_from_path(tmp_path)) == images
+
+
+def test_single_file(tmp_path: Path):
+    image = tmp_path / "pic.jpeg"
+    image.write_text("")
+    text = tmp_path / "pic.txt"
+    text.write_text("")
+
+    assert get_images_from_path(image) == [image]
+    assert get_images_from_path(text) == []
+    assert get_images_from_path(tmp_path / "missing.png") == []
+
+
+def test_index_matches_plain_scan(tmp_path: Path):
+    root = tmp_path / "walls"
+    images = make_tree(root)
+    index = ImageIndex(tmp_path / "index.json")
+
+    assert set(iter_images_from_path(root, index)) == images
+
+
+def test_index_is_reused_until_directory_changes(tmp_path: Path):
+    root = tmp_path / "walls"
+    make_tree(root)
+    index_path = tmp_path / "index.json"
+
+    first = ImageIndex(index_path)
+    list(first.iter_images(root))
+    first.save()
+
+    # A file added without changing the directory's mtime isn't picked up,
+    # which shows that the listing came from the index
+    stat = os.stat(root)
+    (root / "sneaky.png").write_text("")
+    os.utime(root, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    second = ImageIndex(index_path)
+    assert root / "sneaky.png" not in set(second.iter_images(root))
+
+    # Once the mtime changes, the directory is scanned again
+    os.utime(root, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    third = ImageIndex(index_path)
+    assert root / "sneaky.png" in set(third.iter_images(root))
+
+
+def test_index_drops_removed_directories(tmp_path: Path):
+    index_path = tmp_path / "index.json"
+    root = tmp_path / "root"
+    other = tmp_path / "other"
+    make_tree(root)
+    make_tree(other)
+
+    first = ImageIndex(index_path)
+    set(first.iter_images(root))
+    set(first.iter_images(other))
+    first.save()
+
+    for path in (root / "a" / "b").iterdir():
+        path.unlink()
+    (root / "a" / "b").rmdir()
+
+    second = ImageIndex(index_path)
+    set(second.iter_images(root))
+    second.save()
+
+    indexed = set(json.loads(index_path.read_text()))
+    assert str(root / "a" / "b") not in indexed
+    assert str(root / "a") in indexed
+    # Trees that weren't walked are kept
+    assert str(other / "a" / "b") in indexed
+
+
+def test_pick_random_image_avoids_current(tmp_path: Path):
+    first = tmp_path / "first.png"
+    second = tmp_path / "second.png"
+    first.write_text("")
+    second.write_text("")
+
+    for _ in range(20):
+        assert pick_random_image([tmp_path], avoid=first, use_index=False) == second
+
+
+def test_pick_random_image_falls_back_to_current(tmp_path: Path):
+    only = tmp_path / "only.png"
+    only.write_text("")
+
+    assert pick_random_image([tmp_path], avoid=only, use_index=False) == only
+
+
+def test_pick_random_image_without_images(tmp_path: Path):
+    assert pick_random_image([tmp_path], use_index=False) is None
+
+
+def test_pick_random_image_is_roughly_uniform(tmp_path: Path):
+    for i in range(4):
+        (tmp_path / f"{i}.png").write_text("")
+
+    picks = Counter(pick_random_image([tmp_path], use_index=False) for _ in range(2000))
+
+    assert len(picks) == 4
+    assert all(count > 350 for count in picks.values())
@@ -0,0 +1,86 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).resolve().parents[2] / "src"
+
+# Statusbar blocks run every few seconds, so their imports are kept cheap
+IMPORT_TIME_CAP_MS = int(os.getenv("FLEXYCON_IMPORT_TIME_CAP_MS", 200))
+
+ENTRY_POINTS = [
+    "scripts.file_renamer.main",
+    "scripts.flexy.main",
+    "scripts.rclone_wrapper.main",
+    "scripts.user_shortcuts.main",
+    "statusbar.battery.main",
+    "statusbar.client.main",
+    "statusbar.date.main",
+    "statusbar.network.main",
+    "statusbar.recording.main",
+    "statusbar.rss.main",
+    "statusbar.sound.main",
+    "statusbar.todos.main",
+]
+
+# Modules that are slow to import, so they're only loaded when needed
+HEAVY_MODULES = {
+    "asyncio",
+    "colorama",
+    "git",
+    "humanize",
+    "psutil",
+    "pydantic",
+    "tabulate",
+    "yaml",
+}
+
+
+def import_times(module: str) -> dict[str, int]:
+    """
+    Import a module in a new interpreter and return the cumulative import time
+    (in microseconds) of every module it loaded.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env={**os.environ, "PYTHONPATH": str(SRC_DIR)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+
+    return times
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "common.cmd_utilities",
+        "common.helpers",
+        "common.logger",
+        "common.window_manager_utilities",
+        *ENTRY_POINTS,
+    ],
+)
+def test_heavy_modules_are_not_imported(module: str):
+    assert HEAVY_MODULES.isdisjoint(import_times(module))
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("module", ENTRY_POINTS)
+def test_import_time(module: str):
+    # Best of a few runs, as a single run is easily skewed by the system load
+    best_ms = min(import_times(module)[module] for _ in range(3)) / 1000
+
+    assert best_ms < IMPORT_TIME_CAP_MS
@@ -0,0 +1,82 @@
+import json
+import unicodedata
+from pathlib import Path
+
+import pytest
+
+from common.string_utilities import (
+    iter_remove_diacritics,
+    load_diacritics_table,
+    remove_diacritics,
+    save_diacritics_table,
+)
+
+
+def reference(text: str) -> str:
+    normalized = unicodedata.normalize("NFD", text)
+    return "".join(c for c in normalized if unicodedata.category(c) != "Mn")
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("", ""),
+        ("plain ascii", "plain ascii"),
+        ("Ünïcödé naïve café", "Unicode naive cafe"),
+        ("ăâîșț ĂÂÎȘȚ", "aaist AAIST"),
+        ("é", "e"),
+        ("合$ß", "合$ß"),
+    ],
+)
+def test_remove_diacritics(text: str, expected: str):
+    assert remove_diacritics(text) == expected
+
+
+def test_matches_nfd_for_every_bmp_char():
+    chars = "".join(chr(c) for c in range(0x10000) if not 0xD800 <= c < 0xE000)
+
+    assert remove_diacritics(chars) == reference(chars)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        # Spacing marks (category 'Mc') are kept, and NFD reorders them with
+        # the marks of the neighbouring chars
+        "x\U0001d165̖",
+        "\U0001d15e̖a",
+        "᭄̖́",
+    ],
+)
+def test_reordered_marks_match_nfd(text: str):
+    assert remove_diacritics(text) == reference(text)
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7])
+def test_iter_remove_diacritics(size: int):
+    text = "Ünïcödé é̖ x\U0001d165̖ " * 5
+    chunks = [text[i : i + size] for i in range(0, len(text), size)]
+
+    assert "".join(iter_remove_diacritics(chunks)) == reference(text)
+
+
+def test_save_and_load_table(tmp_path: Path):
+    path = tmp_path / "diacritics.json"
+    remove_diacritics("é")
+
+    save_diacritics_table(path)
+
+    assert json.loads(path.read_text(encoding="utf-8"))["table"]["é"] == "e"
+    assert load_diacritics_table(path)
+
+
+def test_load_table_ignores_other_unicode_versions(tmp_path: Path):
+    path = tmp_path / "diacritics.json"
+    path.write_text(
+        json.dumps({"unidata_version": "1.0", "table": {"a": "b"}, "reordered": []}),
+        encoding="utf-8",
+    )
+
+    assert not load_diacritics_table(path)
+    assert not load_diacritics_table(tmp_path / "missing.json")
+    assert remove_diacritics("aé") == "ae"
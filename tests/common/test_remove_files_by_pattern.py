@@ -99,3 +99,49 @@ def test_pattern_match_inside_global_exclude_is_ignored(tmp_path: Path):
         patterns={"*.log"}, base_dir=tmp_path, global_excludes={".git"}
     )
     assert trash.exists()
+
+
+def test_multiple_patterns_in_one_pass(tmp_path: Path):
+    """Every pattern should be applied during the same traversal."""
+    cache = tmp_path / "pkg" / "__pycache__"
+    cache.mkdir(parents=True)
+    (cache / "mod.cpython-313.pyc").write_text("")
+    egg_info = tmp_path / "flexycon.egg-info"
+    egg_info.mkdir()
+    ds_store = tmp_path / "pkg" / ".DS_Store"
+    ds_store.write_text("")
+    keep = tmp_path / "pkg" / "mod.py"
+    keep.write_text("")
+
+    remove_files_by_pattern(
+        {"__pycache__", "*.egg-info", ".DS_Store"}, base_dir=tmp_path
+    )
+
+    assert not cache.exists()
+    assert not egg_info.exists()
+    assert not ds_store.exists()
+    assert keep.exists()
+
+
+def test_excluded_directory_is_pruned_at_any_depth(tmp_path: Path):
+    """Matches nested deep inside an excluded directory should survive."""
+    nested = tmp_path / "project" / "node_modules" / "pkg" / "build"
+    nested.mkdir(parents=True)
+    outside = tmp_path / "project" / "build"
+    outside.mkdir()
+
+    remove_files_by_pattern(
+        {"build"}, base_dir=tmp_path, global_excludes={"node_modules"}
+    )
+
+    assert nested.exists()
+    assert not outside.exists()
+
+
+def test_many_matches_with_a_single_worker(tmp_path: Path):
+    files = [tmp_path / f"file{i}.tmp" for i in range(50)]
+    for f in files:
+        f.write_text("")
+
+    remove_files_by_pattern({"*.tmp"}, base_dir=tmp_path, max_workers=1)
+    assert not any(f.exists() for f in files)
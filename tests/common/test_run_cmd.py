@@ -0,0 +1,54 @@
+import sys
+
+import pytest
+
+from common.cmd_utilities import run_cmd
+
+
+def py(code: str) -> list[str]:
+    return [sys.executable, "-c", code]
+
+
+def test_captures_large_output():
+    result = run_cmd(py("for i in range(100_000): print(i)"))
+
+    assert result.success
+    assert result.raw_output.splitlines() == [str(i) for i in range(100_000)]
+
+
+def test_stderr_is_merged():
+    code = "import sys; print('out', flush=True); print('err', file=sys.stderr)"
+    result = run_cmd(py(code))
+
+    assert result.output.splitlines() == ["out", "err"]
+    assert result.raw_stderr == ""
+
+
+def test_newlines_are_translated():
+    code = "import sys; sys.stdout.buffer.write(b'a\\r\\nb\\rc\\n')"
+
+    assert run_cmd(py(code)).raw_output == "a\nb\nc\n"
+
+
+def test_invalid_utf8_is_replaced():
+    code = "import sys; sys.stdout.buffer.write(b'ok \\xff')"
+    result = run_cmd(py(code))
+
+    assert result.output == "ok �"
+
+
+def test_invalid_utf8_is_replaced_with_timeout():
+    code = "import sys; sys.stdout.buffer.write(b'ok \\xff\\r\\n')"
+    result = run_cmd(py(code), timeout=5)
+
+    assert result.raw_output == "ok �\n"
+
+
+@pytest.mark.parametrize("timeout", [None, 5])
+def test_separate_stderr(timeout: float | None):
+    code = "import sys; print('out'); print('err', file=sys.stderr); sys.exit(2)"
+    result = run_cmd(py(code), timeout=timeout, separate_stderr=True)
+
+    assert result.return_code == 2
+    assert result.output == "out"
+    assert result.raw_stderr == "err\n"
@@ -1,6 +1,6 @@
 import pytest
 
-from common.string_utilities import split_into_words
+from common.string_utilities import split_into_words, split_many
 
 
 @pytest.mark.parametrize(
@@ -142,3 +142,19 @@ def test_numbers(input_str: str, expected: list[str]):
 )
 def test_complex_combinations(input_str: str, expected: list[str]):
     assert split_into_words(input_str) == expected
+
+
+def test_custom_boundaries_next_to_numbers_and_capitals():
+    assert split_into_words("a+1+B", boundaries=["+"]) == ["a", "1", "B"]
+    assert split_into_words("fooXbar", boundaries=["X"]) == ["foo", "bar"]
+
+
+def test_long_acronym_runs():
+    assert split_into_words("A" * 5000 + "b") == ["A" * 4999, "Ab"]
+
+
+def test_split_many():
+    texts = ["helloWorld", "", "HTML5CanvasAPI", "one-two"]
+
+    assert split_many(texts) == [split_into_words(t) for t in texts]
+    assert split_many(["a.b+c"], boundaries=["+"]) == [["a.b", "c"]]
@@ -0,0 +1,85 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from common import statusbar
+from common.statusbar import Block
+
+
+@pytest.fixture
+def blocks(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> dict[str, type[Block]]:
+    """Registry of the blocks defined in the test, cached under 'tmp_path'."""
+    monkeypatch.setattr(statusbar, "BLOCKS", {})
+    monkeypatch.setattr(statusbar, "BLOCK_CACHE_DIR", tmp_path)
+    return statusbar.BLOCKS
+
+
+def make_block(outputs: list[str], cached: bool = True) -> Block:
+    class CounterBlock(Block):
+        name = "counter"
+        interval = 60
+
+        def get_output(self) -> str:
+            outputs.append(f"output {len(outputs)}")
+            return outputs[-1]
+
+    CounterBlock.cached = cached
+    return CounterBlock()
+
+
+def test_blocks_are_registered(blocks: dict[str, type[Block]]):
+    block = make_block([])
+
+    class UnnamedBlock(Block):
+        pass
+
+    assert blocks == {"counter": type(block)}
+
+
+def test_blocks_must_render_their_output(blocks: dict[str, type[Block]]):
+    class IncompleteBlock(Block):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        IncompleteBlock()  # type: ignore[abstract]
+
+
+def test_first_read_renders_and_caches(blocks: dict[str, type[Block]]):
+    outputs: list[str] = []
+    block = make_block(outputs)
+
+    assert block.read() == ("output 0", False)
+    assert block.read() == ("output 0", False)
+    assert len(outputs) == 1
+
+
+def test_stale_cache_is_still_returned(
+    blocks: dict[str, type[Block]], monkeypatch: pytest.MonkeyPatch
+):
+    outputs: list[str] = []
+    block = make_block(outputs)
+    block.update()
+
+    later = time.time() + block.interval
+    monkeypatch.setattr(statusbar.time, "time", lambda: later)
+
+    assert block.read() == ("output 0", True)
+    assert len(outputs) == 1
+
+
+def test_uncached_block_is_always_rendered(blocks: dict[str, type[Block]]):
+    outputs: list[str] = []
+    block = make_block(outputs, cached=False)
+
+    assert block.read() == ("output 0", False)
+    assert block.read() == ("output 1", False)
+    assert not block.cache_path.exists()
+
+
+def test_unreadable_cache_is_ignored(blocks: dict[str, type[Block]]):
+    block = make_block([])
+    block.cache_path.write_text("not json")
+
+    assert block.load_cache() is None
+    assert block.read() == ("output 0", False)
@@ -0,0 +1,65 @@
+import sys
+import time
+
+import pytest
+
+from common.cmd_utilities import stream_cmd
+
+
+def py(code: str) -> list[str]:
+    return [sys.executable, "-c", code]
+
+
+def test_yields_lines_and_return_code():
+    stream = stream_cmd(py("print('one'); print('two'); raise SystemExit(4)"))
+
+    assert list(stream) == ["one", "two"]
+    assert stream.return_code == 4
+    assert not stream.success
+
+
+def test_return_code_is_unknown_before_iteration():
+    stream = stream_cmd(py("pass"))
+
+    assert stream.return_code is None
+
+
+def test_lines_arrive_before_the_command_finishes():
+    code = "import time; print('first', flush=True); time.sleep(1); print('second')"
+
+    start = time.monotonic()
+    with stream_cmd(py(code)) as stream:
+        first_line = next(iter(stream))
+        first_line_at = time.monotonic() - start
+
+    assert first_line == "first"
+    assert first_line_at < 0.8
+
+
+def test_leaving_context_early_terminates_command():
+    code = (
+        "import time\nwhile True:\n    print('tick', flush=True)\n    time.sleep(0.05)"
+    )
+
+    start = time.monotonic()
+    with stream_cmd(py(code)) as stream:
+        for _line in stream:
+            break
+
+    assert stream.return_code is not None
+    assert not stream.success
+    assert time.monotonic() - start < 5
+
+
+def test_stream_can_only_be_iterated_once():
+    stream = stream_cmd(py("print('x')"))
+    list(stream)
+
+    with pytest.raises(RuntimeError):
+        list(stream)
+
+
+def test_invalid_utf8_is_replaced():
+    code = "import sys; sys.stdout.buffer.write(b'ok \\xff\\nnext\\n')"
+
+    assert list(stream_cmd([sys.executable, "-c", code])) == ["ok �", "next"]
@@ -1,6 +1,9 @@
 import pytest
 
 from common.string_utilities import (
+    Words,
+    convert_case,
+    convert_many,
     to_alternate_case,
     to_camel_case,
     to_lower_case,
@@ -84,3 +87,25 @@ def test_upper_case(text: str, delimiter: str, expected: str):
 )
 def test_pascal_case(text: str, delimiter: str, expected: str):
     assert to_pascal_case(text, delimiter) == expected
+
+
+def test_convert_case_renders_several_styles():
+    styles = [Words.camel_case, Words.upper_case, lambda w: w.lower_case("_")]
+
+    assert convert_case("Simple file name1", styles) == [
+        "simpleFileName1",
+        "SIMPLE FILE NAME 1",
+        "simple_file_name_1",
+    ]
+
+
+def test_convert_many():
+    assert convert_many(["one two", "", "HTMLParser"], Words.pascal_case) == [
+        "OneTwo",
+        "",
+        "HtmlParser",
+    ]
+
+
+def test_words_with_custom_boundaries():
+    assert Words.from_text("a.b+c", boundaries=["+"]).words == ("a.b", "c")
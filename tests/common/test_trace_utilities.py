@@ -0,0 +1,115 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from common.cmd_utilities import run_cmd, stream_cmd
+from common.trace_utilities import (
+    TRACE_ENV_VAR,
+    CommandTrace,
+    enable_tracing,
+    load_traces,
+    summarize_traces,
+    write_chrome_trace,
+)
+
+
+@pytest.fixture
+def trace_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.delenv(TRACE_ENV_VAR, raising=False)
+    path = tmp_path / "trace.jsonl"
+    enable_tracing(path)
+    return path
+
+
+def make_trace(argv: list[str], wall_time: float) -> CommandTrace:
+    return CommandTrace(
+        argv=argv,
+        start=10.0,
+        end=10.0 + wall_time,
+        return_code=0,
+        output_bytes=3,
+        pid=1,
+        thread_id=1,
+    )
+
+
+def test_nothing_is_recorded_when_disabled(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.delenv(TRACE_ENV_VAR, raising=False)
+    run_cmd([sys.executable, "-c", "print('x')"])
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_commands_are_recorded(trace_path: Path):
+    run_cmd([sys.executable, "-c", "print('hello')"])
+    run_cmd([sys.executable, "-c", "raise SystemExit(2)"])
+    list(stream_cmd([sys.executable, "-c", "print('a'); print('b')"]))
+
+    traces = load_traces(trace_path)
+
+    assert len(traces) == 3
+    assert traces[0].argv[-1] == "print('hello')"
+    assert traces[0].output_bytes == len("hello\n")
+    assert traces[0].wall_time > 0
+    assert traces[1].return_code == 2
+    assert traces[2].output_bytes == len("a\nb\n")
+
+
+def test_unwritable_trace_file_disables_tracing(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+):
+    trace_path = tmp_path / "missing" / "trace.jsonl"
+    monkeypatch.setenv(TRACE_ENV_VAR, str(trace_path))
+
+    assert run_cmd([sys.executable, "-c", "print('x')"]).output == "x"
+    assert run_cmd([sys.executable, "-c", "print('y')"]).output == "y"
+
+    assert not trace_path.exists()
+    assert len([r for r in caplog.records if "Tracing disabled" in r.message]) == 1
+
+    enable_tracing(trace_path)
+    run_cmd([sys.executable, "-c", "print('z')"])
+    assert len(load_traces(trace_path)) == 1
+
+
+def test_tracing_is_inherited_by_child_processes(trace_path: Path):
+    child = "from common.cmd_utilities import run_cmd; run_cmd(['true'])"
+    run_cmd([sys.executable, "-c", child])
+
+    argvs = [t.argv for t in load_traces(trace_path)]
+    assert ["true"] in argvs
+
+
+def test_malformed_lines_are_skipped(tmp_path: Path):
+    path = tmp_path / "trace.jsonl"
+    path.write_text("not json\n{}\n")
+
+    assert load_traces(path) == []
+
+
+def test_summary_lists_slowest_first():
+    traces = [make_trace(["fast"], 0.1), make_trace(["slow"], 2.0)]
+
+    summary = summarize_traces(traces, limit=1)
+
+    assert "2 commands" in summary
+    assert "slow" in summary
+    assert "fast" not in summary.splitlines()[-1]
+
+
+def test_summary_without_traces():
+    assert summarize_traces([]) == "No commands were traced."
+
+
+def test_chrome_trace(tmp_path: Path):
+    path = tmp_path / "trace.json"
+    write_chrome_trace([make_trace(["/usr/bin/git", "status"], 0.5)], path)
+
+    (event,) = json.loads(path.read_text())["traceEvents"]
+    assert event["name"] == "git"
+    assert event["ph"] == "X"
+    assert event["dur"] == pytest.approx(500_000)
@@ -0,0 +1,92 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+from common.io_utilities import FreedesktopTrash, _trash_with_command
+
+
+@pytest.fixture
+def trash_dir(tmp_path: Path) -> Path:
+    return tmp_path / "Trash"
+
+
+def test_put_moves_file_and_writes_info(tmp_path: Path, trash_dir: Path):
+    f = tmp_path / "my file.txt"
+    f.write_text("content")
+
+    assert FreedesktopTrash(trash_dir).put(f)
+
+    assert not f.exists()
+    assert (trash_dir / "files" / "my file.txt").read_text() == "content"
+
+    info = (trash_dir / "info" / "my file.txt.trashinfo").read_text().splitlines()
+    assert info[0] == "[Trash Info]"
+    assert info[1] == f"Path={str(f).replace(' ', '%20')}"
+    assert info[2].startswith("DeletionDate=")
+
+
+def test_put_handles_name_collisions(tmp_path: Path, trash_dir: Path):
+    trash = FreedesktopTrash(trash_dir)
+    for sub in ("a", "b"):
+        (tmp_path / sub).mkdir()
+        (tmp_path / sub / "photo.png").write_text(sub)
+        assert trash.put(tmp_path / sub / "photo.png")
+
+    assert (trash_dir / "files" / "photo.png").read_text() == "a"
+    assert (trash_dir / "files" / "photo_2.png").read_text() == "b"
+    assert (trash_dir / "info" / "photo_2.png.trashinfo").exists()
+
+
+def test_put_keeps_files_without_info(tmp_path: Path, trash_dir: Path):
+    orphan = trash_dir / "files" / "notes.txt"
+    orphan.parent.mkdir(parents=True)
+    orphan.write_text("orphan")
+    f = tmp_path / "notes.txt"
+    f.write_text("new")
+
+    assert FreedesktopTrash(trash_dir).put(f)
+
+    assert orphan.read_text() == "orphan"
+    assert (trash_dir / "files" / "notes_2.txt").read_text() == "new"
+    assert (trash_dir / "info" / "notes_2.txt.trashinfo").exists()
+    assert not (trash_dir / "info" / "notes.txt.trashinfo").exists()
+
+
+def test_put_directory(tmp_path: Path, trash_dir: Path):
+    d = tmp_path / "folder"
+    d.mkdir()
+    (d / "inner.txt").write_text("")
+
+    assert FreedesktopTrash(trash_dir).put(d)
+    assert (trash_dir / "files" / "folder" / "inner.txt").exists()
+
+
+def test_put_symlink_keeps_target(tmp_path: Path, trash_dir: Path):
+    target = tmp_path / "target.txt"
+    target.write_text("")
+    link = tmp_path / "link.txt"
+    link.symlink_to(target)
+
+    assert FreedesktopTrash(trash_dir).put(link)
+    assert not link.is_symlink()
+    assert target.exists()
+
+
+def test_put_missing_file(tmp_path: Path, trash_dir: Path):
+    assert not FreedesktopTrash(trash_dir).put(tmp_path / "missing")
+    assert not list(trash_dir.rglob("*.trashinfo"))
+
+
+def test_command_reports_per_file_success(tmp_path: Path):
+    """When the command fails, only the paths that are gone count as trashed."""
+    removed = tmp_path / "removed"
+    kept = tmp_path / "kept"
+    for f in (removed, kept):
+        f.write_text("")
+
+    # Deletes its first argument and then fails
+    code = "import os, sys; os.remove(sys.argv[1]); sys.exit(1)"
+    results = _trash_with_command([sys.executable, "-c", code], [removed, kept])
+
+    assert results == {removed: True, kept: False}
@@ -0,0 +1,142 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from common.io_utilities import FileBatch, write_to_file
+
+
+def set_old_mtime(path: Path) -> int:
+    os.utime(path, ns=(0, 1_000_000_000))
+    return path.stat().st_mtime_ns
+
+
+def test_creates_file_and_parents(tmp_path: Path):
+    path = tmp_path / "a" / "b" / "out.txt"
+
+    assert write_to_file("hello", path)
+    assert path.read_text() == "hello"
+
+
+def test_unchanged_content_is_not_rewritten(tmp_path: Path):
+    path = tmp_path / "out.txt"
+    path.write_text("same")
+    mtime = set_old_mtime(path)
+
+    assert not write_to_file("same", path)
+    assert path.stat().st_mtime_ns == mtime
+
+
+def test_changed_content_is_rewritten(tmp_path: Path):
+    path = tmp_path / "out.txt"
+    path.write_text("old")
+
+    assert write_to_file("new", path, fsync=True)
+    assert path.read_text() == "new"
+
+
+def test_permissions_are_kept(tmp_path: Path):
+    path = tmp_path / "script.sh"
+    path.write_text("echo old")
+    path.chmod(0o750)
+
+    write_to_file("echo new", path)
+    assert path.stat().st_mode & 0o777 == 0o750
+
+
+def test_no_temp_files_are_left(tmp_path: Path):
+    path = tmp_path / "out.txt"
+    write_to_file("one", path)
+    write_to_file("two", path)
+
+    assert [p.name for p in tmp_path.iterdir()] == ["out.txt"]
+
+
+def test_symlinks_are_written_through(tmp_path: Path):
+    target = tmp_path / "target.txt"
+    target.write_text("old")
+    link = tmp_path / "link.txt"
+    link.symlink_to(target)
+
+    write_to_file("new", link)
+
+    assert link.is_symlink()
+    assert target.read_text() == "new"
+
+
+def test_batch_only_writes_changed_files(tmp_path: Path):
+    unchanged = tmp_path / "unchanged.txt"
+    unchanged.write_text("same")
+    mtime = set_old_mtime(unchanged)
+    changed = tmp_path / "changed.txt"
+    changed.write_text("old")
+    created = tmp_path / "new" / "created.txt"
+
+    with FileBatch() as batch:
+        batch.write("same", unchanged)
+        batch.write("new", changed)
+        batch.write("created", created)
+
+        # Nothing is written before the batch is committed
+        assert changed.read_text() == "old"
+        assert not created.exists()
+
+    assert set(batch.changed) == {changed, created}
+    assert unchanged.stat().st_mtime_ns == mtime
+    assert changed.read_text() == "new"
+    assert created.read_text() == "created"
+
+
+def test_batch_is_discarded_on_error(tmp_path: Path):
+    path = tmp_path / "out.txt"
+
+    with pytest.raises(RuntimeError):
+        with FileBatch() as batch:
+            batch.write("content", path)
+            raise RuntimeError("boom")
+
+    assert not path.exists()
+    assert batch.changed == []
+
+
+def test_failed_batch_changes_nothing(tmp_path: Path):
+    first = tmp_path / "first.txt"
+    first.write_text("old")
+    # A regular file where a parent directory is expected makes the write fail
+    blocker = tmp_path / "blocker"
+    blocker.write_text("")
+
+    batch = FileBatch()
+    batch.write("new", first)
+    batch.write("content", blocker / "second.txt")
+
+    with pytest.raises(OSError):
+        batch.commit()
+
+    assert first.read_text() == "old"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["blocker", "first.txt"]
+
+
+def test_failed_rename_is_cleaned_up(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    first = tmp_path / "first.txt"
+    second = tmp_path / "second.txt"
+    third = tmp_path / "third.txt"
+    replace = os.replace
+
+    def fail_on_second(src: Path, dst: Path) -> None:
+        if dst == second:
+            raise PermissionError("denied")
+        replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", fail_on_second)
+
+    batch = FileBatch()
+    batch.write("first", first)
+    batch.write("second", second)
+    batch.write("third", third)
+
+    with pytest.raises(PermissionError):
+        batch.commit()
+
+    assert batch.changed == [first]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["first.txt"]
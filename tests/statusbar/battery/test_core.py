@@ -0,0 +1,105 @@
+from pathlib import Path
+
+import pytest
+
+from statusbar.battery.src.core import (
+    BatteryMonitor,
+    BatteryState,
+    format_battery,
+    parse_uevent,
+)
+
+DISCHARGING = (
+    b"POWER_SUPPLY_NAME=BAT0\n"
+    b"POWER_SUPPLY_STATUS=Discharging\n"
+    b"POWER_SUPPLY_CAPACITY=50\n"
+    b"POWER_SUPPLY_ENERGY_FULL=40000000\n"
+    b"POWER_SUPPLY_ENERGY_NOW=20000000\n"
+    b"POWER_SUPPLY_POWER_NOW=8000000\n"
+)
+
+CHARGING = (
+    b"POWER_SUPPLY_STATUS=Charging\n"
+    b"POWER_SUPPLY_CAPACITY=75\n"
+    b"POWER_SUPPLY_CHARGE_FULL=4000000\n"
+    b"POWER_SUPPLY_CHARGE_NOW=3000000\n"
+    b"POWER_SUPPLY_CURRENT_NOW=2000000\n"
+    b"POWER_SUPPLY_VOLTAGE_NOW=12000000\n"
+)
+
+
+def test_parse_uevent():
+    assert parse_uevent(b"POWER_SUPPLY_STATUS=Not charging\nINVALID\n") == {
+        "status": "Not charging"
+    }
+
+
+def test_discharging_battery():
+    state = BatteryState.from_uevent("BAT0", DISCHARGING)
+
+    assert state.capacity == 50
+    assert state.remaining_time == pytest.approx(2.5 * 3600)
+    assert state.watts == pytest.approx(-8)
+    assert format_battery(state).endswith("50% 2:30 -8W")
+
+
+def test_charging_battery_reporting_charge():
+    state = BatteryState.from_uevent("BAT0", CHARGING)
+
+    assert state.remaining_time == pytest.approx(0.5 * 3600)
+    assert state.watts == pytest.approx(24)
+    assert format_battery(state).endswith("75% 0:30 +24W")
+
+
+def test_battery_without_rate():
+    state = BatteryState.from_uevent(
+        "BAT0", b"POWER_SUPPLY_STATUS=Full\nPOWER_SUPPLY_CAPACITY=100\n"
+    )
+
+    assert state.remaining_time is None
+    assert format_battery(state).endswith("100%")
+
+
+def test_battery_without_capacity():
+    with pytest.raises(ValueError):
+        BatteryState.from_uevent("BAT0", b"POWER_SUPPLY_STATUS=Full\n")
+
+
+@pytest.fixture
+def power_supply_dir(tmp_path: Path) -> Path:
+    for name, uevent in (("BAT0", DISCHARGING), ("BAT1", CHARGING), ("AC", b"")):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "uevent").write_bytes(uevent)
+
+    return tmp_path
+
+
+def test_monitor_only_reports_changes(power_supply_dir: Path):
+    monitor = BatteryMonitor(power_supply_dir)
+
+    states = monitor.read()
+    assert states is not None
+    assert [state.name for state in states] == ["BAT0", "BAT1"]
+    assert monitor.read() is None
+
+    (power_supply_dir / "BAT0" / "uevent").write_bytes(
+        DISCHARGING.replace(b"CAPACITY=50", b"CAPACITY=49")
+    )
+
+    states = monitor.read()
+    assert states is not None
+    assert states[0].capacity == 49
+
+    monitor.close()
+
+
+def test_monitor_output(power_supply_dir: Path):
+    monitor = BatteryMonitor(power_supply_dir)
+
+    output = monitor.get_output()
+
+    assert output == monitor.get_output()
+    assert "50% 2:30 -8W" in output
+    assert "75% 0:30 +24W" in output
+
+    monitor.close()
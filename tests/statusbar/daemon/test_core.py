@@ -0,0 +1,218 @@
+import asyncio
+import os
+import socket
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from common.statusbar import MouseButton
+from statusbar.client import main as client
+from statusbar.client.main import build_request, connect, send_request
+from statusbar.daemon.src import core
+from statusbar.daemon.src.core import DaemonBlock, StatusbarDaemon
+
+
+class Counter:
+    """Render function returning how many times it was called."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self) -> str:
+        self.calls += 1
+        return str(self.calls)
+
+
+def make_daemon(tmp_path: Path, *blocks: DaemonBlock) -> StatusbarDaemon:
+    return StatusbarDaemon(
+        list(blocks), tmp_path / "statusbar.sock", statusbar="no-statusbar"
+    )
+
+
+def test_get_renders_once(tmp_path: Path):
+    render = Counter()
+    daemon = make_daemon(tmp_path, DaemonBlock("count", 60, render))
+
+    async def get_twice():
+        return [await daemon.handle_request("get count") for _ in range(2)]
+
+    assert asyncio.run(get_twice()) == ["1", "1"]
+    assert render.calls == 1
+
+
+def test_update_renders_again(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(core, "UPDATE_MAX_AGE", 0)
+    daemon = make_daemon(tmp_path, DaemonBlock("count", 60, Counter()))
+
+    async def update_twice():
+        return [await daemon.handle_request("update count") for _ in range(2)]
+
+    assert asyncio.run(update_twice()) == ["1", "2"]
+
+
+def test_click_runs_action_then_updates(tmp_path: Path):
+    state = {"muted": False}
+    block = DaemonBlock(
+        "sound",
+        60,
+        lambda: "muted" if state["muted"] else "on",
+        {MouseButton.MIDDLE: lambda: state.update(muted=True)},
+    )
+    daemon = make_daemon(tmp_path, block)
+
+    assert asyncio.run(daemon.handle_request("click sound 2")) == "muted"
+
+
+def test_slow_click_returns_cached_value(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(core, "CMD_TIMEOUT", 0.1)
+    block = DaemonBlock(
+        "slow", 60, lambda: "value", {MouseButton.LEFT: lambda: time.sleep(0.3)}
+    )
+    block.value = "cached"
+    daemon = make_daemon(tmp_path, block)
+
+    async def click_and_wait():
+        value = await daemon.handle_request("click slow 1")
+        await asyncio.sleep(0.5)
+        return value, daemon._wake_events["slow"].is_set()
+
+    assert asyncio.run(click_and_wait()) == ("cached", True)
+
+
+def test_failing_block_keeps_last_value(tmp_path: Path):
+    def render() -> str:
+        raise RuntimeError("broken")
+
+    block = DaemonBlock("broken", 60, render)
+    block.value = "last"
+    daemon = make_daemon(tmp_path, block)
+
+    assert asyncio.run(daemon.handle_request("update broken")) == "last"
+
+
+@pytest.mark.parametrize(
+    "request_line", ["", "get", "get unknown", "click count", "remove count"]
+)
+def test_invalid_requests(tmp_path: Path, request_line: str):
+    daemon = make_daemon(tmp_path, DaemonBlock("count", 60, Counter()))
+
+    assert asyncio.run(daemon.handle_request(request_line)) == ""
+
+
+def test_build_request(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.delenv("BLOCK_BUTTON", raising=False)
+    assert build_request("date") == "get date"
+    assert build_request("date", update=True) == "update date"
+
+    monkeypatch.setenv("BLOCK_BUTTON", "3")
+    assert build_request("date", update=True) == "click date 3"
+
+
+def test_client_gets_value_from_socket(tmp_path: Path):
+    daemon = make_daemon(tmp_path, DaemonBlock("date", 60, lambda: "18 Oct"))
+
+    async def serve_and_request():
+        server = asyncio.create_task(daemon.serve())
+        while not daemon.socket_path.exists():
+            await asyncio.sleep(0.01)
+
+        response = await asyncio.to_thread(
+            lambda: send_request(connect(daemon.socket_path), "get date")
+        )
+        server.cancel()
+        return response
+
+    assert asyncio.run(serve_and_request()) == "18 Oct"
+    assert not daemon.socket_path.exists()
+
+
+class Executed(Exception):
+    pass
+
+
+@pytest.fixture
+def execv(monkeypatch: pytest.MonkeyPatch) -> list[list[str]]:
+    """Arguments of the block scripts the client ran instead of the daemon."""
+    calls: list[list[str]] = []
+
+    def fake_execv(path, args):
+        calls.append(args)
+        raise Executed
+
+    monkeypatch.setattr(client.os, "execv", fake_execv)
+    return calls
+
+
+def test_client_runs_the_block_without_daemon(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, execv: list[list[str]]
+):
+    monkeypatch.setattr(
+        sys, "argv", ["sb-client", "date", "-u", "-s", str(tmp_path / "missing")]
+    )
+
+    with pytest.raises(Executed):
+        client.main()
+
+    assert execv[0][1:] == ["--update"]
+
+
+def test_client_does_not_repeat_a_failed_request(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, execv: list[list[str]]
+):
+    socket_path = tmp_path / "statusbar.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(str(socket_path))
+        server.listen()
+
+        def timeout(sock: socket.socket, request: str) -> str:
+            sock.close()
+            raise TimeoutError("timed out")
+
+        monkeypatch.setattr(client, "send_request", timeout)
+        monkeypatch.setenv("BLOCK_BUTTON", "1")
+        monkeypatch.setattr(sys, "argv", ["sb-client", "date", "-s", str(socket_path)])
+
+        with pytest.raises(SystemExit):
+            client.main()
+
+    assert execv == []
+
+
+class PipeEvents:
+    """Event source reporting a change for every byte written to a pipe."""
+
+    def __init__(self):
+        self.read_fd, self.write_fd = os.pipe()
+
+    def fileno(self) -> int:
+        return self.read_fd
+
+    def read_events(self) -> bool:
+        return bool(os.read(self.read_fd, 1024))
+
+
+def test_events_update_block(tmp_path: Path):
+    events = PipeEvents()
+    render = Counter()
+    daemon = make_daemon(tmp_path, DaemonBlock("count", 3600, render, events=events))
+
+    async def serve_and_trigger():
+        server = asyncio.create_task(daemon.serve())
+        while render.calls < 1:
+            await asyncio.sleep(0.01)
+
+        os.write(events.write_fd, b"x")
+        for _ in range(100):
+            if render.calls > 1:
+                break
+            await asyncio.sleep(0.01)
+
+        server.cancel()
+
+    asyncio.run(serve_and_trigger())
+
+    assert render.calls == 2
@@ -0,0 +1,93 @@
+from datetime import date, datetime
+from pathlib import Path
+
+from statusbar.date.src.core import (
+    Appointment,
+    HighlightedCalendar,
+    Recurrence,
+    format_appointments,
+    load_appointments,
+)
+
+APTS = (
+    "02/15/2024 @ 09:00 -> 02/15/2024 @ 10:30 |Dentist\n"
+    "02/16/2024 [1] |Birthday\n"
+    "02/01/2024 @ 08:00 -> 02/01/2024 @ 08:15 {1W -> 03/31/2024 !02/22/2024} |Standup\n"
+    "not an appointment\n"
+)
+
+
+def test_calendar_highlights_the_day():
+    month = HighlightedCalendar(14).formatmonth(2024, 2)
+
+    assert month.splitlines()[:2] == ["   February 2024", "Su Mo Tu We Th Fr Sa"]
+    assert "</span> 15 16 17" in month
+    assert month.count("<b>") == 1
+    assert "<b>14</b>" in month
+
+
+def test_parse_appointment():
+    appointment = Appointment.parse("02/15/2024 @ 09:00 -> 02/15/2024 @ 10:30 |Dentist")
+
+    assert appointment == Appointment(
+        datetime(2024, 2, 15, 9), datetime(2024, 2, 15, 10, 30), "Dentist"
+    )
+
+
+def test_parse_appointment_with_notification():
+    appointment = Appointment.parse("10/18/2026 @ 10:00 -> 10/18/2026 @ 11:00 !Meeting")
+
+    assert appointment is not None
+    assert appointment.description == "Meeting"
+
+
+def test_parse_appointment_with_note():
+    appointment = Appointment.parse(
+        "02/16/2024 [1] {1Y} >4a5f6e7d8c9b0a1f2e3d4c5b6a7f8e9d0c1b2a3f |Birthday"
+    )
+
+    assert appointment is not None
+    assert appointment.description == "Birthday"
+    assert appointment.recurrence == Recurrence(1, "Y")
+
+
+def test_parse_invalid_appointment():
+    assert Appointment.parse("02/30/2024 [1] |Invalid date") is None
+    assert Appointment.parse("no separator") is None
+
+
+def test_recurring_appointment():
+    appointment = Appointment.parse(APTS.splitlines()[2])
+    assert appointment is not None
+
+    assert appointment.occurs_on(date(2024, 2, 8))
+    assert not appointment.occurs_on(date(2024, 2, 9))
+    assert not appointment.occurs_on(date(2024, 2, 22))  # exception
+    assert not appointment.occurs_on(date(2024, 4, 4))  # after the end
+
+
+def test_format_appointments(tmp_path: Path):
+    apts_path = tmp_path / "apts"
+    apts_path.write_text(APTS)
+
+    output = format_appointments(load_appointments(apts_path), date(2024, 2, 14))
+
+    assert output == (
+        "02/15/24:\n"
+        " - 08:00 -> 08:15\n\tStandup\n"
+        " - 09:00 -> 10:30\n\tDentist\n"
+        "\n"
+        "02/16/24:\n"
+        " * Birthday"
+    )
+
+
+def test_unchanged_apts_file_is_not_parsed_again(tmp_path: Path):
+    apts_path = tmp_path / "apts"
+    apts_path.write_text(APTS)
+
+    first = load_appointments(apts_path)
+    assert load_appointments(apts_path) is first
+
+    apts_path.write_text(APTS + "02/17/2024 [1] |Holiday\n")
+    assert len(load_appointments(apts_path)) == len(first) + 1
@@ -0,0 +1,153 @@
+import socket
+import struct
+from typing import Iterator
+
+import pytest
+
+from statusbar.network.src import core
+from statusbar.network.src.core import (
+    IFLA_OPERSTATE,
+    RTM_DELLINK,
+    RTM_NEWADDR,
+    RTM_NEWLINK,
+    NetlinkMonitor,
+    NetworkStatus,
+    parse_link_state,
+    parse_netlink_messages,
+)
+
+IFF_UP = 0x1
+IF_OPER_UP = 6
+
+
+def netlink_message(msg_type: int, payload: bytes) -> bytes:
+    padding = b"\0" * (-len(payload) % 4)
+    return struct.pack("=IHHII", 16 + len(payload), msg_type, 0, 0, 0) + (
+        payload + padding
+    )
+
+
+def link_payload(index: int, flags: int, operstate: int | None = None) -> bytes:
+    payload = struct.pack("=BxHiII", 0, 1, index, flags, 0)
+    if operstate is not None:
+        payload += struct.pack("=HHB3x", 5, IFLA_OPERSTATE, operstate)
+
+    return payload
+
+
+def test_parse_netlink_messages():
+    data = netlink_message(RTM_NEWLINK, link_payload(2, IFF_UP)) + netlink_message(
+        RTM_NEWADDR, b"\1\2\3"
+    )
+
+    messages = list(parse_netlink_messages(data))
+
+    assert [msg_type for msg_type, _ in messages] == [RTM_NEWLINK, RTM_NEWADDR]
+    assert messages[1][1] == b"\1\2\3"
+
+
+def test_parse_link_state():
+    assert parse_link_state(link_payload(3, IFF_UP, IF_OPER_UP)) == (
+        3,
+        IFF_UP,
+        IF_OPER_UP,
+    )
+    assert parse_link_state(link_payload(3, 0)) == (3, 0, None)
+
+
+@pytest.fixture
+def monitor() -> Iterator[tuple[NetlinkMonitor, socket.socket]]:
+    """Monitor reading from a socket pair instead of the kernel."""
+    try:
+        monitor = NetlinkMonitor()
+    except OSError as e:
+        pytest.skip(f"rtnetlink is not available: {e}")
+
+    monitor.close()
+    kernel, monitor._socket = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+    monitor._socket.setblocking(False)
+
+    yield monitor, kernel
+
+    monitor.close()
+    kernel.close()
+
+
+def test_only_link_state_changes_are_reported(monitor):
+    monitor, kernel = monitor
+    assert not monitor.read_events()
+
+    kernel.send(netlink_message(RTM_NEWLINK, link_payload(2, IFF_UP, IF_OPER_UP)))
+    assert monitor.read_events()
+
+    # e.g. a wireless scan, which doesn't change the link
+    kernel.send(netlink_message(RTM_NEWLINK, link_payload(2, IFF_UP, IF_OPER_UP)))
+    assert not monitor.read_events()
+
+    kernel.send(netlink_message(RTM_DELLINK, link_payload(2, 0)))
+    assert monitor.read_events()
+
+
+def test_address_changes_are_reported(monitor):
+    monitor, kernel = monitor
+
+    kernel.send(netlink_message(RTM_NEWADDR, b"\0" * 8))
+
+    assert monitor.read_events()
+
+
+class FakeMonitor(NetlinkMonitor):
+    """Monitor reporting changes on demand, without a netlink socket."""
+
+    def __init__(self):
+        self.changed = False
+
+    def read_events(self) -> bool:
+        changed, self.changed = self.changed, False
+        return changed
+
+
+def test_links_are_checked_again_only_after_a_change(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    checks: list[str] = []
+
+    def get_vpn_info() -> str:
+        checks.append("vpn")
+        return "V"
+
+    monkeypatch.setattr(core, "get_net_state", lambda prefix: "")
+    monkeypatch.setattr(core, "get_ethernet_info", lambda: "E")
+    monkeypatch.setattr(core, "get_vpn_info", get_vpn_info)
+
+    status = NetworkStatus()
+    fake_monitor = FakeMonitor()
+    status._monitor = fake_monitor
+
+    assert status.get_output() == "EV"
+    assert status.get_output() == "EV"
+    assert not status.read_events()
+    assert len(checks) == 1
+
+    fake_monitor.changed = True
+    assert status.read_events()
+    assert status.get_output() == "EV"
+    assert len(checks) == 2
+
+
+def test_links_are_always_checked_without_events(monkeypatch: pytest.MonkeyPatch):
+    checks: list[str] = []
+
+    def get_vpn_info() -> str:
+        checks.append("vpn")
+        return ""
+
+    monkeypatch.setattr(core, "get_net_state", lambda prefix: "")
+    monkeypatch.setattr(core, "get_ethernet_info", lambda: "")
+    monkeypatch.setattr(core, "get_vpn_info", get_vpn_info)
+
+    status = NetworkStatus()
+    status.get_output()
+    status.get_output()
+
+    assert len(checks) == 2
@@ -0,0 +1,184 @@
+import os
+import select
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from statusbar.recording.src import core
+from statusbar.recording.src.core import (
+    RecordingTracker,
+    format_duration,
+    format_size,
+    parse_inotify_events,
+    stop_recording,
+)
+
+requires_pidfd = pytest.mark.skipif(
+    not hasattr(core.os, "pidfd_open"), reason="pidfd_open is not available"
+)
+
+# Stands in for 'ffmpeg', with the output file as the last argument
+RECORDER = (
+    "import sys, time; open(sys.argv[-1], 'wb').write(b'0' * 2048); time.sleep(30)"
+)
+
+
+@pytest.fixture
+def recorder(tmp_path: Path):
+    output_path = tmp_path / "video.mp4"
+    process = subprocess.Popen([sys.executable, "-c", RECORDER, str(output_path)])
+    while not output_path.exists():
+        time.sleep(0.01)
+    yield process
+
+    process.kill()
+    process.wait()
+
+
+def start_recording(state_dir: Path, pid: int, icon: str = "🎙️") -> None:
+    (state_dir / "recording_pid").write_text(f"{pid}\n")
+    (state_dir / "recording_icon").write_text(f"{icon}\n")
+
+
+def wait_for_events(tracker: RecordingTracker) -> bool:
+    select.select([tracker.fileno()], [], [], 5)
+    return tracker.read_events()
+
+
+def test_format_duration():
+    assert format_duration(65.9) == "1:05"
+    assert format_duration(3723) == "1:02:03"
+
+
+def test_format_size():
+    assert format_size(512) == "512B"
+    assert format_size(1536) == "1.5K"
+    assert format_size(250 * 1024**2) == "250M"
+
+
+def test_parse_inotify_events():
+    data = (
+        b"\x01\x00\x00\x00\x08\x00\x00\x00\x00\x00\x00\x00\x10\x00\x00\x00"
+        b"recording_pid\x00\x00\x00"
+    )
+
+    assert list(parse_inotify_events(data)) == [(0x8, "recording_pid")]
+
+
+def test_nothing_recorded(tmp_path: Path):
+    assert RecordingTracker(tmp_path).get_state() is None
+
+
+@requires_pidfd
+def test_stale_pid_file(tmp_path: Path):
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    start_recording(tmp_path, process.pid)
+
+    assert RecordingTracker(tmp_path).get_state() is None
+
+
+@requires_pidfd
+def test_recording_state(tmp_path: Path, recorder: subprocess.Popen):
+    start_recording(tmp_path, recorder.pid)
+
+    state = RecordingTracker(tmp_path).get_state()
+
+    assert state is not None
+    assert state.icon == "🎙️"
+    assert state.output_path == tmp_path / "video.mp4"
+    assert state.size == 2048
+
+
+def test_output_path_is_read_from_file(tmp_path: Path, recorder: subprocess.Popen):
+    output_path = tmp_path / "box.mp4"
+    output_path.write_bytes(b"0" * 512)
+    (tmp_path / "recording_path").write_text(f"{output_path}\n")
+    start_recording(tmp_path, recorder.pid)
+
+    state = RecordingTracker(tmp_path).get_state()
+
+    assert state is not None
+    assert state.output_path == output_path
+    assert state.size == 512
+
+
+def test_output_path_of_previous_recording_is_ignored(
+    tmp_path: Path, recorder: subprocess.Popen
+):
+    path_file = tmp_path / "recording_path"
+    path_file.write_text(f"{tmp_path / 'box.mp4'}\n")
+    os.utime(path_file, (0, 0))
+    start_recording(tmp_path, recorder.pid)
+
+    state = RecordingTracker(tmp_path).get_state()
+
+    assert state is not None
+    assert state.output_path == tmp_path / "video.mp4"
+
+
+@requires_pidfd
+def test_state_is_only_read_on_changes(tmp_path: Path, recorder: subprocess.Popen):
+    tracker = RecordingTracker(tmp_path)
+    tracker.fileno()
+    assert tracker.get_state() is None
+
+    start_recording(tmp_path, recorder.pid)
+    assert tracker.get_state() is None
+
+    assert wait_for_events(tracker)
+    state = tracker.get_state()
+    assert state is not None
+    assert state.pid == recorder.pid
+
+    tracker.close()
+
+
+@requires_pidfd
+def test_recorder_exit_is_reported(tmp_path: Path, recorder: subprocess.Popen):
+    start_recording(tmp_path, recorder.pid)
+    tracker = RecordingTracker(tmp_path)
+    tracker.fileno()
+    assert tracker.get_state() is not None
+
+    recorder.kill()
+    recorder.wait()
+
+    assert wait_for_events(tracker)
+    assert tracker.get_state() is None
+
+    tracker.close()
+
+
+@requires_pidfd
+def test_stop_recording(tmp_path: Path, recorder: subprocess.Popen):
+    start_recording(tmp_path, recorder.pid)
+
+    assert stop_recording(tmp_path)
+    assert recorder.wait(timeout=1) == -15
+    assert list(tmp_path.glob("recording_*")) == []
+
+
+@requires_pidfd
+def test_stop_recording_that_does_not_exit(tmp_path: Path, recorder: subprocess.Popen):
+    ignoring = subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            "import signal, time; signal.signal(signal.SIGTERM, signal.SIG_IGN); "
+            "print(flush=True); time.sleep(30)",
+        ],
+        stdout=subprocess.PIPE,
+    )
+    assert ignoring.stdout is not None
+    ignoring.stdout.readline()
+    start_recording(tmp_path, ignoring.pid)
+
+    assert not stop_recording(tmp_path, timeout=0.2)
+    assert (tmp_path / "recording_pid").exists()
+
+    ignoring.kill()
+    ignoring.wait()
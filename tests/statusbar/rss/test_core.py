@@ -0,0 +1,76 @@
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+
+from statusbar.rss.src import core
+from statusbar.rss.src.core import ItemCounts, get_item_counts
+
+
+def create_db(db_path: Path, unread: list[int]) -> None:
+    with closing(sqlite3.connect(db_path)) as conn, conn:
+        conn.execute("CREATE TABLE IF NOT EXISTS items (unread INTEGER)")
+        conn.executemany("INSERT INTO items VALUES (?)", [(u,) for u in unread])
+
+
+@pytest.fixture
+def connections(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """URIs of the connections opened to read the counts."""
+    uris: list[str] = []
+    connect = sqlite3.connect
+
+    def counting_connect(database, **kwargs):
+        if kwargs.get("uri"):
+            uris.append(database)
+        return connect(database, **kwargs)
+
+    monkeypatch.setattr(core.sqlite3, "connect", counting_connect)
+    return uris
+
+
+def test_counts_total_and_unread(tmp_path: Path, connections: list[str]):
+    db_path = tmp_path / "newsraft.sqlite3"
+    create_db(db_path, [1, 0, 1, 0, 0])
+
+    assert get_item_counts(db_path) == ItemCounts(total=5, unread=2)
+    assert connections[0].endswith("?mode=ro")
+
+
+def test_empty_database(tmp_path: Path):
+    db_path = tmp_path / "newsraft.sqlite3"
+    create_db(db_path, [])
+
+    assert get_item_counts(db_path) == ItemCounts(total=0, unread=0)
+
+
+def test_unchanged_database_is_not_queried_again(
+    tmp_path: Path, connections: list[str]
+):
+    db_path = tmp_path / "newsraft.sqlite3"
+    create_db(db_path, [1, 0])
+
+    assert get_item_counts(db_path) == get_item_counts(db_path)
+    assert len(connections) == 1
+
+    create_db(db_path, [1])
+
+    assert get_item_counts(db_path) == ItemCounts(total=3, unread=2)
+    assert len(connections) == 2
+
+
+def test_changes_in_write_ahead_log_are_counted(tmp_path: Path):
+    db_path = tmp_path / "newsraft.sqlite3"
+    create_db(db_path, [0])
+
+    # Keep the writer open, so its changes aren't checkpointed into the database
+    with closing(sqlite3.connect(db_path)) as writer:
+        writer.execute("PRAGMA journal_mode=WAL")
+        with writer:
+            writer.execute("INSERT INTO items VALUES (1)")
+
+        assert get_item_counts(db_path) == ItemCounts(total=2, unread=1)
+
+
+def test_missing_database(tmp_path: Path):
+    assert get_item_counts(tmp_path / "missing.sqlite3") is None
@@ -0,0 +1,86 @@
+import select
+import sys
+import threading
+
+import pytest
+
+from statusbar.sound.src.core import SinkEvents, VolumeController, resolve_icon
+
+
+def test_resolve_icon():
+    assert resolve_icon(50, is_muted=True) == "🔇"
+    assert resolve_icon(80, is_muted=False) == "🔊"
+    assert resolve_icon(10, is_muted=False) == "🔈"
+
+
+def test_scroll_steps_are_coalesced():
+    changes: list[int] = []
+    controller = VolumeController(changes.append, debounce=0.2)
+
+    threads = [
+        threading.Thread(target=controller.adjust, args=(diff,))
+        for diff in (2, 2, 2, -2, 2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert changes == [6]
+
+
+def test_steps_cancelling_out_change_nothing():
+    changes: list[int] = []
+    controller = VolumeController(changes.append, debounce=0.2)
+
+    threads = [
+        threading.Thread(target=controller.adjust, args=(diff,)) for diff in (2, -2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert changes == []
+
+
+def sink_events(*lines: str) -> SinkEvents:
+    output = "\n".join(lines)
+    code = f"print({output!r}, flush=True); import time; time.sleep(10)"
+    return SinkEvents([sys.executable, "-c", code])
+
+
+def read_events(events: SinkEvents) -> bool:
+    """Read the events until the output stops, as lines may arrive in pieces."""
+    changed = False
+    while select.select([events.fileno()], [], [], 0.5)[0]:
+        changed |= events.read_events()
+
+    return changed
+
+
+def test_sink_changes_are_reported():
+    events = sink_events("Event 'change' on sink #56")
+
+    assert read_events(events)
+    assert not events.read_events()
+
+    events.close()
+
+
+def test_other_events_are_ignored():
+    events = sink_events(
+        "Event 'new' on sink-input #120", "Event 'change' on source-output #7"
+    )
+
+    assert not read_events(events)
+
+    events.close()
+
+
+def test_exited_subscription_raises():
+    events = SinkEvents([sys.executable, "-c", "pass"])
+    select.select([events.fileno()], [], [], 5)
+
+    with pytest.raises(OSError):
+        events.read_events()
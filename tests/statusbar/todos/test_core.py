@@ -0,0 +1,103 @@
+import os
+import sys
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from statusbar.todos.src import core
+from statusbar.todos.src.core import (
+    TaskCounts,
+    count_tasks,
+    export_due_dates,
+    get_due_dates,
+    parse_task_date,
+    process_tasks,
+)
+
+# A Wednesday
+NOW = datetime(2024, 2, 14, 12, 0, tzinfo=UTC)
+
+
+def test_parse_task_date():
+    assert parse_task_date("20240215T090000Z") == datetime(2024, 2, 15, 9, tzinfo=UTC)
+
+
+def test_count_tasks():
+    due_dates = [
+        None,
+        NOW - timedelta(days=1),  # overdue
+        NOW + timedelta(hours=2),  # today
+        NOW + timedelta(days=3),  # Saturday
+        NOW + timedelta(days=6),  # next Tuesday
+    ]
+
+    assert count_tasks(due_dates, NOW) == TaskCounts(
+        pending=5, overdue=1, due_today=1, due_this_week=2
+    )
+
+
+# Prints a notice on stderr, like taskwarrior does for configuration overrides
+FAKE_TASK = f"""#!{sys.executable}
+import os
+import sys
+print("Configuration override rc.verbose:nothing", file=sys.stderr)
+print('[{{"uuid": "a", "due": "20240215T090000Z"}}, {{"uuid": "b"}}]')
+"""
+
+
+def test_export_only_parses_stdout(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    task = tmp_path / "task"
+    task.write_text(FAKE_TASK)
+    task.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}:{os.environ['PATH']}")
+
+    assert export_due_dates() == [datetime(2024, 2, 15, 9, tzinfo=UTC), None]
+
+
+@pytest.fixture
+def exports(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    """Number of exports, each returning a single task without a due date."""
+    calls: list[int] = []
+
+    def export_due_dates():
+        calls.append(1)
+        return [None]
+
+    monkeypatch.setattr(core, "export_due_dates", export_due_dates)
+    return calls
+
+
+def test_unchanged_data_is_not_exported_again(tmp_path: Path, exports: list[int]):
+    (tmp_path / "pending.data").write_text("")
+
+    assert get_due_dates(tmp_path) == [None]
+    assert get_due_dates(tmp_path) == [None]
+    assert len(exports) == 1
+
+    # Taskwarrior updates the data files in place
+    data_file = tmp_path / "pending.data"
+    data_file.write_text("task")
+    mtime = data_file.stat().st_mtime_ns + 1_000_000
+    core.os.utime(data_file, ns=(mtime, mtime))
+
+    get_due_dates(tmp_path)
+    assert len(exports) == 2
+
+
+def test_state_file_is_only_written_on_change(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    state_file = tmp_path / "taskwarrior" / "overdue_tasks"
+    monkeypatch.setattr(core, "STATE_FILE", state_file)
+    monkeypatch.setattr(core, "get_task_counts", lambda: TaskCounts(3, 1, 0, 0))
+    monkeypatch.setattr(core.Notification, "send", lambda self: None)
+
+    process_tasks()
+    assert state_file.read_text() == "1"
+
+    mtime = state_file.stat().st_mtime_ns
+    output = process_tasks()
+
+    assert state_file.stat().st_mtime_ns == mtime
+    assert output.endswith("1")